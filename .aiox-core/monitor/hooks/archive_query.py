@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Archive query - read back events kept by lib/archive.py.
+
+Hooks archive their events only while AIOX_MONITOR_ARCHIVE=1 is set in
+their environment. Filters use the sidecar index, so only matching
+records are decoded.
+
+Usage:
+    python3 archive_query.py --stats                          # Segments, events and sessions
+    python3 archive_query.py --session ID                     # One session's events as NDJSON
+    python3 archive_query.py --type PostToolUse --since MS    # Filters combine
+    python3 archive_query.py --session ID --replay            # Send the events to the monitor again
+
+Exit codes:
+    0 - Events printed (or replayed)
+    1 - Replay failed
+"""
+
+import argparse
+import json
+import os
+import sys
+
+# Add lib to path
+sys.path.insert(0, os.path.dirname(__file__))
+
+from lib.archive import ARCHIVE_DIR, ArchiveReader
+
+REPLAY_BATCH = 500
+
+
+def print_stats(reader: ArchiveReader) -> None:
+    segments = reader.segments()
+    if not segments:
+        print(f"No archive in {reader.archive_dir} (run hooks with AIOX_MONITOR_ARCHIVE=1)")
+        return
+
+    size = sum(os.path.getsize(path) for path in segments)
+    sessions = reader.sessions()
+    print(f"Archive {reader.archive_dir}: {len(segments)} segments, {size / 1024 / 1024:.1f} MB, "
+          f"{sum(sessions.values())} events, {len(sessions)} sessions")
+    for session_id, count in sorted(sessions.items(), key=lambda item: -item[1]):
+        print(f"  {session_id or '(no session)':<40} {count:>8}")
+
+
+def replay(events) -> bool:
+    """Send events to the monitor server in batches, original timestamps kept."""
+    from lib.send_event import send_events
+
+    batch = []
+    sent = 0
+    for event in events:
+        batch.append(event)
+        if len(batch) == REPLAY_BATCH:
+            if not send_events(batch):
+                print(f"Replay failed after {sent} events", file=sys.stderr)
+                return False
+            sent += len(batch)
+            batch = []
+    if batch and not send_events(batch):
+        print(f"Replay failed after {sent} events", file=sys.stderr)
+        return False
+    print(f"Replayed {sent + len(batch)} events")
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Query the AIOX monitor event archive")
+    parser.add_argument('--session', help='Only events of this session id')
+    parser.add_argument('--type', help='Only events of this type (e.g. PostToolUse)')
+    parser.add_argument('--since', type=int, help='Only events at or after this timestamp (ms)')
+    parser.add_argument('--until', type=int, help='Only events before this timestamp (ms)')
+    parser.add_argument('--stats', action='store_true', help='Summarize the archive instead')
+    parser.add_argument('--replay', action='store_true', help='Send matching events to the monitor server')
+    parser.add_argument('--dir', default=ARCHIVE_DIR, help=f'Archive directory (default: {ARCHIVE_DIR})')
+    args = parser.parse_args()
+
+    reader = ArchiveReader(args.dir)
+    if args.stats:
+        print_stats(reader)
+        return
+
+    events = reader.events(args.session, args.type, args.since, args.until)
+    if args.replay:
+        if not replay(events):
+            sys.exit(1)
+        return
+
+    out = sys.stdout
+    for event in events:
+        out.write(json.dumps(event, separators=(",", ":")) + "\n")
+
+
+if __name__ == "__main__":
+    main()
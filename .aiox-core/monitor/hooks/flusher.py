@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Spool flusher - delivers spooled hook events to the monitor server.
+
+Hooks running with AIOX_MONITOR_SPOOL=1 only append events to the local
+spool. This long-lived process drains the spool in batches (one gzip NDJSON
+request each), retries with exponential backoff while the server is down,
+and commits a delivery offset after every batch so it resumes where it
+stopped after a crash.
+
+A batch the server refuses for good (a 4xx other than 408/429) is never
+retried: it is moved to segment-<ns>.ndjson.rejected and the flusher moves
+on, so one bad batch cannot hold up the spool.
+
+Usage:
+    python3 flusher.py              # Run until interrupted
+    python3 flusher.py --once       # Drain the spool once and exit
+"""
+
+import argparse
+import json
+import os
+import random
+import signal
+import sys
+import time
+
+# Add lib to path
+sys.path.insert(0, os.path.dirname(__file__))
+
+from lib.send_event import post_ndjson
+from lib.spool import REJECTED_SUFFIX, SPOOL_DIR, SpoolReader
+
+BATCH_BYTES = 256 * 1024
+IDLE_INTERVAL_S = 0.5
+BACKOFF_BASE_S = 0.5
+BACKOFF_MAX_S = 30.0
+SEND_TIMEOUT_MS = 5000
+# 4xx statuses worth retrying: the request may succeed later
+RETRY_STATUSES = (408, 429)
+
+
+class Flusher:
+    """Drains spool segments to the monitor server with retry and backoff."""
+
+    def __init__(self, reader: SpoolReader, batch_bytes: int = BATCH_BYTES):
+        self.reader = reader
+        self.batch_bytes = batch_bytes
+        self.failures = 0
+        self.delivered = 0
+        self.skipped = 0
+        self.rejected = 0
+
+    def deliver(self, segment: str, lines: list[bytes]) -> bool:
+        """
+        Send lines of a segment as one batch.
+
+        Returns:
+            True if the batch is done with: delivered, held only corrupt
+            lines, or rejected by the server for good (moved aside)
+        """
+        batch = []
+        for line in lines:
+            try:
+                json.loads(line)
+            except ValueError:
+                # Torn write from a crashed hook - nothing to retry
+                self.skipped += 1
+                continue
+            batch.append(line)
+
+        if not batch:
+            return True
+
+        status = post_ndjson(batch, timeout_ms=SEND_TIMEOUT_MS)
+        if status is not None and 200 <= status < 300:
+            self.delivered += len(batch)
+            return True
+        if status is not None and 400 <= status < 500 and status not in RETRY_STATUSES:
+            self.reader.reject(segment, batch)
+            self.rejected += len(batch)
+            print(f"Flusher: server refused {len(batch)} events with {status}, "
+                  f"moved to {segment}{REJECTED_SUFFIX}", file=sys.stderr)
+            return True
+        return False
+
+    def step(self) -> bool:
+        """
+        Deliver one batch from the oldest segment with pending data.
+
+        Returns:
+            True if progress was made, False if idle or the send failed
+        """
+        for segment in self.reader.segments():
+            offset = self.reader.offset(segment)
+            lines, end = self.reader.read(segment, offset, self.batch_bytes)
+
+            if lines:
+                return self._deliver_batch(segment, lines, end)
+
+            if self.reader.is_drained(segment, offset):
+                self.reader.remove(segment)
+                return True
+
+        # Every segment is delivered (some may still be in their grace
+        # period) - claim whatever the hooks appended meanwhile.
+        return self.reader.claim() is not None
+
+    def _deliver_batch(self, segment: str, lines: list[bytes], end: int) -> bool:
+        if not self.deliver(segment, lines):
+            self.failures += 1
+            return False
+
+        self.reader.commit(segment, end)
+        self.failures = 0
+        return True
+
+    def backoff(self) -> float:
+        """Delay before the next attempt, with jitter."""
+        if not self.failures:
+            return IDLE_INTERVAL_S
+        delay = min(BACKOFF_MAX_S, BACKOFF_BASE_S * (2 ** (self.failures - 1)))
+        return delay * (0.5 + random.random() / 2)
+
+
+def acquire_lock(spool_dir: str):
+    """Ensure a single flusher per spool directory (POSIX only)."""
+    try:
+        import fcntl
+    except ImportError:
+        return None
+
+    lock = open(os.path.join(spool_dir, "flusher.lock"), "w")
+    try:
+        fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        lock.close()
+        print(f"Another flusher is already draining {spool_dir}", file=sys.stderr)
+        sys.exit(1)
+    return lock
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Deliver spooled AIOX monitor events")
+    parser.add_argument('--once', action='store_true', help='Drain the spool once and exit')
+    parser.add_argument('--dir', default=SPOOL_DIR, help=f'Spool directory (default: {SPOOL_DIR})')
+    args = parser.parse_args()
+
+    reader = SpoolReader(args.dir)
+    lock = acquire_lock(args.dir)
+    flusher = Flusher(reader)
+
+    running = True
+
+    def stop(*_):
+        nonlocal running
+        running = False
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+
+    try:
+        while running:
+            if flusher.step():
+                continue
+            if args.once:
+                sys.exit(1 if flusher.failures else 0)
+            time.sleep(flusher.backoff())
+    finally:
+        if lock is not None:
+            lock.close()
+
+
+if __name__ == "__main__":
+    main()
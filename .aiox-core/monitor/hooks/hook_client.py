@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Hook client shim - forwards a hook event to the resident hook host.
+
+Configure it in place of the individual hook scripts, passing the event type:
+    python3 ~/.claude/hooks/hook_client.py PreToolUse
+
+Stdin is streamed to hook_host.py over a unix socket and the shim exits
+without waiting for the event to be processed. When no host is running,
+or the host refuses the event because it was started with different
+settings, it execs the regular hook script, so events are never lost.
+"""
+
+import os
+import socket
+import sys
+
+# Add lib to path
+sys.path.insert(0, os.path.dirname(__file__))
+
+from lib.hook_protocol import ACCEPT, HOOK_MODULES, SOCKET_PATH, encode_header
+
+# How long to wait for the host to accept before running the hook here
+ACCEPT_TIMEOUT_S = 1.0
+
+
+def run_hook(module: str) -> None:
+    """Replace this process with the regular hook script."""
+    script = os.path.join(os.path.dirname(os.path.abspath(__file__)), f"{module}.py")
+    os.execv(sys.executable, [sys.executable, script])
+
+
+def main():
+    event_type = sys.argv[1] if len(sys.argv) > 1 else ""
+    module = HOOK_MODULES.get(event_type)
+    if module is None:
+        print(f"Unknown hook event type: {event_type!r}", file=sys.stderr)
+        sys.exit(0)
+
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.settimeout(ACCEPT_TIMEOUT_S)
+        sock.connect(SOCKET_PATH)
+        sock.sendall(encode_header(event_type, os.getcwd()))
+        accepted = sock.recv(1) == ACCEPT
+    except OSError:
+        accepted = False
+    if not accepted:
+        # No host, or one configured differently - run the hook in this process
+        sock.close()
+        run_hook(module)
+
+    try:
+        sock.settimeout(None)
+        stdin = sys.stdin.buffer
+        while True:
+            chunk = stdin.read(65536)
+            if not chunk:
+                break
+            sock.sendall(chunk)
+    except OSError:
+        pass
+    finally:
+        sock.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Resident hook host - processes hook events without a Python start per event.
+
+Preloads lib.enrich, lib.send_event and every hook module once, then
+accepts events from hook_client.py over a unix socket. Events are handled
+in order by a single worker that keeps its monitor connection open.
+
+Settings the libs read at import time (HOST_SETTINGS, e.g. AIOX_MONITOR_URL)
+come from the host's own environment. Clients whose values differ are
+refused and run the hook themselves.
+
+Usage:
+    python3 hook_host.py                  # Listen on the default socket
+    python3 hook_host.py --socket PATH    # Or AIOX_HOOK_HOST_SOCKET=PATH
+"""
+
+import argparse
+import importlib
+import os
+import queue
+import signal
+import socket
+import socketserver
+import sys
+import threading
+
+# Add lib to path
+sys.path.insert(0, os.path.dirname(__file__))
+
+from lib.hook_protocol import ACCEPT, HOOK_MODULES, REFUSE, SOCKET_PATH, read_header, settings_match
+from lib.json_stream import load_truncated
+
+QUEUE_SIZE = 10000
+READ_TIMEOUT_S = 5.0
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    timeout = READ_TIMEOUT_S
+
+    def handle(self):
+        # Parse while reading, so a multi-megabyte tool result is never
+        # held in memory as a whole (see lib/json_stream.py)
+        try:
+            header = read_header(self.rfile)
+            if header is None:
+                # Liveness probe from a second host starting up
+                return
+            event_type, cwd, env = header
+            if event_type not in self.server.hooks:
+                return
+            if not settings_match(env):
+                self.server.refused += 1
+                self.wfile.write(REFUSE)
+                return
+            self.wfile.write(ACCEPT)
+            data = load_truncated(self.rfile)
+        except (OSError, ValueError) as e:
+            print(f"Hook host: dropped malformed request: {e}", file=sys.stderr)
+            return
+
+        try:
+            self.server.events.put_nowait((event_type, cwd, env, data))
+        except queue.Full:
+            # Never let a stuck monitor grow the host without bound
+            self.server.dropped += 1
+
+
+class HookHost(socketserver.ThreadingUnixStreamServer):
+    """Unix socket server feeding hook events to a single worker thread."""
+
+    daemon_threads = True
+
+    def __init__(self, socket_path: str):
+        self.hooks = {event_type: importlib.import_module(module)
+                      for event_type, module in HOOK_MODULES.items()}
+        self.events: queue.Queue = queue.Queue(maxsize=QUEUE_SIZE)
+        self.dropped = 0
+        self.refused = 0
+        self.processed = 0
+        self.socket_path = socket_path
+
+        _remove_stale_socket(socket_path)
+        super().__init__(socket_path, _RequestHandler)
+        os.chmod(socket_path, 0o600)
+
+        self.worker = threading.Thread(target=self._work, name="hook-worker", daemon=True)
+        self.worker.start()
+
+    def _work(self):
+        while True:
+            request = self.events.get()
+            if request is None:
+                return
+            try:
+                self.process(*request)
+            except Exception as e:
+                print(f"Hook host: failed to process event: {e}", file=sys.stderr)
+
+    def process(self, event_type: str, cwd: str, env: dict[str, str], data) -> None:
+        """Run the matching hook's handle() for one parsed request."""
+        hook = self.hooks.get(event_type)
+        if hook is None:
+            return
+
+        if isinstance(data, dict):
+            data.setdefault("cwd", cwd)
+        hook.handle(data, env)
+        self.processed += 1
+
+    def server_close(self):
+        self.events.put(None)
+        self.worker.join(timeout=READ_TIMEOUT_S)
+        super().server_close()
+        try:
+            os.remove(self.socket_path)
+        except FileNotFoundError:
+            pass
+
+
+def _remove_stale_socket(socket_path: str) -> None:
+    """Remove a socket left by a crashed host; refuse to start twice."""
+    if not os.path.exists(socket_path):
+        os.makedirs(os.path.dirname(socket_path) or ".", exist_ok=True)
+        return
+
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(socket_path)
+    except OSError:
+        os.remove(socket_path)
+        return
+    finally:
+        probe.close()
+
+    print(f"Another hook host is already listening on {socket_path}", file=sys.stderr)
+    sys.exit(1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Resident host for AIOX monitor hooks")
+    parser.add_argument('--socket', default=SOCKET_PATH, help=f'Unix socket path (default: {SOCKET_PATH})')
+    args = parser.parse_args()
+
+    host = HookHost(args.socket)
+
+    def stop(*_):
+        threading.Thread(target=host.shutdown, daemon=True).start()
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+
+    print(f"Hook host listening on {args.socket}", file=sys.stderr)
+    try:
+        host.serve_forever()
+    finally:
+        host.server_close()
+
+
+if __name__ == "__main__":
+    main()
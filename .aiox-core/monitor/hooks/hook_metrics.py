@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Hook overhead report - p50/p95/p99 per hook type from lib/metrics.py.
+
+Hooks record their stage timings only while AIOX_MONITOR_METRICS=1 is set
+in their environment. Percentiles are bucket upper bounds (within about
+6% of the true value, never below it).
+
+Usage:
+    python3 hook_metrics.py                 # Table per hook type and stage
+    python3 hook_metrics.py --json          # Same data as JSON
+    python3 hook_metrics.py --slo-ms 50     # Exit 1 if any hook's p99 total exceeds 50 ms
+    python3 hook_metrics.py --reset         # Zero all histograms
+
+Exit codes:
+    0 - Report printed (and every hook within the SLO)
+    1 - A hook's p99 total overhead exceeds --slo-ms
+"""
+
+import argparse
+import json
+import os
+import sys
+
+# Add lib to path
+sys.path.insert(0, os.path.dirname(__file__))
+
+from lib.metrics import COUNTERS, METRICS_FILE, STAGES, percentile, read_metrics, reset_metrics
+
+PERCENTILES = (50, 95, 99)
+
+
+def summarize(metrics: dict) -> dict:
+    """Percentiles (ms) per hook type and stage, plus the send counters."""
+    summary = {}
+    for event_type, entry in metrics.items():
+        stages = {}
+        for stage in STAGES:
+            histogram = entry["stages"].get(stage)
+            if histogram is None:
+                continue
+            stages[stage] = {
+                "count": histogram["count"],
+                "mean_ms": round(histogram["sum_us"] / histogram["count"] / 1000, 3),
+                **{f"p{pct}_ms": percentile(histogram, pct) / 1000 for pct in PERCENTILES},
+                "max_ms": histogram["max_us"] / 1000,
+            }
+        summary[event_type] = {"stages": stages, **{name: entry[name] for name in COUNTERS}}
+    return summary
+
+
+def print_report(summary: dict, path: str) -> None:
+    if not summary:
+        print(f"No hook metrics recorded in {path} (run hooks with AIOX_MONITOR_METRICS=1)")
+        return
+
+    print(f"Hook overhead from {path}")
+    for event_type, entry in summary.items():
+        runs = entry["stages"].get("total", {}).get("count", 0)
+        print()
+        print(f"{event_type}: {runs} runs, sends: {entry['send_ok']} ok, "
+              f"{entry['send_failed']} failed, {entry['send_timeout']} timed out")
+        print(f"  {'stage':<9} {'count':>8} {'mean ms':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9}")
+        for stage, row in entry["stages"].items():
+            print(f"  {stage:<9} {row['count']:>8} {row['mean_ms']:>9.2f} {row['p50_ms']:>9.2f} "
+                  f"{row['p95_ms']:>9.2f} {row['p99_ms']:>9.2f} {row['max_ms']:>9.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Report AIOX monitor hook overhead")
+    parser.add_argument('--json', action='store_true', help='Output as JSON')
+    parser.add_argument('--slo-ms', type=float, help='Fail if any hook p99 total exceeds this many ms')
+    parser.add_argument('--reset', action='store_true', help='Zero all histograms and counters')
+    parser.add_argument('--file', default=METRICS_FILE, help=f'Histogram file (default: {METRICS_FILE})')
+    args = parser.parse_args()
+
+    if args.reset:
+        reset_metrics(args.file)
+        print(f"Reset hook metrics in {args.file}")
+        return
+
+    summary = summarize(read_metrics(args.file))
+    if args.json:
+        print(json.dumps(summary, indent=2))
+    else:
+        print_report(summary, args.file)
+
+    if args.slo_ms is not None:
+        over = [
+            (event_type, entry["stages"]["total"]["p99_ms"])
+            for event_type, entry in summary.items()
+            if "total" in entry["stages"] and entry["stages"]["total"]["p99_ms"] > args.slo_ms
+        ]
+        for event_type, p99 in over:
+            print(f"SLO violated: {event_type} p99 {p99:.2f} ms > {args.slo_ms:g} ms", file=sys.stderr)
+        if over:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,437 @@
+#!/usr/bin/env python3
+"""
+Local binary archive of every hook event, for offline analysis and replay.
+
+With AIOX_MONITOR_ARCHIVE=1 every hook event is appended here in full,
+after enrichment and before sampling and shaping, whatever happens to
+its delivery. Unlike the spool (a delivery queue the flusher empties),
+the archive keeps events until retention removes whole segments.
+
+Layout of the archive directory:
+    active.axr / active.axi         - segment and index being written
+    segment-<ns>.axr / .axi         - closed segments, <ns> = creation time
+
+Segment file: SEGMENT_MAGIC and the creation time (int64 ns), then records
+    <I payload length> <I CRC-32 of payload> <q timestamp ms>
+    <B type length> <B session length> <type> <session> <payload>
+with the event data as MessagePack payload (lib/packing.py). Integers are
+little endian.
+
+Index file: one INDEX_ENTRY per record, in write order:
+    <Q record offset> <I record size> <I CRC-32 of session> <I CRC-32 of type> <q timestamp ms>
+
+Readers filter on the index and the record headers and decode only the
+payloads they return. An index entry that does not match its record, and
+records missing from the index (crash between the two writes), are found
+by scanning the length-prefixed records, so the index is only ever a
+shortcut.
+
+Writers serialize on an flock of the active segment. Rotation happens
+on the next append once the segment exceeds SEGMENT_BYTES or
+SEGMENT_AGE_S. The oldest segments are removed once the archive exceeds
+AIOX_MONITOR_ARCHIVE_MAX_MB.
+
+Environment:
+    AIOX_MONITOR_ARCHIVE=1             - archive every hook event
+    AIOX_MONITOR_ARCHIVE_DIR=PATH      - archive directory
+    AIOX_MONITOR_ARCHIVE_MAX_MB=512    - retention limit
+"""
+
+from __future__ import annotations
+
+import os
+import struct
+import time
+import zlib
+
+from .packing import pack, unpack
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any, Iterator, Mapping
+
+ARCHIVE_DIR = os.environ.get(
+    "AIOX_MONITOR_ARCHIVE_DIR",
+    os.path.join(os.path.expanduser("~"), ".cache", "aiox", "monitor", "archive"),
+)
+MAX_ARCHIVE_BYTES = int(os.environ.get("AIOX_MONITOR_ARCHIVE_MAX_MB", "512")) * 1024 * 1024
+SEGMENT_BYTES = 16 * 1024 * 1024
+SEGMENT_AGE_S = 3600
+
+ACTIVE_NAME = "active"
+SEGMENT_PREFIX = "segment-"
+SEGMENT_SUFFIX = ".axr"
+INDEX_SUFFIX = ".axi"
+
+SEGMENT_MAGIC = b"AIOXAR01"
+SEGMENT_HEADER = struct.Struct("<8sq")
+RECORD_HEADER = struct.Struct("<IIqBB")
+INDEX_ENTRY = struct.Struct("<QIIIq")
+
+
+def archive_hook_event(
+    event_type: str, data: dict[str, Any], env: Mapping[str, str] | None = None
+) -> bool:
+    """
+    Archive an enriched hook event if AIOX_MONITOR_ARCHIVE is set.
+
+    Called before sampling and shaping, so the archive has every event
+    in full.
+
+    Returns:
+        True if archived, False if disabled or archiving failed
+    """
+    if env is None:
+        env = os.environ
+    if env.get("AIOX_MONITOR_ARCHIVE", "").lower() not in ("1", "true", "yes"):
+        return False
+    return archive_event(event_type, data)
+
+
+def archive_event(event_type: str, data: dict[str, Any], archive_dir: str = ARCHIVE_DIR) -> bool:
+    """
+    Append one event to the archive.
+
+    Args:
+        event_type: Hook event type (PreToolUse, PostToolUse, etc.)
+        data: Event data (stored as is)
+        archive_dir: Archive directory
+
+    Returns:
+        True if archived, False otherwise (never raises)
+    """
+    try:
+        session = data.get("session_id")
+        session_bytes = session.encode("utf-8")[:255] if isinstance(session, str) else b""
+        type_bytes = event_type.encode("utf-8")[:255]
+        payload = pack(data)
+        timestamp = int(time.time() * 1000)
+
+        record = b"".join((
+            RECORD_HEADER.pack(len(payload), zlib.crc32(payload), timestamp, len(type_bytes), len(session_bytes)),
+            type_bytes,
+            session_bytes,
+            payload,
+        ))
+        return _append(archive_dir, record, zlib.crc32(session_bytes), zlib.crc32(type_bytes), timestamp)
+    except Exception:
+        # Archiving must never break a hook
+        return False
+
+
+def _append(archive_dir: str, record: bytes, session_crc: int, type_crc: int, timestamp: int) -> bool:
+    import fcntl
+
+    path = os.path.join(archive_dir, ACTIVE_NAME + SEGMENT_SUFFIX)
+
+    for _ in range(3):
+        try:
+            fd = os.open(path, os.O_RDWR | os.O_APPEND | os.O_CREAT, 0o600)
+        except FileNotFoundError:
+            os.makedirs(archive_dir, exist_ok=True)
+            fd = os.open(path, os.O_RDWR | os.O_APPEND | os.O_CREAT, 0o600)
+
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            size = os.fstat(fd).st_size
+            try:
+                if os.stat(path).st_ino != os.fstat(fd).st_ino:
+                    # Rotated while we waited for the lock
+                    continue
+            except FileNotFoundError:
+                continue
+
+            now_ns = time.time_ns()
+            if size < SEGMENT_HEADER.size:
+                os.ftruncate(fd, 0)
+                os.write(fd, SEGMENT_HEADER.pack(SEGMENT_MAGIC, now_ns))
+                size = SEGMENT_HEADER.size
+            else:
+                magic, created_ns = SEGMENT_HEADER.unpack(os.pread(fd, SEGMENT_HEADER.size, 0))
+                too_big = size + len(record) > SEGMENT_BYTES and size > SEGMENT_HEADER.size
+                if magic != SEGMENT_MAGIC or too_big or now_ns - created_ns > SEGMENT_AGE_S * 1_000_000_000:
+                    _rotate(archive_dir, created_ns if magic == SEGMENT_MAGIC else now_ns)
+                    continue
+
+            _write_all(fd, record)
+            index_fd = os.open(os.path.join(archive_dir, ACTIVE_NAME + INDEX_SUFFIX),
+                               os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o600)
+            try:
+                _write_all(index_fd, INDEX_ENTRY.pack(size, len(record), session_crc, type_crc, timestamp))
+            finally:
+                os.close(index_fd)
+            return True
+        finally:
+            # Closing the descriptor releases the lock
+            os.close(fd)
+
+    return False
+
+
+def _write_all(fd: int, data: bytes) -> None:
+    view = memoryview(data)
+    while view:
+        view = view[os.write(fd, view):]
+
+
+def _rotate(archive_dir: str, created_ns: int) -> None:
+    """Close the active segment (caller holds its lock) and apply retention."""
+    name = os.path.join(archive_dir, f"{SEGMENT_PREFIX}{created_ns:020d}")
+    active = os.path.join(archive_dir, ACTIVE_NAME)
+    # Index first: a crash in between leaves records without an index
+    # (found by scanning), never an index describing the wrong segment
+    try:
+        os.replace(active + INDEX_SUFFIX, name + INDEX_SUFFIX)
+    except FileNotFoundError:
+        pass
+    os.replace(active + SEGMENT_SUFFIX, name + SEGMENT_SUFFIX)
+
+    segments = _closed_segments(archive_dir)
+    total = sum(_size(path) + _size(path[:-len(SEGMENT_SUFFIX)] + INDEX_SUFFIX) for path in segments)
+    for path in segments[:-1]:
+        if total <= MAX_ARCHIVE_BYTES:
+            break
+        index = path[:-len(SEGMENT_SUFFIX)] + INDEX_SUFFIX
+        total -= _size(path) + _size(index)
+        for victim in (path, index):
+            try:
+                os.remove(victim)
+            except FileNotFoundError:
+                pass
+
+
+def _closed_segments(archive_dir: str) -> list[str]:
+    try:
+        names = os.listdir(archive_dir)
+    except FileNotFoundError:
+        return []
+    return [
+        os.path.join(archive_dir, name) for name in sorted(names)
+        if name.startswith(SEGMENT_PREFIX) and name.endswith(SEGMENT_SUFFIX)
+    ]
+
+
+def _size(path: str) -> int:
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return 0
+
+
+class ArchiveRecord:
+    """One record located in a segment; the payload is decoded on demand."""
+
+    __slots__ = ("segment", "offset", "size", "timestamp", "type", "session_id")
+
+    def __init__(self, segment: str, offset: int, size: int, timestamp: int, event_type: str, session_id: str):
+        self.segment = segment
+        self.offset = offset
+        self.size = size
+        self.timestamp = timestamp
+        self.type = event_type
+        self.session_id = session_id
+
+
+class ArchiveReader:
+    """Streams or seeks archived events through mmap views of the segments."""
+
+    def __init__(self, archive_dir: str = ARCHIVE_DIR):
+        self.archive_dir = archive_dir
+
+    def segments(self) -> list[str]:
+        """Segment files, oldest first (the active one last)."""
+        paths = _closed_segments(self.archive_dir)
+        active = os.path.join(self.archive_dir, ACTIVE_NAME + SEGMENT_SUFFIX)
+        if os.path.exists(active):
+            paths.append(active)
+        return paths
+
+    def events(
+        self,
+        session_id: str | None = None,
+        event_type: str | None = None,
+        since: int | None = None,
+        until: int | None = None,
+    ) -> Iterator[dict[str, Any]]:
+        """
+        Matching events as monitor envelopes ({"type", "timestamp", "data"}).
+
+        Args:
+            session_id: Only this session
+            event_type: Only this event type
+            since: Only events at or after this timestamp (ms)
+            until: Only events before this timestamp (ms)
+
+        Records with a bad checksum are skipped.
+        """
+        for path in self.segments():
+            with _Segment(path) as segment:
+                for record in segment.records(session_id, event_type, since, until):
+                    data = segment.payload(record)
+                    if data is not None:
+                        yield {"type": record.type, "timestamp": record.timestamp, "data": data}
+
+    def records(
+        self,
+        session_id: str | None = None,
+        event_type: str | None = None,
+        since: int | None = None,
+        until: int | None = None,
+    ) -> Iterator[ArchiveRecord]:
+        """Like events(), but only locates records (no payload decoding)."""
+        for path in self.segments():
+            with _Segment(path) as segment:
+                yield from segment.records(session_id, event_type, since, until)
+
+    def sessions(self) -> dict[str, int]:
+        """Session id -> number of archived events (record headers only)."""
+        counts: dict[str, int] = {}
+        for record in self.records():
+            counts[record.session_id] = counts.get(record.session_id, 0) + 1
+        return counts
+
+
+class _Segment:
+    """mmap view of one segment and its index."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.mm = None
+
+    def __enter__(self) -> _Segment:
+        import mmap
+
+        with open(self.path, "rb") as f:
+            if os.fstat(f.fileno()).st_size > SEGMENT_HEADER.size:
+                self.mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return self
+
+    def __exit__(self, *_):
+        if self.mm is not None:
+            self.mm.close()
+
+    def records(
+        self, session_id: str | None, event_type: str | None, since: int | None, until: int | None
+    ) -> Iterator[ArchiveRecord]:
+        mm = self.mm
+        if mm is None or mm[:len(SEGMENT_MAGIC)] != SEGMENT_MAGIC:
+            return
+
+        session_bytes = session_id.encode("utf-8")[:255] if session_id is not None else None
+        type_bytes = event_type.encode("utf-8")[:255] if event_type is not None else None
+        session_crc = zlib.crc32(session_bytes) if session_bytes is not None else None
+        type_crc = zlib.crc32(type_bytes) if type_bytes is not None else None
+
+        for offset, size, entry_session_crc, entry_type_crc, timestamp in self._entries():
+            if session_crc is not None and entry_session_crc != session_crc:
+                continue
+            if type_crc is not None and entry_type_crc != type_crc:
+                continue
+            if (since is not None and timestamp < since) or (until is not None and timestamp >= until):
+                continue
+
+            length, _, record_ts, type_len, session_len = RECORD_HEADER.unpack_from(mm, offset)
+            if record_ts != timestamp or RECORD_HEADER.size + type_len + session_len + length != size:
+                # Only the ends of a fast-path index were checked
+                continue
+            start = offset + RECORD_HEADER.size
+            record_type = mm[start:start + type_len]
+            record_session = mm[start + type_len:start + type_len + session_len]
+            # CRCs only narrow the search; the header has the real strings
+            if type_bytes is not None and record_type != type_bytes:
+                continue
+            if session_bytes is not None and record_session != session_bytes:
+                continue
+            yield ArchiveRecord(
+                self.path, offset, size, timestamp,
+                record_type.decode("utf-8", "replace"), record_session.decode("utf-8", "replace"),
+            )
+
+    def payload(self, record: ArchiveRecord) -> Any:
+        """Decoded event data of a record, or None if its checksum fails."""
+        length, crc, _, type_len, session_len = RECORD_HEADER.unpack_from(self.mm, record.offset)
+        start = record.offset + RECORD_HEADER.size + type_len + session_len
+        payload = self.mm[start:start + length]
+        if zlib.crc32(payload) != crc:
+            return None
+        try:
+            return unpack(payload)
+        except ValueError:
+            return None
+
+    def _entries(self) -> list[tuple[int, int, int, int, int]]:
+        """
+        Index entries that match their records, in offset order, with
+        records the index lacks recovered by scanning.
+        """
+        mm = self.mm
+        end = len(mm)
+        index_path = self.path[:-len(SEGMENT_SUFFIX)] + INDEX_SUFFIX
+        try:
+            with open(index_path, "rb") as f:
+                raw = f.read()
+        except OSError:
+            raw = b""
+        raw = raw[:len(raw) - len(raw) % INDEX_ENTRY.size]
+        entries = list(INDEX_ENTRY.iter_unpack(raw))
+
+        # Entries written after this view was mapped
+        while entries and entries[-1][0] + entries[-1][1] > end:
+            entries.pop()
+
+        # Fast path: the writer appends entries in record order, so an index
+        # that starts at the first record, matches its first and last records
+        # and whose sizes add up to the span it covers is complete
+        if entries:
+            first, last = entries[0], entries[-1]
+            covered = last[0] + last[1]
+            if (
+                first[0] == SEGMENT_HEADER.size
+                and self._matches(first)
+                and self._matches(last)
+                and sum(entry[1] for entry in entries) == covered - SEGMENT_HEADER.size
+            ):
+                return entries + self._scan(covered, end)
+
+        checked = []
+        pos = SEGMENT_HEADER.size
+        for entry in sorted(entries):
+            offset, size = entry[0], entry[1]
+            if offset < pos:
+                # Duplicate
+                continue
+            if not self._matches(entry):
+                # Index from another segment or torn: trust the records
+                checked = []
+                pos = SEGMENT_HEADER.size
+                break
+            if offset > pos:
+                checked.extend(self._scan(pos, offset))
+            checked.append(entry)
+            pos = offset + size
+        checked.extend(self._scan(pos, end))
+        return checked
+
+    def _matches(self, entry: tuple[int, int, int, int, int]) -> bool:
+        offset, size, session_crc, type_crc, timestamp = entry
+        if offset + RECORD_HEADER.size > len(self.mm):
+            return False
+        length, _, record_ts, type_len, session_len = RECORD_HEADER.unpack_from(self.mm, offset)
+        return RECORD_HEADER.size + type_len + session_len + length == size and record_ts == timestamp
+
+    def _scan(self, pos: int, end: int) -> list[tuple[int, int, int, int, int]]:
+        """Walk length-prefixed records from pos to end, building index entries."""
+        mm = self.mm
+        entries = []
+        while pos + RECORD_HEADER.size <= end:
+            length, _, timestamp, type_len, session_len = RECORD_HEADER.unpack_from(mm, pos)
+            start = pos + RECORD_HEADER.size
+            size = RECORD_HEADER.size + type_len + session_len + length
+            if pos + size > end:
+                # Torn tail of a crashed writer
+                break
+            type_crc = zlib.crc32(mm[start:start + type_len])
+            session_crc = zlib.crc32(mm[start + type_len:start + type_len + session_len])
+            entries.append((pos, size, session_crc, type_crc, timestamp))
+            pos += size
+        return entries
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Small on-disk state shared between hook processes.
+
+Each hook is a fresh interpreter, so anything worth remembering across
+events lives in JSON files under AIOX_CACHE_DIR (default ~/.cache/aiox).
+Writes go through a temp file and os.replace, so readers never see a
+partial file; concurrent writers simply race and the last one wins.
+"""
+
+import json
+import os
+
+CACHE_DIR = os.environ.get("AIOX_CACHE_DIR") or os.path.join(
+    os.path.expanduser("~"), ".cache", "aiox"
+)
+
+
+def cache_path(name: str) -> str:
+    """Path of a cache file inside CACHE_DIR."""
+    return os.path.join(CACHE_DIR, name)
+
+
+def load_json(path: str, default=None):
+    """Read a JSON cache file, returning default if missing or corrupt."""
+    try:
+        with open(path, "rb") as f:
+            return json.loads(f.read())
+    except (OSError, ValueError):
+        return default
+
+
+def save_json(path: str, value) -> bool:
+    """
+    Atomically replace a JSON cache file.
+
+    Returns:
+        True if written, False otherwise (never raises)
+    """
+    tmp = f"{path}.{os.getpid()}.tmp"
+    payload = json.dumps(value, separators=(",", ":")).encode("utf-8")
+
+    for attempt in range(2):
+        try:
+            with open(tmp, "wb") as f:
+                f.write(payload)
+            os.replace(tmp, path)
+            return True
+        except FileNotFoundError:
+            if attempt:
+                return False
+            try:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+            except OSError:
+                return False
+        except OSError:
+            return False
+
+    return False
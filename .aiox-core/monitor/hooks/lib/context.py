@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Session-scoped delta encoding of the enrichment context.
+
+The context block (project, plus aiox_agent, aiox_story_id and aiox_task_id
+from the AIOX_* environment) is the same for every event of a session. enrich_event() takes
+it from a per-session cache file rather than reading the environment and
+the filesystem each time. On the wire, the first event of a session, any
+event after the context changed, and one event every CONTEXT_REFRESH_S
+carry the whole block. Every other event carries only its id:
+
+    full:   {"context_id": "1a2b3c4d", "context": {"project": ..., ...}, ...}
+    delta:  {"context_id": "1a2b3c4d", ...}
+
+The id is a CRC-32 of the block, so the same context always gets the same
+id. A context counts as known to the monitor only once an event carrying
+it was sent successfully. A context field that an event sets to a value
+of its own stays in the event (for example an agent detected from a
+prompt), and the decoder never overwrites it.
+
+The cache entry of a session is keyed by the cwd and every AIOX_* variable
+of the hook process. Changing either one rebuilds the context.
+
+Reference decoder: the monitor server's lib/context.py (ContextDecoder).
+
+Environment:
+    AIOX_MONITOR_CONTEXT_DELTA=0   - always send the full context fields
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import time
+import zlib
+
+from .cache import cache_path, load_json, save_json
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any, Mapping
+
+SESSIONS_DIR = cache_path("sessions")
+# Resend the full block now and then, so a restarted monitor relearns it
+CONTEXT_REFRESH_S = 300
+# Session files untouched this long are removed when a new session starts
+SESSION_TTL_S = 7 * 24 * 3600
+MEMO_SIZE = 256
+
+# session id -> cache entry; lets the resident hook host skip the file
+_entries: dict[str, dict[str, Any]] = {}
+
+
+def context_key(cwd: str, env: Mapping[str, str]) -> str:
+    """Everything the context is derived from: cwd and the AIOX_* variables."""
+    fields = [cwd]
+    fields.extend(sorted(f"{key}={value}" for key, value in env.items() if key.startswith("AIOX_")))
+    return "\0".join(fields)
+
+
+def context_id(context: dict[str, Any]) -> str:
+    """Stable id of a context block (CRC-32 of its canonical JSON)."""
+    canonical = json.dumps(context, sort_keys=True, separators=(",", ":")).encode("utf-8")
+    return format(zlib.crc32(canonical), "08x")
+
+
+def load_context(session_id: Any, key: str) -> dict[str, Any] | None:
+    """
+    Cached context entry of a session, if it was built for the same key.
+
+    Returns:
+        {"key", "root", "context", "id", "sent_at"} or None
+    """
+    path = _session_path(session_id)
+    if path is None:
+        return None
+
+    entry = _entries.get(session_id)
+    if entry is None:
+        entry = load_json(path, None)
+    if not isinstance(entry, dict) or entry.get("key") != key or not isinstance(entry.get("context"), dict):
+        return None
+    _remember(session_id, entry)
+    return entry
+
+
+def save_context(session_id: Any, key: str, root: str, context: dict[str, Any]) -> None:
+    """Cache a freshly built context; it is sent in full until delivered once."""
+    path = _session_path(session_id)
+    if path is None:
+        return
+
+    if not os.path.exists(path):
+        _prune(time.time())
+    entry = {"key": key, "root": root, "context": context, "id": context_id(context), "sent_at": None}
+    _remember(session_id, entry)
+    save_json(path, entry)
+
+
+def send_with_context(
+    event_type: str, data: dict[str, Any], env: Mapping[str, str] | None = None,
+    timestamp: int | None = None,
+) -> bool:
+    """
+    Send an enriched event with its session context delta-encoded.
+
+    Args:
+        event_type: Hook event type (PreToolUse, PostToolUse, etc.)
+        data: Enriched event data (left unchanged)
+        env: Environment of the hook process (defaults to os.environ)
+        timestamp: Envelope timestamp in ms (defaults to now, see send_event)
+
+    Returns:
+        True if sent (or spooled) successfully, False otherwise
+    """
+    from .send_event import send_event
+
+    if env is None:
+        env = os.environ
+    session_id = data.get("session_id")
+    entry = _entries.get(session_id) if isinstance(session_id, str) else None
+    if entry is None or env.get("AIOX_MONITOR_CONTEXT_DELTA", "1").lower() in ("0", "false", "no"):
+        return send_event(event_type, data, timestamp)
+
+    context = entry["context"]
+    if any(field not in data for field in context):
+        # Decoding would add a field the event does not have
+        return send_event(event_type, data, timestamp)
+
+    payload = {
+        key: value for key, value in data.items()
+        if not (key in context and value == context[key])
+    }
+    payload["context_id"] = entry["id"]
+
+    now = time.time()
+    sent_at = entry.get("sent_at")
+    full = not isinstance(sent_at, (int, float)) or now - sent_at > CONTEXT_REFRESH_S
+    if full:
+        payload["context"] = context
+
+    sent = send_event(event_type, payload, timestamp)
+    if sent and full:
+        entry["sent_at"] = now
+        save_json(_session_path(session_id), entry)
+    return sent
+
+
+def _remember(session_id: str, entry: dict[str, Any]) -> None:
+    _entries.pop(session_id, None)
+    _entries[session_id] = entry
+    while len(_entries) > MEMO_SIZE:
+        _entries.pop(next(iter(_entries)))
+
+
+def _prune(now: float) -> None:
+    """Remove the cache files of sessions idle for SESSION_TTL_S."""
+    try:
+        with os.scandir(SESSIONS_DIR) as entries:
+            for entry in entries:
+                try:
+                    if now - entry.stat().st_mtime > SESSION_TTL_S:
+                        os.unlink(entry.path)
+                except OSError:
+                    pass
+    except OSError:
+        pass
+
+
+def _session_path(session_id: Any) -> str | None:
+    """Cache file of a session; None for ids that are not file-safe."""
+    if (
+        not isinstance(session_id, str)
+        or not 0 < len(session_id) <= 128
+        or not all(c.isascii() and (c.isalnum() or c in "-_") for c in session_id)
+    ):
+        return None
+    return os.path.join(SESSIONS_DIR, f"{session_id}.json")
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Client-side pairing of PreToolUse and PostToolUse events.
+
+Once its event is sent, the PreToolUse hook leaves a marker for the tool
+call. The PostToolUse hook takes the marker and adds duration_ms. It also
+replaces tool_input, which the monitor already got with the pre event,
+by a reference to that event:
+
+    "pre_tool_use": {"tool_use_id": "...", "timestamp": <pre event ms>}
+
+The timestamp is the one in the PreToolUse event's envelope, so the
+monitor can look the event up by it.
+
+A PostToolUse without a marker (pre event not sent, state lost) keeps its
+tool_input, so the monitor never loses the input of a call.
+
+Markers are one small file per call, named <session>.<tool_use_id>, in
+CORRELATE_DIR. They are written through a temp file and os.replace and
+consumed with os.unlink, so concurrent hooks need no lock. Markers of
+calls that never finished are pruned after STALE_S.
+
+Duration runs from the end of the PreToolUse hook to the PostToolUse hook
+on the monotonic clock, which Linux and macOS share across processes. It
+includes the start-up of the PostToolUse hook: tens of milliseconds for a
+fresh interpreter, well under one through hook_host.py.
+
+Environment:
+    AIOX_MONITOR_CORRELATE=0       - send PostToolUse events uncorrelated
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import time
+
+from .cache import cache_path
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any, Mapping
+
+CORRELATE_DIR = cache_path("tool-calls")
+STALE_S = 3600
+# One PreToolUse in PRUNE_EVERY scans the directory for stale markers
+PRUNE_EVERY = 64
+
+
+def remember_pre(
+    data: dict[str, Any], timestamp: int | None, env: Mapping[str, str] | None = None
+) -> bool:
+    """
+    Leave a marker for a sent PreToolUse event.
+
+    Args:
+        data: PreToolUse event data as sent
+        timestamp: Envelope timestamp (ms) the event was sent with
+        env: Environment of the hook process (defaults to os.environ)
+
+    Returns:
+        True if a marker was written (never raises)
+    """
+    path = _marker_path(data, env)
+    if path is None:
+        return False
+
+    marker = {"timestamp": timestamp, "monotonic_ns": time.monotonic_ns()}
+    tmp = f"{path}.{os.getpid()}.tmp"
+    try:
+        try:
+            f = open(tmp, "w", encoding="utf-8")
+        except FileNotFoundError:
+            os.makedirs(CORRELATE_DIR, exist_ok=True)
+            f = open(tmp, "w", encoding="utf-8")
+        with f:
+            f.write(json.dumps(marker, separators=(",", ":")))
+        os.replace(tmp, path)
+    except OSError:
+        return False
+
+    if marker["monotonic_ns"] // 1000 % PRUNE_EVERY == 0:
+        _prune(time.time())
+    return True
+
+
+def correlate_post(data: dict[str, Any], env: Mapping[str, str] | None = None) -> dict[str, Any]:
+    """
+    Pair a PostToolUse event with its PreToolUse marker.
+
+    Args:
+        data: PostToolUse event data
+        env: Environment of the hook process (defaults to os.environ)
+
+    Returns:
+        data with duration_ms and pre_tool_use instead of tool_input, or
+        unchanged if the pre event is unknown
+    """
+    now_ns = time.monotonic_ns()
+    path = _marker_path(data, env)
+    if path is None:
+        return data
+
+    try:
+        with open(path, "rb") as f:
+            marker = json.loads(f.read())
+        os.unlink(path)
+    except (OSError, ValueError):
+        return data
+    if not isinstance(marker, dict):
+        return data
+
+    started = marker.get("monotonic_ns")
+    if isinstance(started, int) and started <= now_ns:
+        data["duration_ms"] = (now_ns - started) // 1_000_000
+
+    data.pop("tool_input", None)
+    data["pre_tool_use"] = {"tool_use_id": data["tool_use_id"], "timestamp": marker.get("timestamp")}
+    return data
+
+
+def _marker_path(data: dict[str, Any], env: Mapping[str, str] | None) -> str | None:
+    if env is None:
+        env = os.environ
+    if env.get("AIOX_MONITOR_CORRELATE", "1").lower() in ("0", "false", "no"):
+        return None
+
+    session_id = data.get("session_id")
+    tool_use_id = data.get("tool_use_id")
+    if not (_safe_name(session_id) and _safe_name(tool_use_id)):
+        return None
+    return os.path.join(CORRELATE_DIR, f"{session_id}.{tool_use_id}")
+
+
+def _safe_name(value: Any) -> bool:
+    """Ids become file names; anything but [A-Za-z0-9_-] is not paired."""
+    return (
+        isinstance(value, str)
+        and 0 < len(value) <= 128
+        and all(c.isascii() and (c.isalnum() or c in "-_") for c in value)
+    )
+
+
+def _prune(now: float) -> None:
+    """Remove markers (and temp files of crashed hooks) older than STALE_S."""
+    try:
+        with os.scandir(CORRELATE_DIR) as entries:
+            for entry in entries:
+                try:
+                    if now - entry.stat().st_mtime > STALE_S:
+                        os.unlink(entry.path)
+                except OSError:
+                    pass
+    except OSError:
+        pass
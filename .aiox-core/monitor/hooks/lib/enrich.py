@@ -3,56 +3,267 @@
 Enrich events with AIOX context (agent, story, task, etc.)
 """
 
+from __future__ import annotations
+
 import os
-import re
-from pathlib import Path
-from typing import Any
 
+from .cache import cache_path, load_json, save_json
+from .context import context_key, load_context, save_context
 
-def enrich_event(data: dict[str, Any]) -> dict[str, Any]:
-    """Add AIOX context to event data."""
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any, Mapping
 
-    # Project detection
-    cwd = data.get("cwd", os.getcwd())
-    data["project"] = detect_project(cwd)
+PROJECT_MARKERS = (".git", "package.json", "Cargo.toml", "go.mod", "pyproject.toml")
+PROJECT_CACHE_FILE = cache_path("projects.json")
+PROJECT_CACHE_SIZE = 256
+
+# cwd -> [root, [[walked dir, mtime_ns], ...]]; lets the resident hook host skip the cache file
+_project_memo: dict[str, list] = {}
+
+# Agents known without any manifest on disk
+DEFAULT_AGENTS = ("dev", "architect", "qa", "pm", "po", "sm", "analyst", "devops", "aiox-master")
+
+# project root -> compiled @agent matcher
+_agent_matchers: dict[str | None, Any] = {}
 
-    # AIOX context from environment
-    if os.environ.get("AIOX_AGENT"):
-        data["aiox_agent"] = os.environ["AIOX_AGENT"]
 
-    if os.environ.get("AIOX_STORY_ID"):
-        data["aiox_story_id"] = os.environ["AIOX_STORY_ID"]
+def enrich_event(data: dict[str, Any], env: Mapping[str, str] | None = None) -> dict[str, Any]:
+    """
+    Add AIOX context to event data.
 
-    if os.environ.get("AIOX_TASK_ID"):
-        data["aiox_task_id"] = os.environ["AIOX_TASK_ID"]
+    Args:
+        data: Event data from Claude hook
+        env: Environment of the hook process (defaults to os.environ; the
+            hook host passes the environment forwarded by hook_client.py)
+    """
+    if env is None:
+        env = os.environ
 
-    # Try to detect AIOX agent from user prompt if available
+    # Project and AIOX context, built once per session (see lib/context.py)
+    cwd = data.get("cwd", os.getcwd())
+    session_id = data.get("session_id")
+    key = context_key(cwd, env)
+    entry = load_context(session_id, key)
+    if entry is not None:
+        root = entry["root"]
+        context = entry["context"]
+    else:
+        root, context = build_context(cwd, env)
+        save_context(session_id, key, root, context)
+    data.update(context)
+
+    # Try to detect AIOX agents from user prompt if available
     user_prompt = data.get("user_prompt", "")
-    if user_prompt:
-        detected_agent = detect_agent_from_prompt(user_prompt)
-        if detected_agent and not data.get("aiox_agent"):
-            data["aiox_agent"] = detected_agent
+    if user_prompt and isinstance(user_prompt, str):
+        detected = detect_agents_from_prompt(user_prompt, root)
+        if detected and not data.get("aiox_agent"):
+            data["aiox_agent"] = detected[0]
+        if len(detected) > 1:
+            data["aiox_agents"] = detected
 
     return data
 
 
+def build_context(cwd: str, env: Mapping[str, str]) -> tuple[str, dict[str, Any]]:
+    """
+    Read the context shared by every event of a session.
+
+    Returns:
+        (project root, context fields: project and the AIOX_* agent, story
+        and task when set)
+    """
+    # Project detection
+    root = find_project_root(cwd)
+    context = {"project": os.path.basename(root)}
+
+    # AIOX context from environment
+    if env.get("AIOX_AGENT"):
+        context["aiox_agent"] = env["AIOX_AGENT"]
+
+    if env.get("AIOX_STORY_ID"):
+        context["aiox_story_id"] = env["AIOX_STORY_ID"]
+
+    if env.get("AIOX_TASK_ID"):
+        context["aiox_task_id"] = env["AIOX_TASK_ID"]
+
+    return root, context
+
+
 def detect_project(cwd: str) -> str:
-    """Detect project name from cwd."""
-    path = Path(cwd)
+    """Detect project name from cwd (name of the project root directory)."""
+    return os.path.basename(find_project_root(cwd))
+
+
+def find_project_root(cwd: str) -> str:
+    """
+    Find the project root for cwd, using the on-disk project cache.
+
+    A cached root is trusted while the mtimes of every directory the walk
+    visited (cwd up to the root, or up to where the walk stopped) are
+    unchanged, so a repeat cwd costs one stat per level instead of probing
+    every marker in every parent directory. Adding or removing a marker in
+    any of them invalidates it.
+    """
+    cwd = os.path.normpath(cwd)
+
+    memo = _project_memo.get(cwd)
+    if memo is not None and _unchanged(memo[1]):
+        return memo[0]
+
+    cache = load_json(PROJECT_CACHE_FILE, None)
+    if not isinstance(cache, dict):
+        cache = {}
+
+    entry = cache.get(cwd)
+    if isinstance(entry, list) and len(entry) == 2 and isinstance(entry[1], list) and _unchanged(entry[1]):
+        _project_memo[cwd] = entry
+        return entry[0]
+
+    root, walked = _walk_to_project_root(cwd)
+    entry = [root, walked]
+    _project_memo[cwd] = entry
+
+    cache.pop(cwd, None)
+    cache[cwd] = entry
+    while len(cache) > PROJECT_CACHE_SIZE:
+        cache.pop(next(iter(cache)))
+    save_json(PROJECT_CACHE_FILE, cache)
+
+    return root
+
+
+def _walk_to_project_root(cwd: str) -> tuple[str, list[list]]:
+    """
+    Walk up from cwd to the project root.
+
+    The nearest directory with .git wins; without one, the nearest directory
+    with any other marker (monorepo packages, plain folders). The walk stops
+    below the home directory so a dotfiles repo in ~ never claims everything.
+    Falls back to cwd itself.
+
+    Returns:
+        (root, [[directory, mtime_ns], ...] of every directory probed),
+        the mtimes taken before probing
+    """
+    home = os.path.expanduser("~")
+    nearest = None
+    path = cwd
+    walked = []
+
+    while True:
+        if path == home:
+            break
+
+        walked.append([path, _mtime_ns(path)])
+        if os.path.exists(os.path.join(path, ".git")):
+            return path, walked
+
+        if nearest is None:
+            for marker in PROJECT_MARKERS[1:]:
+                if os.path.exists(os.path.join(path, marker)):
+                    nearest = path
+                    break
+
+        parent = os.path.dirname(path)
+        if parent == path:
+            break
+        path = parent
+
+    return nearest or cwd, walked
+
+
+def _unchanged(walked: Any) -> bool:
+    """True if every [directory, mtime_ns] pair still matches."""
+    for item in walked:
+        if not (isinstance(item, list) and len(item) == 2 and _mtime_ns(item[0]) == item[1]):
+            return False
+    return True
+
+
+def _mtime_ns(path: str) -> int:
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return -1
+
+
+def detect_agent_from_prompt(prompt: str, root: str | None = None) -> str | None:
+    """Detect AIOX agent activation from prompt (first @agent mention)."""
+    return next(_agent_mentions(prompt, root), None)
+
+
+def detect_agents_from_prompt(prompt: str, root: str | None = None) -> list[str]:
+    """
+    Detect every @agent mention in a prompt, in order of first appearance.
+
+    Args:
+        prompt: User prompt
+        root: Project root whose agent manifests are known (see agent_matcher)
+    """
+    found = []
+    for agent in _agent_mentions(prompt, root):
+        if agent not in found:
+            found.append(agent)
+    return found
+
+
+def _agent_mentions(prompt: str, root: str | None):
+    # Most prompts mention no agent at all - skip the regex engine entirely
+    if "@" not in prompt:
+        return
+
+    for match in agent_matcher(root).finditer(prompt):
+        start = match.start()
+        if start and (prompt[start - 1].isalnum() or prompt[start - 1] in "_@."):
+            # Part of an e-mail address or another token, not a mention
+            continue
+        yield match.group(1).lower()
+
+
+def agent_matcher(root: str | None = None):
+    """
+    Compiled @agent matcher for a project, built once per process and root.
+
+    Known agents are the built-in ones plus every agent manifest in the
+    project: .aiox-core/development/agents/*.md, .aiox-core/agents/*.md and
+    squads/*/agents/*.md. Matching is case-insensitive without lowercasing
+    the prompt, and longer ids win (@devops is never read as @dev).
+    """
+    matcher = _agent_matchers.get(root)
+    if matcher is not None:
+        return matcher
+
+    # Only UserPromptSubmit carries a prompt - keep re off the other hooks' path
+    import re
+
+    agents = set(DEFAULT_AGENTS)
+    if root:
+        agents.update(_manifest_agents(root))
 
-    # Check for common project markers
-    markers = [".git", "package.json", "Cargo.toml", "go.mod", "pyproject.toml"]
-    for marker in markers:
-        if (path / marker).exists():
-            return path.name
+    alternation = "|".join(re.escape(a) for a in sorted(agents, key=lambda a: (-len(a), a)))
+    matcher = re.compile(rf"@({alternation})(?![\w-])", re.IGNORECASE)
+    _agent_matchers[root] = matcher
+    return matcher
 
-    return path.name
 
+def _manifest_agents(root: str) -> set[str]:
+    """Agent ids (manifest file names) defined in a project."""
+    dirs = [
+        os.path.join(root, ".aiox-core", "development", "agents"),
+        os.path.join(root, ".aiox-core", "agents"),
+    ]
+    squads_dir = os.path.join(root, "squads")
+    try:
+        dirs.extend(os.path.join(squads_dir, squad, "agents") for squad in os.listdir(squads_dir))
+    except OSError:
+        pass
 
-def detect_agent_from_prompt(prompt: str) -> str | None:
-    """Detect AIOX agent activation from prompt."""
-    # Look for @agent patterns
-    match = re.search(r'@(dev|architect|qa|pm|po|sm|analyst|devops|aiox-master)', prompt.lower())
-    if match:
-        return match.group(1)
-    return None
+    agents = set()
+    for agents_dir in dirs:
+        try:
+            names = os.listdir(agents_dir)
+        except OSError:
+            continue
+        agents.update(name[:-3].lower() for name in names if name.endswith(".md"))
+    return agents
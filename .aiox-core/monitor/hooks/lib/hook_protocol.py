@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Wire protocol between hook_client.py and the resident hook_host.py.
+
+Kept dependency-free (os only) so the client shim stays cheap to start.
+
+A request is one unix socket connection:
+    <event type>\\0<cwd>\\0<KEY=VALUE>\\0...\\0\\0<raw hook payload from stdin>
+The environment part carries the AIOX_* variables of the hook process.
+
+After the header the host replies with one byte. ACCEPT: the client
+streams the payload and closes the connection without waiting for the
+event to be processed. REFUSE: the host was started with different
+HOST_SETTINGS, so the client runs the hook itself (its stdin is still
+unread).
+"""
+
+from __future__ import annotations
+
+import os
+
+SOCKET_PATH = os.environ.get("AIOX_HOOK_HOST_SOCKET") or os.path.join(
+    os.environ.get("XDG_RUNTIME_DIR") or os.path.join(os.path.expanduser("~"), ".cache", "aiox"),
+    "aiox-hook-host.sock",
+)
+
+# Event type -> hook script (module name without .py)
+HOOK_MODULES = {
+    "PreToolUse": "pre_tool_use",
+    "PostToolUse": "post_tool_use",
+    "UserPromptSubmit": "user_prompt_submit",
+    "Stop": "stop",
+    "SubagentStop": "subagent_stop",
+    "Notification": "notification",
+    "PreCompact": "pre_compact",
+}
+
+ENV_PREFIX = "AIOX_"
+HEADER_END = b"\0\0"
+ACCEPT = b"\x01"
+REFUSE = b"\x00"
+
+# Settings the hook libs read once at import time (module globals), so a
+# host can only serve clients that have the same values
+HOST_SETTINGS = (
+    "AIOX_CACHE_DIR",
+    "AIOX_MONITOR_URL",
+    "AIOX_MONITOR_TIMEOUT_MS",
+    "AIOX_MONITOR_SPOOL",
+    "AIOX_MONITOR_SPOOL_DIR",
+    "AIOX_MONITOR_MAX_STRING",
+    "AIOX_MONITOR_METRICS_FILE",
+    "AIOX_MONITOR_ARCHIVE_DIR",
+    "AIOX_MONITOR_ARCHIVE_MAX_MB",
+)
+
+
+def encode_header(event_type: str, cwd: str, environ=os.environ) -> bytes:
+    """Build the request header for the current hook process."""
+    fields = [event_type, cwd]
+    fields.extend(f"{key}={value}" for key, value in environ.items() if key.startswith(ENV_PREFIX))
+    return "\0".join(fields).encode("utf-8") + HEADER_END
+
+
+def read_header(stream) -> tuple[str, str, dict[str, str]] | None:
+    """
+    Read the request header from a binary stream, leaving it at the payload.
+
+    Returns:
+        (event type, cwd, AIOX_* environment), or None on an empty request
+
+    Raises:
+        ValueError: if the header is malformed
+    """
+    header = bytearray()
+    while not header.endswith(HEADER_END):
+        byte = stream.read(1)
+        if not byte:
+            if not header:
+                return None
+            raise ValueError("missing request header")
+        header += byte
+
+    return _parse_header(bytes(header[:-len(HEADER_END)]))
+
+
+def _parse_header(header: bytes) -> tuple[str, str, dict[str, str]]:
+    fields = header.decode("utf-8").split("\0")
+    if len(fields) < 2:
+        raise ValueError("incomplete request header")
+
+    env = {}
+    for field in fields[2:]:
+        key, _, value = field.partition("=")
+        env[key] = value
+
+    return fields[0], fields[1], env
+
+
+def settings_match(env: dict[str, str], environ=os.environ) -> bool:
+    """True if a client's AIOX_* environment has the host's HOST_SETTINGS."""
+    return all(env.get(key) == environ.get(key) for key in HOST_SETTINGS)
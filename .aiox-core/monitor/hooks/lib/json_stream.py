@@ -0,0 +1,280 @@
+#!/usr/bin/env python3
+"""
+Streaming JSON reader that truncates oversized strings while parsing.
+
+json.load() reads and decodes a whole hook payload before the hooks throw
+most of a multi-megabyte Read/Bash result away. load_truncated() tokenizes
+the input through a bounded buffer instead: strings longer than max_string
+characters keep only their head (plus TRUNCATION_MARKER) and the rest is
+only scanned for the closing quote, never stored or decoded, so peak memory
+stays flat whatever the tool output size. Containers nested deeper than
+MAX_DEPTH are scanned the same way and replaced by TRUNCATION_MARKER, so a
+pathological payload cannot exhaust the interpreter stack either.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any, BinaryIO
+
+MAX_STRING_CHARS = int(os.environ.get("AIOX_MONITOR_MAX_STRING", "4096"))
+MAX_DEPTH = 64
+TRUNCATION_MARKER = "...[truncated]"
+CHUNK_SIZE = 64 * 1024
+
+_WHITESPACE = b" \t\n\r"
+_DELIMITERS = b" \t\n\r,]}"
+_LITERALS = {b"true": True, b"false": False, b"null": None}
+_QUOTE = 0x22
+_CLOSERS = {0x7B: 0x7D, 0x5B: 0x5D}
+
+
+def load_truncated(stream: BinaryIO, max_string: int = MAX_STRING_CHARS) -> Any:
+    """
+    Parse one JSON document from a binary stream.
+
+    Args:
+        stream: Binary file object (e.g. sys.stdin.buffer)
+        max_string: Longest string kept in full, in characters
+
+    Returns:
+        The parsed value, with long strings cut to max_string characters
+        followed by TRUNCATION_MARKER and containers nested deeper than
+        MAX_DEPTH replaced by TRUNCATION_MARKER
+
+    Raises:
+        ValueError: if the input is not valid JSON
+    """
+    return _Reader(stream, max_string).value()
+
+
+def loads_truncated(data: bytes, max_string: int = MAX_STRING_CHARS) -> Any:
+    """load_truncated() for a payload already in memory."""
+    import io
+
+    return load_truncated(io.BytesIO(data), max_string)
+
+
+class _Reader:
+    def __init__(self, stream: BinaryIO, max_string: int):
+        self.stream = stream
+        self.max_string = max_string
+        # A character takes up to 12 raw bytes (an escaped surrogate pair)
+        self.raw_cap = max_string * 12 + 12
+        self.buf = b""
+        self.pos = 0
+        self.eof = False
+        self.depth = 0
+
+    def _fill(self) -> bool:
+        """Drop consumed bytes and read the next chunk. False at end of input."""
+        if self.eof:
+            return False
+        chunk = self.stream.read(CHUNK_SIZE)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buf = self.buf[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def _error(self, message: str) -> ValueError:
+        return ValueError(f"Invalid JSON payload: {message}")
+
+    def _next_char(self) -> int:
+        """Skip whitespace and return the next byte without consuming it."""
+        while True:
+            buf, pos = self.buf, self.pos
+            while pos < len(buf) and buf[pos] in _WHITESPACE:
+                pos += 1
+            self.pos = pos
+            if pos < len(buf):
+                return buf[pos]
+            if not self._fill():
+                raise self._error("unexpected end of input")
+
+    def value(self) -> Any:
+        char = self._next_char()
+        if char in _CLOSERS and self.depth >= MAX_DEPTH:
+            self.skip_container()
+            return TRUNCATION_MARKER
+        if char == 0x7B:  # {
+            self.depth += 1
+            result = self.object()
+            self.depth -= 1
+            return result
+        if char == 0x5B:  # [
+            self.depth += 1
+            result = self.array()
+            self.depth -= 1
+            return result
+        if char == _QUOTE:
+            return self.string()
+        return self.scalar()
+
+    def object(self) -> dict[str, Any]:
+        self.pos += 1
+        result = {}
+        if self._next_char() == 0x7D:  # }
+            self.pos += 1
+            return result
+
+        while True:
+            if self._next_char() != _QUOTE:
+                raise self._error("expected object key")
+            key = self.string()
+            if self._next_char() != 0x3A:  # :
+                raise self._error("expected ':' after object key")
+            self.pos += 1
+            result[key] = self.value()
+
+            char = self._next_char()
+            self.pos += 1
+            if char == 0x2C:  # ,
+                continue
+            if char == 0x7D:  # }
+                return result
+            raise self._error("expected ',' or '}' in object")
+
+    def array(self) -> list[Any]:
+        self.pos += 1
+        result = []
+        if self._next_char() == 0x5D:  # ]
+            self.pos += 1
+            return result
+
+        while True:
+            result.append(self.value())
+
+            char = self._next_char()
+            self.pos += 1
+            if char == 0x2C:  # ,
+                continue
+            if char == 0x5D:  # ]
+                return result
+            raise self._error("expected ',' or ']' in array")
+
+    def skip_container(self) -> None:
+        """Scan past the container starting here without recursing or keeping it."""
+        closers = bytearray()
+        while True:
+            char = self._next_char()
+            if char in _CLOSERS:
+                closers.append(_CLOSERS[char])
+                self.pos += 1
+            elif char == 0x7D or char == 0x5D:  # } ]
+                if char != closers.pop():
+                    raise self._error("mismatched bracket")
+                self.pos += 1
+                if not closers:
+                    return
+            elif char == 0x2C or char == 0x3A:  # , :
+                self.pos += 1
+            elif char == _QUOTE:
+                self.string()
+            else:
+                self.scalar()
+
+    def scalar(self) -> Any:
+        # Numbers and literals are short: make sure the whole token is buffered
+        while True:
+            end = self.pos
+            buf = self.buf
+            while end < len(buf) and buf[end] not in _DELIMITERS:
+                end += 1
+            if end < len(buf) or not self._fill():
+                break
+
+        token = self.buf[self.pos:end]
+        self.pos = end
+        if token in _LITERALS:
+            return _LITERALS[token]
+        try:
+            return json.loads(token)
+        except ValueError:
+            raise self._error(f"unexpected token {token[:20]!r}") from None
+
+    def string(self) -> str:
+        """Read a string starting at the opening quote, keeping at most raw_cap bytes."""
+        self.pos += 1
+        kept = bytearray()
+        skipped = False
+
+        while True:
+            buf = self.buf
+            start = self.pos
+            end, dangling = _closing_quote(buf, start)
+            if end >= 0:
+                skipped |= self._keep(kept, buf, start, end)
+                self.pos = end + 1
+                return self._decode(bytes(kept), skipped)
+
+            # A trailing backslash escapes the first byte of the next chunk:
+            # leave it buffered so the escape is scanned as a whole
+            end = len(buf) - 1 if dangling else len(buf)
+            skipped |= self._keep(kept, buf, start, end)
+            self.pos = end
+            if not self._fill():
+                raise self._error("unterminated string")
+
+    def _keep(self, kept: bytearray, buf: bytes, start: int, end: int) -> bool:
+        """Append buf[start:end] up to raw_cap. True if anything was dropped."""
+        room = self.raw_cap - len(kept)
+        if end - start <= room:
+            kept += buf[start:end]
+            return False
+        if room > 0:
+            kept += buf[start:start + room]
+        return True
+
+    def _decode(self, raw: bytes, skipped: bool) -> str:
+        if not skipped:
+            try:
+                text = json.loads(b'"' + raw + b'"')
+            except ValueError:
+                raise self._error("malformed string") from None
+            if len(text) <= self.max_string:
+                return text
+            return text[:self.max_string] + TRUNCATION_MARKER
+
+        # The cut may split an escape sequence or a UTF-8 character - back
+        # off until the head decodes (escapes are at most 12 bytes long) and
+        # does not end in half of a surrogate pair.
+        for cut in range(len(raw), max(len(raw) - 13, -1), -1):
+            try:
+                text = json.loads(b'"' + raw[:cut] + b'"')
+            except ValueError:
+                continue
+            if not text or not "\ud800" <= text[-1] <= "\udbff":
+                break
+        else:
+            raise self._error("malformed string")
+
+        return text[:self.max_string] + TRUNCATION_MARKER
+
+
+def _closing_quote(buf: bytes, start: int) -> tuple[int, bool]:
+    """
+    Find the quote closing a string whose body starts at buf[start].
+
+    Escaped backslashes and quotes are masked with same-length bytes.replace()
+    calls, so a plain find() locates the closing quote at C speed. The scan
+    window grows geometrically, keeping short strings cheap.
+
+    Returns:
+        (index of the closing quote or -1, True if buf ends inside an escape)
+    """
+    size = 256
+    while True:
+        window = buf[start:start + size]
+        masked = window.replace(b"\\\\", b"__").replace(b'\\"', b"__")
+        quote = masked.find(b'"')
+        if quote >= 0:
+            return start + quote, False
+        if start + size >= len(buf):
+            return -1, masked.endswith(b"\\")
+        size *= 4
@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+"""
+Optional self-instrumentation of the hooks.
+
+With AIOX_MONITOR_METRICS=1 every hook times its stages with
+perf_counter_ns and counts how its sends ended (ok, failed, timed out).
+Stages: import (from the top of the hook script), read (stdin), enrich,
+archive (AIOX_MONITOR_ARCHIVE), sample, correlate (PreToolUse/PostToolUse
+pairing), shape, send, and total.
+
+Timings go into log-linear (HDR-style) histograms in one fixed-layout file
+shared by all hook processes. A hook maps the file, takes an flock and
+increments a handful of counters in place, so recording costs a few
+microseconds and never rewrites the file. hook_metrics.py prints
+p50/p95/p99 per hook type from it.
+
+Histogram buckets are exact below 32 us; above that each power of two is
+split into SUB_BUCKETS buckets, so any value is off by at most 1/16
+(about 6%) up to MAX_US.
+
+Environment:
+    AIOX_MONITOR_METRICS=1         - enable instrumentation
+    AIOX_MONITOR_METRICS_FILE=PATH - histogram file
+                                     (default $AIOX_CACHE_DIR/hook-metrics.bin)
+"""
+
+from __future__ import annotations
+
+import os
+from time import perf_counter_ns
+
+from .cache import cache_path
+from .hook_protocol import HOOK_MODULES
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any, Mapping
+
+METRICS_FILE = os.environ.get("AIOX_MONITOR_METRICS_FILE") or cache_path("hook-metrics.bin")
+
+EVENT_TYPES = tuple(HOOK_MODULES)
+STAGES = ("import", "read", "enrich", "archive", "sample", "correlate", "shape", "send", "total")
+COUNTERS = ("send_ok", "send_failed", "send_timeout")
+
+# Layout version is part of the magic; a mismatching file is reset
+MAGIC = b"AIOXHM04"
+SUB_BITS = 4
+SUB_BUCKETS = 1 << SUB_BITS
+# Exponents above 2 * SUB_BUCKETS us; the last bucket ends past 2 minutes
+EXPONENTS = 23
+NUM_BUCKETS = (EXPONENTS + 2) * SUB_BUCKETS
+MAX_US = ((2 * SUB_BUCKETS) << EXPONENTS) - 1
+
+# Per histogram: count, sum_us, max_us, then the buckets (uint64 each)
+HIST_HEADER = 3
+HIST_BYTES = (HIST_HEADER + NUM_BUCKETS) * 8
+HIST_BASE = len(MAGIC)
+COUNTER_BASE = HIST_BASE + len(EVENT_TYPES) * len(STAGES) * HIST_BYTES
+FILE_SIZE = COUNTER_BASE + len(EVENT_TYPES) * len(COUNTERS) * 8
+
+# path -> (fd, mmap) of open stores; the resident hook host keeps them mapped
+_stores: dict[str, tuple[int, Any]] = {}
+
+
+def start_timer(event_type: str, env: Mapping[str, str] | None = None,
+                start_ns: int | None = None) -> HookTimer | _NullTimer:
+    """
+    Start timing one hook run.
+
+    Args:
+        event_type: Hook event type (PreToolUse, PostToolUse, etc.)
+        env: Environment of the hook process (defaults to os.environ)
+        start_ns: perf_counter_ns() taken at the top of the hook script,
+            so the first lap ("import") covers its imports; defaults to now
+
+    Returns:
+        A timer; a no-op one unless AIOX_MONITOR_METRICS is set
+    """
+    if env is None:
+        env = os.environ
+    if env.get("AIOX_MONITOR_METRICS", "").lower() not in ("1", "true", "yes"):
+        return _NULL_TIMER
+    return HookTimer(event_type, start_ns)
+
+
+class HookTimer:
+    """Stage durations of one hook run, recorded on finish()."""
+
+    __slots__ = ("event_type", "start", "last", "laps", "sends")
+
+    def __init__(self, event_type: str, start_ns: int | None = None):
+        self.event_type = event_type
+        self.start = self.last = perf_counter_ns() if start_ns is None else start_ns
+        self.laps: dict[str, int] = {}
+        self.sends: list[str] = []
+
+    def lap(self, stage: str) -> None:
+        """End a stage: the time since the previous lap is added to it."""
+        now = perf_counter_ns()
+        self.laps[stage] = self.laps.get(stage, 0) + now - self.last
+        self.last = now
+
+    def sent(self, ok: bool) -> None:
+        """End a send stage and count how it went."""
+        self.lap("send")
+        if ok:
+            self.sends.append("send_ok")
+            return
+        from .send_event import last_error
+        self.sends.append("send_timeout" if last_error == "timeout" else "send_failed")
+
+    def finish(self) -> None:
+        """Record the laps and the total; never raises."""
+        self.laps["total"] = perf_counter_ns() - self.start
+        try:
+            record(self.event_type, self.laps, self.sends)
+        except Exception:
+            # Instrumentation must never break a hook
+            pass
+
+
+class _NullTimer:
+    """Timer used while instrumentation is off."""
+
+    __slots__ = ()
+
+    def lap(self, stage: str) -> None:
+        pass
+
+    def sent(self, ok: bool) -> None:
+        pass
+
+    def finish(self) -> None:
+        pass
+
+
+_NULL_TIMER = _NullTimer()
+
+
+def bucket_index(us: int) -> int:
+    """Histogram bucket of a duration in microseconds."""
+    if us < 2 * SUB_BUCKETS:
+        return max(us, 0)
+    us = min(us, MAX_US)
+    shift = us.bit_length() - SUB_BITS - 1
+    return (shift + 1) * SUB_BUCKETS + (us >> shift) - SUB_BUCKETS
+
+
+def bucket_upper(index: int) -> int:
+    """Highest duration (us) that falls into a bucket."""
+    if index < 2 * SUB_BUCKETS:
+        return index
+    shift = index // SUB_BUCKETS - 1
+    mantissa = index % SUB_BUCKETS + SUB_BUCKETS
+    return ((mantissa + 1) << shift) - 1
+
+
+def record(event_type: str, laps: dict[str, int], sends: list[str], path: str = METRICS_FILE) -> None:
+    """
+    Add one hook run to the shared histograms.
+
+    Args:
+        event_type: Hook event type; unknown types are ignored
+        laps: Stage name -> duration in ns
+        sends: Counter name (see COUNTERS) per send
+    """
+    if event_type not in EVENT_TYPES:
+        return
+    import fcntl
+    import struct
+
+    fd, mm = _open_store(path)
+    type_index = EVENT_TYPES.index(event_type)
+
+    fcntl.flock(fd, fcntl.LOCK_EX)
+    try:
+        for stage, ns in laps.items():
+            if stage not in STAGES:
+                continue
+            us = ns // 1000
+            offset = HIST_BASE + (type_index * len(STAGES) + STAGES.index(stage)) * HIST_BYTES
+            count, total, peak = struct.unpack_from("<3Q", mm, offset)
+            struct.pack_into("<3Q", mm, offset, count + 1, total + us, max(peak, us))
+            bucket = offset + (HIST_HEADER + bucket_index(us)) * 8
+            struct.pack_into("<Q", mm, bucket, struct.unpack_from("<Q", mm, bucket)[0] + 1)
+
+        for counter in sends:
+            offset = COUNTER_BASE + (type_index * len(COUNTERS) + COUNTERS.index(counter)) * 8
+            struct.pack_into("<Q", mm, offset, struct.unpack_from("<Q", mm, offset)[0] + 1)
+    finally:
+        fcntl.flock(fd, fcntl.LOCK_UN)
+
+
+def read_metrics(path: str = METRICS_FILE) -> dict[str, dict[str, Any]]:
+    """
+    Snapshot of the histogram file.
+
+    Returns:
+        event type -> {"stages": {stage: {"count", "sum_us", "max_us",
+        "buckets"}}, plus one entry per counter}; types never recorded
+        are left out
+    """
+    import fcntl
+    import struct
+
+    try:
+        with open(path, "rb") as f:
+            # Shared lock: no half-applied hook run in the snapshot
+            fcntl.flock(f.fileno(), fcntl.LOCK_SH)
+            raw = f.read()
+    except OSError:
+        return {}
+    if len(raw) != FILE_SIZE or not raw.startswith(MAGIC):
+        return {}
+
+    metrics = {}
+    for type_index, event_type in enumerate(EVENT_TYPES):
+        stages = {}
+        for stage_index, stage in enumerate(STAGES):
+            offset = HIST_BASE + (type_index * len(STAGES) + stage_index) * HIST_BYTES
+            count, total, peak, *buckets = struct.unpack_from(f"<{HIST_HEADER + NUM_BUCKETS}Q", raw, offset)
+            if count:
+                stages[stage] = {"count": count, "sum_us": total, "max_us": peak, "buckets": buckets}
+
+        offset = COUNTER_BASE + type_index * len(COUNTERS) * 8
+        counters = dict(zip(COUNTERS, struct.unpack_from(f"<{len(COUNTERS)}Q", raw, offset)))
+        if stages or any(counters.values()):
+            metrics[event_type] = {"stages": stages, **counters}
+    return metrics
+
+
+def percentile(histogram: dict[str, Any], pct: float) -> int:
+    """
+    Upper bound (us) of the bucket holding the pct-th percentile, capped
+    at the largest value seen.
+    """
+    rank = max(1, -(-histogram["count"] * pct // 100))
+    seen = 0
+    for index, count in enumerate(histogram["buckets"]):
+        seen += count
+        if seen >= rank:
+            return min(bucket_upper(index), histogram["max_us"])
+    return histogram["max_us"]
+
+
+def reset_metrics(path: str = METRICS_FILE) -> None:
+    """Zero every histogram and counter in place (hooks may have it mapped)."""
+    import fcntl
+
+    fd, _ = _open_store(path)
+    fcntl.flock(fd, fcntl.LOCK_EX)
+    try:
+        os.pwrite(fd, bytes(FILE_SIZE - len(MAGIC)), len(MAGIC))
+    finally:
+        fcntl.flock(fd, fcntl.LOCK_UN)
+
+
+def _open_store(path: str) -> tuple[int, Any]:
+    """Map the histogram file, creating or resetting it if needed."""
+    store = _stores.get(path)
+    if store is not None:
+        return store
+    import fcntl
+    import mmap
+
+    try:
+        fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+    except FileNotFoundError:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        try:
+            if os.fstat(fd).st_size != FILE_SIZE or os.pread(fd, len(MAGIC), 0) != MAGIC:
+                # New file, or one from another layout version
+                os.ftruncate(fd, 0)
+                os.ftruncate(fd, FILE_SIZE)
+                os.pwrite(fd, MAGIC, 0)
+        finally:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+        mm = mmap.mmap(fd, FILE_SIZE)
+    except Exception:
+        os.close(fd)
+        raise
+
+    store = _stores[path] = (fd, mm)
+    return store
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+MessagePack encoding of JSON-like values, stdlib only.
+
+Covers what hook events contain: None, bool, int, float, str, bytes,
+list/tuple and dict. The output is standard MessagePack, so archived
+records can also be read with any msgpack library. Integers outside 64
+bits and other types are stored as their str().
+"""
+
+from __future__ import annotations
+
+import struct
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any, Callable
+
+_pack_double = struct.Struct(">d").pack
+_UNPACK = {
+    0xcc: struct.Struct(">B"), 0xcd: struct.Struct(">H"), 0xce: struct.Struct(">I"), 0xcf: struct.Struct(">Q"),
+    0xd0: struct.Struct(">b"), 0xd1: struct.Struct(">h"), 0xd2: struct.Struct(">i"), 0xd3: struct.Struct(">q"),
+    0xca: struct.Struct(">f"), 0xcb: struct.Struct(">d"),
+}
+
+
+def pack(value: Any) -> bytes:
+    """Encode a value as MessagePack."""
+    parts: list[bytes] = []
+    _pack(value, parts.append)
+    return b"".join(parts)
+
+
+def _pack(value: Any, out: Callable[[bytes], None]) -> None:
+    if value is None:
+        out(b"\xc0")
+    elif value is True:
+        out(b"\xc3")
+    elif value is False:
+        out(b"\xc2")
+    elif isinstance(value, str):
+        data = value.encode("utf-8", "surrogatepass")
+        n = len(data)
+        if n < 32:
+            out(bytes((0xa0 | n,)))
+        elif n < 0x100:
+            out(bytes((0xd9, n)))
+        elif n < 0x10000:
+            out(b"\xda" + n.to_bytes(2, "big"))
+        else:
+            out(b"\xdb" + n.to_bytes(4, "big"))
+        out(data)
+    elif isinstance(value, int):
+        if 0 <= value < 0x80:
+            out(bytes((value,)))
+        elif -32 <= value < 0:
+            out(bytes((value & 0xff,)))
+        elif 0 <= value < 1 << 64:
+            for code, size in ((0xcc, 1), (0xcd, 2), (0xce, 4), (0xcf, 8)):
+                if value < 1 << (8 * size):
+                    out(bytes((code,)) + value.to_bytes(size, "big"))
+                    return
+        elif -(1 << 63) <= value < 0:
+            for code, size in ((0xd0, 1), (0xd1, 2), (0xd2, 4), (0xd3, 8)):
+                if value >= -(1 << (8 * size - 1)):
+                    out(bytes((code,)) + value.to_bytes(size, "big", signed=True))
+                    return
+        else:
+            _pack(str(value), out)
+    elif isinstance(value, float):
+        out(b"\xcb" + _pack_double(value))
+    elif isinstance(value, dict):
+        _pack_header(len(value), 0x80, 0xde, out)
+        for key, item in value.items():
+            _pack(key if isinstance(key, str) else str(key), out)
+            _pack(item, out)
+    elif isinstance(value, (list, tuple)):
+        _pack_header(len(value), 0x90, 0xdc, out)
+        for item in value:
+            _pack(item, out)
+    elif isinstance(value, (bytes, bytearray, memoryview)):
+        data = bytes(value)
+        n = len(data)
+        if n < 0x100:
+            out(bytes((0xc4, n)))
+        elif n < 0x10000:
+            out(b"\xc5" + n.to_bytes(2, "big"))
+        else:
+            out(b"\xc6" + n.to_bytes(4, "big"))
+        out(data)
+    else:
+        _pack(str(value), out)
+
+
+def _pack_header(n: int, fix: int, code16: int, out: Callable[[bytes], None]) -> None:
+    """fixmap/fixarray, 16-bit or 32-bit length header (code16 + 1 is the 32-bit code)."""
+    if n < 16:
+        out(bytes((fix | n,)))
+    elif n < 0x10000:
+        out(bytes((code16,)) + n.to_bytes(2, "big"))
+    else:
+        out(bytes((code16 + 1,)) + n.to_bytes(4, "big"))
+
+
+def unpack(data: bytes | memoryview) -> Any:
+    """
+    Decode one MessagePack value.
+
+    Raises:
+        ValueError: Truncated or unsupported input
+    """
+    try:
+        value, end = _unpack(memoryview(data), 0)
+    except (IndexError, struct.error):
+        raise ValueError("truncated MessagePack data") from None
+    if end != len(data):
+        raise ValueError("trailing bytes after MessagePack value")
+    return value
+
+
+def _unpack(buf: memoryview, pos: int) -> tuple[Any, int]:
+    code = buf[pos]
+    pos += 1
+
+    if code < 0x80:
+        return code, pos
+    if code >= 0xe0:
+        return code - 0x100, pos
+    if 0xa0 <= code <= 0xbf:
+        end = pos + (code & 0x1f)
+        return str(buf[pos:end], "utf-8", "surrogatepass"), end
+    if 0x80 <= code <= 0x8f:
+        return _unpack_map(buf, pos, code & 0x0f)
+    if 0x90 <= code <= 0x9f:
+        return _unpack_array(buf, pos, code & 0x0f)
+    if code == 0xc0:
+        return None, pos
+    if code == 0xc2:
+        return False, pos
+    if code == 0xc3:
+        return True, pos
+
+    fixed = _UNPACK.get(code)
+    if fixed is not None:
+        return fixed.unpack_from(buf, pos)[0], pos + fixed.size
+
+    if code in (0xd9, 0xda, 0xdb, 0xc4, 0xc5, 0xc6):
+        size = 1 << ((code - 0xd9) if code >= 0xd9 else (code - 0xc4))
+        n = int.from_bytes(buf[pos:pos + size], "big")
+        pos += size
+        raw = buf[pos:pos + n]
+        if len(raw) != n:
+            raise ValueError("truncated MessagePack data")
+        if code >= 0xd9:
+            return str(raw, "utf-8", "surrogatepass"), pos + n
+        return bytes(raw), pos + n
+    if code in (0xdc, 0xdd, 0xde, 0xdf):
+        size = 2 if code in (0xdc, 0xde) else 4
+        n = int.from_bytes(buf[pos:pos + size], "big")
+        if code in (0xdc, 0xdd):
+            return _unpack_array(buf, pos + size, n)
+        return _unpack_map(buf, pos + size, n)
+
+    raise ValueError(f"unsupported MessagePack type 0x{code:02x}")
+
+
+def _unpack_array(buf: memoryview, pos: int, n: int) -> tuple[list, int]:
+    items = []
+    for _ in range(n):
+        item, pos = _unpack(buf, pos)
+        items.append(item)
+    return items, pos
+
+
+def _unpack_map(buf: memoryview, pos: int, n: int) -> tuple[dict, int]:
+    result = {}
+    for _ in range(n):
+        key, pos = _unpack(buf, pos)
+        value, pos = _unpack(buf, pos)
+        result[key] = value
+    return result, pos
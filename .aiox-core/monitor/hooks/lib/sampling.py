@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+Client-side rate limiting for high-frequency tool events.
+
+PreToolUse/PostToolUse events are admitted through a token bucket per tool
+name, shared by every hook process through a small locked state file.
+Lifecycle events (KEEP_EVENTS) always pass. A PostToolUse follows the
+decision taken for its PreToolUse (matched on tool_use_id), so the monitor
+never sees half of a tool call.
+
+Dropped events are counted per tool and event type. Once SUMMARY_INTERVAL_S
+has passed, the next hook to run takes the counters as a summary event
+(SUMMARY_EVENT) and sends it alongside its own event. If that send fails,
+restore_summary() merges the counters back, to be retried after another
+interval.
+
+Events without a tool (lifecycle events) only need the state file when a
+summary is due, so they check that with an unlocked read first and take
+the lock only then.
+
+Environment:
+    AIOX_MONITOR_SAMPLING=0        - disable rate limiting
+    AIOX_MONITOR_RATE=10           - sustained events/s per tool
+    AIOX_MONITOR_BURST=50          - bucket size per tool
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import time
+
+from .cache import cache_path
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any, Mapping
+
+KEEP_EVENTS = frozenset({"Stop", "SubagentStop", "PreCompact", "UserPromptSubmit"})
+SUMMARY_EVENT = "EventsDropped"
+SUMMARY_INTERVAL_S = 10.0
+
+DEFAULT_RATE = 10.0
+DEFAULT_BURST = 50.0
+
+STATE_FILE = cache_path("sampling.json")
+# Pre/Post pairing only has to survive one tool call
+MAX_DECISIONS = 512
+
+
+def sample_event(
+    event_type: str, data: dict[str, Any], env: Mapping[str, str] | None = None
+) -> tuple[bool, dict[str, Any] | None]:
+    """
+    Decide whether an event is sent.
+
+    Args:
+        event_type: Hook event type (PreToolUse, PostToolUse, etc.)
+        data: Enriched event data
+        env: Environment of the hook process (defaults to os.environ)
+
+    Returns:
+        (keep, summary) - summary is the data of a SUMMARY_EVENT to send
+        now, or None. On any error the event is kept.
+    """
+    if env is None:
+        env = os.environ
+    if env.get("AIOX_MONITOR_SAMPLING", "1").lower() in ("0", "false", "no"):
+        return True, None
+
+    tool = data.get("tool_name") if event_type not in KEEP_EVENTS else None
+    if not isinstance(tool, str):
+        tool = None
+
+    try:
+        if tool is None and not _summary_due(_read_state(STATE_FILE), time.time()):
+            return True, None
+
+        rate = float(env.get("AIOX_MONITOR_RATE", DEFAULT_RATE))
+        burst = float(env.get("AIOX_MONITOR_BURST", DEFAULT_BURST))
+        with _LockedState(STATE_FILE) as state:
+            now = time.time()
+            keep = True
+            if tool is not None:
+                keep = _admit(state, event_type, tool, data.get("tool_use_id"), now, rate, burst)
+            return keep, _take_summary(state, now)
+    except Exception:
+        # Never lose an event because of the limiter itself
+        return True, None
+
+
+def _admit(
+    state: dict[str, Any], event_type: str, tool: str, tool_use_id: Any,
+    now: float, rate: float, burst: float,
+) -> bool:
+    decisions = state.setdefault("decisions", {})
+    if isinstance(tool_use_id, str) and tool_use_id in decisions:
+        keep = bool(decisions.pop(tool_use_id))
+    else:
+        buckets = state.setdefault("buckets", {})
+        tokens, last = buckets.get(tool, (burst, now))
+        tokens = min(burst, tokens + max(0.0, now - last) * rate)
+        keep = tokens >= 1
+        if keep:
+            tokens -= 1
+        buckets[tool] = [tokens, now]
+
+        if isinstance(tool_use_id, str) and event_type == "PreToolUse":
+            decisions[tool_use_id] = int(keep)
+            while len(decisions) > MAX_DECISIONS:
+                del decisions[next(iter(decisions))]
+
+    if not keep:
+        dropped = state.setdefault("dropped", {}).setdefault(tool, {})
+        dropped[event_type] = dropped.get(event_type, 0) + 1
+        state.setdefault("since", now)
+    return keep
+
+
+def restore_summary(summary: dict[str, Any], env: Mapping[str, str] | None = None) -> None:
+    """
+    Merge the counters of a summary that could not be sent back into the
+    state; the next summary is due SUMMARY_INTERVAL_S from now.
+
+    Args:
+        summary: Data of a SUMMARY_EVENT returned by sample_event()
+        env: Environment of the hook process (defaults to os.environ)
+    """
+    try:
+        with _LockedState(STATE_FILE) as state:
+            now = time.time()
+            dropped = state.setdefault("dropped", {})
+            for tool, counts in summary["dropped"].items():
+                merged = dropped.setdefault(tool, {})
+                for event_type, count in counts.items():
+                    merged[event_type] = merged.get(event_type, 0) + count
+            first = summary["since"] / 1000
+            state["first"] = min(first, state.get("first", first))
+            state.setdefault("since", now)
+    except Exception:
+        # The counts are lost, the hook carries on
+        pass
+
+
+def _summary_due(state: dict[str, Any], now: float) -> bool:
+    since = state.get("since")
+    return isinstance(since, (int, float)) and now - since >= SUMMARY_INTERVAL_S
+
+
+def _take_summary(state: dict[str, Any], now: float) -> dict[str, Any] | None:
+    """Pop the dropped counters once SUMMARY_INTERVAL_S has passed."""
+    if not _summary_due(state, now):
+        return None
+
+    dropped = state.pop("dropped", {})
+    since = state.pop("since")
+    # Counters restored after a failed send date back further than since
+    first = state.pop("first", since)
+    return {
+        "dropped": dropped,
+        "total": sum(sum(counts.values()) for counts in dropped.values()),
+        "since": int(min(first, since) * 1000),
+        "until": int(now * 1000),
+    }
+
+
+def _read_state(path: str) -> dict[str, Any]:
+    """The state file without locking it; {} if missing or mid-rewrite."""
+    try:
+        with open(path, "rb") as f:
+            state = json.loads(f.read())
+    except (OSError, ValueError):
+        return {}
+    return state if isinstance(state, dict) else {}
+
+
+class _LockedState:
+    """Read-modify-write of the JSON state file under an exclusive flock."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.fd = -1
+        self.state: dict[str, Any] = {}
+
+    def __enter__(self) -> dict[str, Any]:
+        try:
+            self.fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        except FileNotFoundError:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            self.fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+
+        try:
+            import fcntl
+            fcntl.flock(self.fd, fcntl.LOCK_EX)
+        except ImportError:
+            # No flock (Windows): concurrent hooks may lose an update
+            pass
+
+        raw = b""
+        while True:
+            chunk = os.read(self.fd, 65536)
+            if not chunk:
+                break
+            raw += chunk
+        try:
+            state = json.loads(raw) if raw else {}
+        except ValueError:
+            state = {}
+        self.state = state if isinstance(state, dict) else {}
+        return self.state
+
+    def __exit__(self, exc_type, *_):
+        try:
+            if exc_type is None:
+                payload = json.dumps(self.state, separators=(",", ":")).encode("utf-8")
+                os.lseek(self.fd, 0, os.SEEK_SET)
+                os.ftruncate(self.fd, 0)
+                os.write(self.fd, payload)
+        finally:
+            # Closing the descriptor releases the lock
+            os.close(self.fd)
@@ -2,46 +2,390 @@
 """
 Send event to AIOX Monitor server.
 Non-blocking with short timeout to avoid slowing Claude.
+
+With AIOX_MONITOR_SPOOL=1 events are appended to a local spool instead
+and delivered by the flusher daemon (flusher.py).
+
+Transport is picked from the AIOX_MONITOR_URL scheme:
+    http://host:port   - HTTP/1.1 keep-alive over TCP (default localhost:4001)
+    https://host:port  - same over TLS
+    unix:///path.sock  - HTTP/1.1 keep-alive over a unix domain socket
+The connection is reused across events, so long-lived senders (flusher,
+hook host) pay the connect cost once.
+
+Every hook starts a fresh interpreter, so this module only imports what the
+plain-socket path needs. http.client (with ssl and email) is loaded for
+https:// only, gzip for batches only, and the spool in spool mode only.
+
+Wire format (POST /events):
+    single event  - application/json body
+    batch         - gzip-compressed NDJSON, one event per line
+                    (Content-Type: application/x-ndjson, Content-Encoding: gzip)
 """
 
+from __future__ import annotations
+
 import json
 import os
 import time
-import urllib.request
-from typing import Any
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any
 
 SERVER_URL = os.environ.get("AIOX_MONITOR_URL", "http://localhost:4001")
 TIMEOUT_MS = int(os.environ.get("AIOX_MONITOR_TIMEOUT_MS", "500"))
+SPOOL_ENABLED = os.environ.get("AIOX_MONITOR_SPOOL", "").lower() in ("1", "true", "yes")
+GZIP_LEVEL = 6
+
+# Why the last send failed: "timeout", "status" (non-2xx), "spool", an
+# exception class name, or None after a success (read by lib/metrics.py)
+last_error: str | None = None
 
 
-def send_event(event_type: str, data: dict[str, Any]) -> bool:
+def event_timestamp() -> int:
+    """Envelope timestamp for an event built now (ms since the epoch)."""
+    return int(time.time() * 1000)
+
+
+def build_event(event_type: str, data: dict[str, Any], timestamp: int | None = None) -> dict[str, Any]:
+    """Wrap hook data in the monitor event envelope (timestamp defaults to now)."""
+    return {
+        "type": event_type,
+        "timestamp": event_timestamp() if timestamp is None else timestamp,
+        "data": data
+    }
+
+
+def send_event(event_type: str, data: dict[str, Any], timestamp: int | None = None) -> bool:
     """
     Send event to AIOX Monitor server.
 
     Args:
         event_type: Hook event type (PreToolUse, PostToolUse, etc.)
         data: Event data from Claude hook
+        timestamp: Envelope timestamp in ms (defaults to now), for callers
+            that refer to the event later
+
+    Returns:
+        True if sent (or spooled) successfully, False otherwise
+    """
+    global last_error
+    event = build_event(event_type, data, timestamp)
+
+    if SPOOL_ENABLED:
+        from .spool import append
+        ok = append(event)
+        last_error = None if ok else "spool"
+        return ok
+
+    return post_event(event)
+
+
+def post_event(event: dict[str, Any], timeout_ms: int = TIMEOUT_MS) -> bool:
+    """
+    POST an already built event to the monitor server.
 
     Returns:
         True if sent successfully, False otherwise
     """
-    try:
-        payload = json.dumps({
-            "type": event_type,
-            "timestamp": int(time.time() * 1000),
-            "data": data
-        }).encode("utf-8")
-
-        req = urllib.request.Request(
-            f"{SERVER_URL}/events",
-            data=payload,
-            headers={"Content-Type": "application/json"},
-            method="POST"
-        )
+    return send_events([event], timeout_ms=timeout_ms)
 
-        urllib.request.urlopen(req, timeout=TIMEOUT_MS / 1000)
+
+def send_events(events: list[dict[str, Any]], timeout_ms: int = TIMEOUT_MS) -> bool:
+    """
+    Send already built events to the monitor server in one request.
+
+    Args:
+        events: Event envelopes (see build_event)
+        timeout_ms: Request timeout
+
+    Returns:
+        True if sent successfully, False otherwise
+    """
+    if not events:
         return True
 
-    except Exception:
+    try:
+        if len(events) == 1:
+            return _post(
+                json.dumps(events[0]).encode("utf-8"),
+                {"Content-Type": "application/json"},
+                timeout_ms,
+            )
+
+        lines = [json.dumps(event, separators=(",", ":")).encode("utf-8") for event in events]
+        return send_ndjson(lines, timeout_ms=timeout_ms)
+
+    except Exception as e:
         # Silent fail - never block Claude
+        _note_error(e)
         return False
+
+
+def send_ndjson(lines: list[bytes], timeout_ms: int = TIMEOUT_MS) -> bool:
+    """
+    Send pre-encoded NDJSON lines (without trailing newlines) as one batch.
+
+    Returns:
+        True if sent successfully, False otherwise
+    """
+    if not lines:
+        return True
+    status = post_ndjson(lines, timeout_ms=timeout_ms)
+    return status is not None and 200 <= status < 300
+
+
+def post_ndjson(lines: list[bytes], timeout_ms: int = TIMEOUT_MS) -> int | None:
+    """
+    Send pre-encoded NDJSON lines as one batch and report how it ended.
+
+    Used by the flusher to forward spooled lines without re-encoding them,
+    and to tell a batch the server rejects apart from one to retry.
+
+    Returns:
+        The HTTP status, or None if no response arrived (connection
+        error, timeout)
+    """
+    global last_error
+    try:
+        import gzip
+
+        body = gzip.compress(b"\n".join(lines) + b"\n", compresslevel=GZIP_LEVEL)
+        status = get_transport().request(
+            body,
+            {"Content-Type": "application/x-ndjson", "Content-Encoding": "gzip"},
+            timeout_ms,
+        )
+
+    except Exception as e:
+        # Silent fail - never block Claude
+        _note_error(e)
+        return None
+
+    last_error = None if 200 <= status < 300 else "status"
+    return status
+
+
+def _post(body: bytes, headers: dict[str, str], timeout_ms: int) -> bool:
+    global last_error
+    ok = get_transport().post(body, headers, timeout_ms)
+    last_error = None if ok else "status"
+    return ok
+
+
+def _note_error(error: Exception) -> None:
+    global last_error
+    # socket.timeout only became an alias of TimeoutError in Python 3.10
+    name = type(error).__name__
+    last_error = "timeout" if name in ("TimeoutError", "timeout") else name
+
+
+def parse_url(url: str) -> tuple[str, str, int | None, str]:
+    """
+    Split AIOX_MONITOR_URL without importing urllib.
+
+    Returns:
+        (scheme, host or socket path, port, events path)
+    """
+    scheme, sep, rest = url.partition("://")
+    if not sep:
+        scheme, rest = "http", url
+    scheme = scheme.lower()
+
+    if scheme == "unix":
+        return scheme, rest, None, "/events"
+
+    netloc, slash, path = rest.partition("/")
+    events_path = ("/" + path).rstrip("/") + "/events" if slash else "/events"
+
+    if netloc.startswith("["):
+        host, _, port_part = netloc[1:].partition("]")
+        port_part = port_part[1:]
+    elif ":" in netloc:
+        host, _, port_part = netloc.rpartition(":")
+    else:
+        host, port_part = netloc, ""
+
+    port = int(port_part) if port_part else None
+    return scheme, host or "localhost", port, events_path
+
+
+class _SocketConnection:
+    """Minimal HTTP/1.1 keep-alive client over a plain TCP or unix socket."""
+
+    def __init__(self, scheme: str, address: str, port: int | None, timeout: float):
+        import socket
+
+        if scheme == "unix":
+            self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self.sock.settimeout(timeout)
+            self.sock.connect(address)
+            self.host_header = "localhost"
+        else:
+            self.sock = socket.create_connection((address, port or 80), timeout=timeout)
+            self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            self.host_header = address if port is None else f"{address}:{port}"
+        self._buffer = b""
+
+    def post(self, path: str, body: bytes, headers: dict[str, str], timeout: float) -> tuple[int, bool]:
+        """
+        Send one request and consume the response.
+
+        Returns:
+            (status code, True if the server will close the connection)
+        """
+        self.sock.settimeout(timeout)
+        head = [f"POST {path} HTTP/1.1", f"Host: {self.host_header}", f"Content-Length: {len(body)}"]
+        head.extend(f"{name}: {value}" for name, value in headers.items())
+        self.sock.sendall(("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + body)
+        return self._read_response()
+
+    def _recv(self) -> bytes:
+        chunk = self.sock.recv(65536)
+        if not chunk:
+            raise ConnectionResetError("connection closed by monitor server")
+        return chunk
+
+    def _read_response(self) -> tuple[int, bool]:
+        buf = self._buffer
+        while b"\r\n\r\n" not in buf:
+            buf += self._recv()
+
+        head, _, buf = buf.partition(b"\r\n\r\n")
+        status_line, *field_lines = head.decode("latin-1").split("\r\n")
+        version, status = status_line.split(" ", 2)[:2]
+
+        fields = {}
+        for line in field_lines:
+            name, _, value = line.partition(":")
+            fields[name.strip().lower()] = value.strip().lower()
+
+        will_close = fields.get("connection") == "close" or version == "HTTP/1.0"
+
+        if "content-length" in fields:
+            length = int(fields["content-length"])
+            while len(buf) < length:
+                buf += self._recv()
+            buf = buf[length:]
+        elif fields.get("transfer-encoding") == "chunked":
+            buf = self._skip_chunked(buf)
+        else:
+            # Body delimited by connection close
+            will_close = True
+
+        self._buffer = buf
+        return int(status), will_close
+
+    def _skip_chunked(self, buf: bytes) -> bytes:
+        while True:
+            while b"\r\n" not in buf:
+                buf += self._recv()
+            size_line, _, buf = buf.partition(b"\r\n")
+            size = int(size_line.split(b";")[0], 16)
+
+            if size == 0:
+                # Trailer section ends with an empty line
+                while True:
+                    while b"\r\n" not in buf:
+                        buf += self._recv()
+                    line, _, buf = buf.partition(b"\r\n")
+                    if not line:
+                        return buf
+
+            while len(buf) < size + 2:
+                buf += self._recv()
+            buf = buf[size + 2:]
+
+    def close(self) -> None:
+        self.sock.close()
+
+
+class _TLSConnection:
+    """https:// transport, backed by http.client (imported on demand)."""
+
+    def __init__(self, host: str, port: int | None, timeout: float):
+        import http.client
+
+        self.conn = http.client.HTTPSConnection(host, port, timeout=timeout)
+
+    def post(self, path: str, body: bytes, headers: dict[str, str], timeout: float) -> tuple[int, bool]:
+        self.conn.timeout = timeout
+        if self.conn.sock is not None:
+            self.conn.sock.settimeout(timeout)
+        self.conn.request("POST", path, body=body, headers=headers)
+        response = self.conn.getresponse()
+        response.read()
+        return response.status, response.will_close
+
+    def close(self) -> None:
+        self.conn.close()
+
+
+class Transport:
+    """Persistent HTTP/1.1 keep-alive connection to the monitor server."""
+
+    def __init__(self, url: str = SERVER_URL):
+        self.scheme, self.host, self.port, self.path = parse_url(url)
+        self._conn: _SocketConnection | _TLSConnection | None = None
+
+    def _connect(self, timeout: float) -> _SocketConnection | _TLSConnection:
+        if self.scheme == "https":
+            return _TLSConnection(self.host, self.port, timeout)
+        return _SocketConnection(self.scheme, self.host, self.port, timeout)
+
+    def post(self, body: bytes, headers: dict[str, str], timeout_ms: int) -> bool:
+        """
+        POST body to the events endpoint, reusing the open connection.
+
+        Returns:
+            True on a 2xx response
+        """
+        return 200 <= self.request(body, headers, timeout_ms) < 300
+
+    def request(self, body: bytes, headers: dict[str, str], timeout_ms: int) -> int:
+        """
+        POST body to the events endpoint and return the response status.
+
+        A reused connection the server already closed is retried once on a
+        fresh one; any other error propagates to the caller.
+        """
+        timeout = timeout_ms / 1000
+
+        for attempt in range(2):
+            reused = self._conn is not None
+            if self._conn is None:
+                self._conn = self._connect(timeout)
+
+            try:
+                status, will_close = self._conn.post(self.path, body, headers, timeout)
+            except ConnectionError:
+                self.close()
+                if reused and attempt == 0:
+                    continue
+                raise
+            except Exception:
+                self.close()
+                raise
+
+            if will_close:
+                self.close()
+            return status
+
+        raise ConnectionError("connection closed twice")
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+
+_transport: Transport | None = None
+
+
+def get_transport() -> Transport:
+    """Return the process-wide transport, creating it on first use."""
+    global _transport
+    if _transport is None:
+        _transport = Transport(SERVER_URL)
+    return _transport
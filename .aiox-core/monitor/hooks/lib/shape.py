@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""
+Shape hook payloads to a per-event byte budget.
+
+Walks the whole event (nested tool_input, structured tool_result, todo
+lists, MultiEdit edits, ...) and shrinks only the parts that do not fit:
+small fields are always kept whole, and the budget left over is shared
+evenly between the large ones, recursively. Strings keep their head,
+fields too large for even a small share are replaced by ELIDED_MARKER and
+list tails are dropped. Every elided or truncated field is recorded under
+ELIDED_KEY as {path: original size in bytes}.
+
+Sizes are the UTF-8 size of each value as json.dumps() writes it, ignoring
+escape characters; the ELIDED_KEY record itself is not counted.
+
+Budgets come from AIOX_MONITOR_BUDGETS, a comma-separated list of
+KEY=BYTES entries. The most specific key wins:
+    <event type>:<tool name>   e.g. PostToolUse:Bash=32768
+    <tool name>                e.g. MultiEdit=16384
+    <event type>               e.g. PreToolUse=4096
+    *                          default for everything else
+"""
+
+from __future__ import annotations
+
+import os
+
+from .json_stream import TRUNCATION_MARKER
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any, Mapping
+
+DEFAULT_BUDGET = 8192
+DEFAULT_BUDGETS = {
+    "PostToolUse": 16384,
+}
+
+ELIDED_KEY = "aiox_elided"
+ELIDED_MARKER = "...[elided]"
+MAX_ELIDED_PATHS = 32
+
+# Below this share a field is elided outright rather than cut to a stub
+MIN_FIELD_BYTES = 64
+# Room kept for the "...[N items elided]" entry ending a cut list
+LIST_TAIL_BYTES = 24
+
+# AIOX_MONITOR_BUDGETS value -> parsed overrides
+_budget_memo: dict[str, dict[str, int]] = {}
+
+
+def shape_event(event_type: str, data: dict[str, Any], env: Mapping[str, str] | None = None) -> dict[str, Any]:
+    """
+    Shrink event data to the byte budget of its event type and tool.
+
+    Args:
+        event_type: Hook event type (PreToolUse, PostToolUse, etc.)
+        data: Event data from Claude hook
+        env: Environment of the hook process (defaults to os.environ)
+
+    Returns:
+        data itself if it fits, otherwise a shaped copy with ELIDED_KEY set
+    """
+    if not isinstance(data, dict):
+        return data
+
+    budget = event_budget(event_type, data.get("tool_name"), env)
+    shaper = _Shaper()
+    shaped = shaper.shape(data, budget, "")
+
+    if shaper.elided:
+        if shaper.unrecorded:
+            shaper.elided["..."] = shaper.unrecorded
+        shaped[ELIDED_KEY] = shaper.elided
+    return shaped
+
+
+def event_budget(event_type: str, tool_name: str | None = None, env: Mapping[str, str] | None = None) -> int:
+    """Byte budget for one event (see module docstring for the lookup order)."""
+    if env is None:
+        env = os.environ
+
+    overrides = parse_budgets(env.get("AIOX_MONITOR_BUDGETS", ""))
+    if overrides:
+        keys = (f"{event_type}:{tool_name}", tool_name, event_type) if tool_name else (event_type,)
+        for key in keys:
+            if key in overrides:
+                return overrides[key]
+        if "*" in overrides:
+            return overrides["*"]
+
+    return DEFAULT_BUDGETS.get(event_type, DEFAULT_BUDGET)
+
+
+def parse_budgets(spec: str) -> dict[str, int]:
+    """Parse an AIOX_MONITOR_BUDGETS value, ignoring malformed entries."""
+    overrides = _budget_memo.get(spec)
+    if overrides is not None:
+        return overrides
+
+    overrides = {}
+    for entry in spec.split(","):
+        key, _, value = entry.partition("=")
+        try:
+            overrides[key.strip()] = max(0, int(value))
+        except ValueError:
+            continue
+
+    _budget_memo[spec] = overrides
+    return overrides
+
+
+class _Shaper:
+    def __init__(self):
+        # id(container) -> size; containers stay alive for the whole call
+        self.sizes: dict[int, int] = {}
+        self.elided: dict[str, int] = {}
+        self.unrecorded = 0
+
+    def size(self, value: Any) -> int:
+        """Approximate encoded JSON size of value, memoized for containers."""
+        if isinstance(value, str):
+            if value.isascii():
+                return len(value) + 2
+            return len(value.encode("utf-8", "surrogatepass")) + 2
+
+        if isinstance(value, (dict, list)):
+            size = self.sizes.get(id(value))
+            if size is None:
+                if isinstance(value, dict):
+                    size = 2 + sum(self.size(k) + self.size(v) + 4 for k, v in value.items())
+                else:
+                    size = 2 + sum(self.size(item) + 2 for item in value)
+                self.sizes[id(value)] = size
+            return size
+
+        if value is None or value is True:
+            return 4
+        if value is False:
+            return 5
+        return len(repr(value))
+
+    def record(self, path: str, size: int) -> None:
+        if len(self.elided) < MAX_ELIDED_PATHS:
+            self.elided[path] = size
+        else:
+            self.unrecorded += 1
+
+    def shape(self, value: Any, budget: int, path: str) -> Any:
+        size = self.size(value)
+        if size <= budget:
+            return value
+
+        if isinstance(value, str):
+            return self.truncate(value, budget, path, size)
+        if isinstance(value, dict):
+            return self.shape_dict(value, budget, path)
+        if isinstance(value, list):
+            return self.shape_list(value, budget, path)
+        return value
+
+    def truncate(self, value: str, budget: int, path: str, size: int) -> str:
+        self.record(path, size)
+        keep = max(0, budget - 2 - len(TRUNCATION_MARKER))
+        if value.isascii():
+            return value[:keep] + TRUNCATION_MARKER
+        return value.encode("utf-8", "surrogatepass")[:keep].decode("utf-8", "ignore") + TRUNCATION_MARKER
+
+    def shape_dict(self, value: dict, budget: int, path: str) -> dict:
+        keys = list(value)
+        # Keys and separators are never shrunk; the values share the rest
+        overhead = 2 + sum(self.size(key) + 4 for key in keys)
+        sizes = [self.size(value[key]) for key in keys]
+        shares = _allocate(sizes, budget - overhead)
+
+        shaped = {}
+        for key, size, share in zip(keys, sizes, shares):
+            child_path = f"{path}.{key}" if path else key
+            if size <= share:
+                shaped[key] = value[key]
+            elif share < MIN_FIELD_BYTES:
+                self.record(child_path, size)
+                shaped[key] = ELIDED_MARKER
+            else:
+                shaped[key] = self.shape(value[key], share, child_path)
+        return shaped
+
+    def shape_list(self, value: list, budget: int, path: str) -> list:
+        sizes = [self.size(item) + 2 for item in value]
+        shares = _allocate(sizes, budget - 2)
+        if all(size <= share or share >= MIN_FIELD_BYTES for size, share in zip(sizes, shares)):
+            return [
+                item if size <= share else self.shape(item, share - 2, f"{path}[{index}]")
+                for index, (item, size, share) in enumerate(zip(value, sizes, shares))
+            ]
+
+        # Too many items for a useful share each. Order matters in lists,
+        # so keep a prefix and drop the tail instead of punching holes.
+        room = budget - 2 - LIST_TAIL_BYTES
+        shaped = []
+        for index, (item, size) in enumerate(zip(value, sizes)):
+            if size <= room:
+                shaped.append(item)
+                room -= size
+                continue
+            if room >= MIN_FIELD_BYTES:
+                shaped.append(self.shape(item, room - 2, f"{path}[{index}]"))
+            break
+
+        kept = len(shaped)
+        if kept < len(value):
+            self.record(f"{path}[{kept}:]", sum(sizes[kept:]))
+            shaped.append(f"...[{len(value) - kept} items elided]")
+        return shaped
+
+
+def _allocate(sizes: list[int], total: int) -> list[int]:
+    """
+    Split total between children (water-filling).
+
+    Children are visited smallest first: each one that fits its even share
+    of what is left is kept whole, so only the largest ones get cut, and
+    they all get the same share.
+    """
+    shares = [0] * len(sizes)
+    remaining = max(0, total)
+    pending = len(sizes)
+
+    for index in sorted(range(len(sizes)), key=sizes.__getitem__):
+        share = remaining // pending
+        shares[index] = min(sizes[index], share)
+        remaining -= shares[index]
+        pending -= 1
+    return shares
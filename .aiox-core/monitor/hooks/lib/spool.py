@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+Local append-only spool for monitor events.
+
+Hooks append one NDJSON line per event and return immediately.
+The flusher daemon (flusher.py) drains the spool to the monitor server.
+
+Layout of the spool directory:
+    events.ndjson          - active file, hooks append here
+    segment-<ns>.ndjson    - files claimed by the flusher, drained oldest first
+    offset.json            - delivery offset per segment
+    segment-<ns>.ndjson.rejected - batches the server refused for good,
+                             kept for inspection
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import time
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any
+
+SPOOL_DIR = os.environ.get(
+    "AIOX_MONITOR_SPOOL_DIR",
+    os.path.join(os.path.expanduser("~"), ".cache", "aiox", "monitor", "spool"),
+)
+ACTIVE_FILE = "events.ndjson"
+SEGMENT_PREFIX = "segment-"
+SEGMENT_SUFFIX = ".ndjson"
+OFFSET_FILE = "offset.json"
+REJECTED_SUFFIX = ".rejected"
+
+# Writers that opened the active file right before it was claimed may still
+# append to the segment for a moment, so drained segments are kept this long.
+SEGMENT_GRACE_S = 2.0
+
+
+def append(event: dict[str, Any], spool_dir: str = SPOOL_DIR) -> bool:
+    """
+    Append an event to the active spool file.
+
+    A single O_APPEND write keeps lines from concurrent hooks intact.
+
+    Returns:
+        True if the event was spooled, False otherwise
+    """
+    line = (json.dumps(event, separators=(",", ":")) + "\n").encode("utf-8")
+    path = os.path.join(spool_dir, ACTIVE_FILE)
+
+    try:
+        try:
+            fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o600)
+        except FileNotFoundError:
+            os.makedirs(spool_dir, exist_ok=True)
+            fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o600)
+
+        try:
+            view = memoryview(line)
+            while view:
+                written = os.write(fd, view)
+                view = view[written:]
+        finally:
+            os.close(fd)
+        return True
+
+    except OSError:
+        # Silent fail - never block Claude
+        return False
+
+
+class SpoolReader:
+    """
+    Reads spooled events in order and tracks delivery offsets.
+
+    Only the flusher uses this. Offsets are committed after a batch was
+    delivered, so a crash between send and commit re-sends that batch
+    (at-least-once delivery).
+    """
+
+    def __init__(self, spool_dir: str = SPOOL_DIR):
+        self.spool_dir = spool_dir
+        os.makedirs(spool_dir, exist_ok=True)
+        self._offsets = self._load_offsets()
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.spool_dir, name)
+
+    def segments(self) -> list[str]:
+        """List claimed segments, oldest first."""
+        names = [
+            name for name in os.listdir(self.spool_dir)
+            if name.startswith(SEGMENT_PREFIX) and name.endswith(SEGMENT_SUFFIX)
+        ]
+        return sorted(names, key=_segment_ns)
+
+    def claim(self) -> str | None:
+        """Move the active file aside as a new segment, if it has data."""
+        active = self._path(ACTIVE_FILE)
+        try:
+            if os.path.getsize(active) == 0:
+                return None
+        except FileNotFoundError:
+            return None
+
+        name = f"{SEGMENT_PREFIX}{time.time_ns()}{SEGMENT_SUFFIX}"
+        os.replace(active, self._path(name))
+        return name
+
+    def _load_offsets(self) -> dict[str, int]:
+        try:
+            with open(self._path(OFFSET_FILE), "r", encoding="utf-8") as f:
+                return {name: int(offset) for name, offset in json.load(f).items()}
+        except (OSError, ValueError, AttributeError):
+            return {}
+
+    def offset(self, segment: str) -> int:
+        """Return the committed offset for a segment (0 if unknown)."""
+        return self._offsets.get(segment, 0)
+
+    def commit(self, segment: str, offset: int) -> None:
+        """Persist the delivery offset atomically."""
+        self._offsets[segment] = offset
+        self._save_offsets()
+
+    def _save_offsets(self) -> None:
+        tmp = self._path(OFFSET_FILE + ".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self._offsets, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self._path(OFFSET_FILE))
+
+    def read(self, segment: str, offset: int, max_bytes: int) -> tuple[list[bytes], int]:
+        """
+        Read complete lines from a segment starting at offset.
+
+        Returns:
+            (lines, end offset). A trailing partial line is left for later.
+        """
+        with open(self._path(segment), "rb") as f:
+            f.seek(offset)
+            chunk = f.read(max_bytes)
+
+        end = chunk.rfind(b"\n")
+        if end < 0:
+            if len(chunk) == max_bytes:
+                # A single line larger than max_bytes - read it whole
+                with open(self._path(segment), "rb") as f:
+                    f.seek(offset)
+                    line = f.readline()
+                if line.endswith(b"\n"):
+                    return [line[:-1]], offset + len(line)
+            return [], offset
+
+        return chunk[:end].split(b"\n"), offset + end + 1
+
+    def is_drained(self, segment: str, offset: int) -> bool:
+        """
+        True when a segment was fully delivered and its grace period passed.
+
+        After the grace period no writer can complete a line any more, so
+        an unterminated tail (a writer crashed mid-write) is dropped.
+        """
+        try:
+            size = os.path.getsize(self._path(segment))
+        except FileNotFoundError:
+            return True
+
+        age = time.time() - _segment_ns(segment) / 1e9
+        if age < SEGMENT_GRACE_S:
+            return False
+        return offset >= size or not self._has_line(segment, offset)
+
+    def _has_line(self, segment: str, offset: int) -> bool:
+        """True if a complete line starts at offset."""
+        try:
+            with open(self._path(segment), "rb") as f:
+                f.seek(offset)
+                while True:
+                    chunk = f.read(65536)
+                    if not chunk:
+                        return False
+                    if b"\n" in chunk:
+                        return True
+        except FileNotFoundError:
+            return False
+
+    def reject(self, segment: str, lines: list[bytes]) -> None:
+        """Move lines the server will never accept aside (see REJECTED_SUFFIX)."""
+        with open(self._path(segment + REJECTED_SUFFIX), "ab") as f:
+            f.write(b"".join(line + b"\n" for line in lines))
+
+    def remove(self, segment: str) -> None:
+        """Delete a drained segment and forget its offset."""
+        try:
+            os.remove(self._path(segment))
+        except FileNotFoundError:
+            pass
+        if self._offsets.pop(segment, None) is not None:
+            self._save_offsets()
+
+
+def _segment_ns(name: str) -> int:
+    try:
+        return int(name[len(SEGMENT_PREFIX):-len(SEGMENT_SUFFIX)])
+    except ValueError:
+        return 0
@@ -3,26 +3,70 @@
 PreCompact hook - captures before context compaction.
 """
 
-import json
+from time import perf_counter_ns
+
+# Taken before any other import, so the metrics include import time
+STARTED_NS = perf_counter_ns()
+
 import sys
 import os
 
 # Add lib to path
 sys.path.insert(0, os.path.dirname(__file__))
 
+from lib.json_stream import load_truncated
 from lib.send_event import send_event
 from lib.enrich import enrich_event
+from lib.context import send_with_context
+from lib.archive import archive_hook_event
+from lib.sampling import SUMMARY_EVENT, restore_summary, sample_event
+from lib.shape import shape_event
+from lib.metrics import start_timer
 
 
-def main():
-    # Read event from stdin
-    data = json.load(sys.stdin)
+def handle(data: dict, env: dict | None = None, timer=None):
+    """Process one event (also called in-process by hook_host.py)."""
+    # Per-stage timings, recorded only with AIOX_MONITOR_METRICS=1
+    if timer is None:
+        timer = start_timer("PreCompact", env)
 
     # Enrich with AIOX context
-    data = enrich_event(data)
+    data = enrich_event(data, env)
+    timer.lap("enrich")
+
+    # Keep every event locally with AIOX_MONITOR_ARCHIVE=1, before sampling
+    archive_hook_event("PreCompact", data, env)
+    timer.lap("archive")
+
+    # Rate-limit repetitive tool events, reporting what was dropped
+    keep, summary = sample_event("PreCompact", data, env)
+    timer.lap("sample")
+    if summary:
+        summary_sent = send_event(SUMMARY_EVENT, summary)
+        timer.sent(summary_sent)
+        if not summary_sent:
+            restore_summary(summary, env)
+    if not keep:
+        timer.finish()
+        return
 
-    # Send to monitor server
-    send_event("PreCompact", data)
+    # Fit nested fields into the event's byte budget
+    data = shape_event("PreCompact", data, env)
+    timer.lap("shape")
+
+    # Send to monitor server, the session context as an id once it is known
+    timer.sent(send_with_context("PreCompact", data, env))
+    timer.finish()
+
+
+def main():
+    timer = start_timer("PreCompact", start_ns=STARTED_NS)
+    timer.lap("import")
+
+    # Read event from stdin
+    data = load_truncated(sys.stdin.buffer)
+    timer.lap("read")
+    handle(data, timer=timer)
 
 
 if __name__ == "__main__":
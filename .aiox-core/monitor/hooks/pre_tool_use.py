@@ -6,34 +6,78 @@ This hook runs before Claude executes any tool (Read, Write, Bash, etc.)
 Use this to see what tools are being invoked and their inputs.
 """
 
-import json
+from time import perf_counter_ns
+
+# Taken before any other import, so the metrics include import time
+STARTED_NS = perf_counter_ns()
+
 import sys
 import os
 
 # Add lib to path
 sys.path.insert(0, os.path.dirname(__file__))
 
-from lib.send_event import send_event
+from lib.json_stream import load_truncated
+from lib.send_event import event_timestamp, send_event
 from lib.enrich import enrich_event
+from lib.context import send_with_context
+from lib.archive import archive_hook_event
+from lib.sampling import SUMMARY_EVENT, restore_summary, sample_event
+from lib.shape import shape_event
+from lib.metrics import start_timer
+from lib.correlate import remember_pre
 
 
-def main():
-    # Read event from stdin
-    data = json.load(sys.stdin)
-
-    # Truncate large fields to avoid memory issues
-    if "tool_input" in data:
-        tool_input = data["tool_input"]
-        if isinstance(tool_input, dict):
-            for key, value in tool_input.items():
-                if isinstance(value, str) and len(value) > 500:
-                    data["tool_input"][key] = value[:500] + "..."
+def handle(data: dict, env: dict | None = None, timer=None):
+    """Process one event (also called in-process by hook_host.py)."""
+    # Per-stage timings, recorded only with AIOX_MONITOR_METRICS=1
+    if timer is None:
+        timer = start_timer("PreToolUse", env)
 
     # Enrich with AIOX context
-    data = enrich_event(data)
+    data = enrich_event(data, env)
+    timer.lap("enrich")
+
+    # Keep every event locally with AIOX_MONITOR_ARCHIVE=1, before sampling
+    archive_hook_event("PreToolUse", data, env)
+    timer.lap("archive")
+
+    # Rate-limit repetitive tool events, reporting what was dropped
+    keep, summary = sample_event("PreToolUse", data, env)
+    timer.lap("sample")
+    if summary:
+        summary_sent = send_event(SUMMARY_EVENT, summary)
+        timer.sent(summary_sent)
+        if not summary_sent:
+            restore_summary(summary, env)
+    if not keep:
+        timer.finish()
+        return
 
-    # Send to monitor server
-    send_event("PreToolUse", data)
+    # Fit nested fields into the event's byte budget
+    data = shape_event("PreToolUse", data, env)
+    timer.lap("shape")
+
+    # Send to monitor server, the session context as an id once it is known
+    timestamp = event_timestamp()
+    sent = send_with_context("PreToolUse", data, env, timestamp)
+    timer.sent(sent)
+
+    # Let PostToolUse refer to this event instead of repeating its input
+    if sent:
+        remember_pre(data, timestamp, env)
+        timer.lap("correlate")
+    timer.finish()
+
+
+def main():
+    timer = start_timer("PreToolUse", start_ns=STARTED_NS)
+    timer.lap("import")
+
+    # Read event from stdin
+    data = load_truncated(sys.stdin.buffer)
+    timer.lap("read")
+    handle(data, timer=timer)
 
 
 if __name__ == "__main__":
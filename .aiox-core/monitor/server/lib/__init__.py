@@ -0,0 +1 @@
+# AIOX Monitor Server Library
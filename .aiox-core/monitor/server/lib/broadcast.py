@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Server-Sent Events fan-out with per-subscriber backpressure.
+
+Each subscriber gets a bounded queue of encoded SSE frames and its own
+writer task. publish() never awaits: a frame is put on every matching
+queue and the ingest path moves on. Writers drain their queue in chunks
+and wait for the socket (drain()), so a slow client only fills its own
+queue. A subscriber whose queue overflows is disconnected; its
+EventSource reconnects with Last-Event-ID and replays the gap from the
+ring buffer.
+
+Environment:
+    AIOX_MONITOR_SSE_QUEUE=1000    - frames buffered per subscriber
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from .ingest import Event
+
+SUBSCRIBER_QUEUE = int(os.environ.get("AIOX_MONITOR_SSE_QUEUE", "1000"))
+HEARTBEAT_S = 15.0
+# Reconnect delay suggested to EventSource clients
+RETRY_MS = 1000
+
+
+def sse_frame(event: Event) -> bytes:
+    """Encode one event as an SSE message (id, event type, JSON data)."""
+    return f"id: {event.id}\nevent: {event.type}\ndata: {event.json}\n\n".encode("utf-8")
+
+
+class Subscriber:
+    """One SSE client: its filters, frame queue and socket writer."""
+
+    def __init__(self, writer: asyncio.StreamWriter, filters: dict[str, str], queue_size: int):
+        self.writer = writer
+        self.filters = filters
+        self.queue: asyncio.Queue[bytes] = asyncio.Queue(maxsize=queue_size)
+        self.open = True
+
+    def offer(self, frame: bytes) -> bool:
+        """
+        Queue a frame without waiting.
+
+        Returns:
+            False if the queue is full (the subscriber is lagging)
+        """
+        try:
+            self.queue.put_nowait(frame)
+            return True
+        except asyncio.QueueFull:
+            return False
+
+    def disconnect(self) -> None:
+        """Drop a lagging client now; frames still queued are discarded."""
+        self.open = False
+        self.writer.transport.abort()
+
+    def close(self) -> None:
+        """End the stream after the frames already queued (shutdown)."""
+        self.open = False
+        # Wake run() if it is waiting for a frame
+        self.offer(b"")
+
+    async def run(self, backlog: list[bytes]) -> None:
+        """
+        Send the SSE preamble and any replayed frames, then stream until
+        the client goes away or is disconnected.
+        """
+        writer = self.writer
+        writer.write(f"retry: {RETRY_MS}\n\n".encode("ascii"))
+        writer.write(b"".join(backlog))
+        await writer.drain()
+
+        while self.open:
+            try:
+                frame = await asyncio.wait_for(self.queue.get(), HEARTBEAT_S)
+            except asyncio.TimeoutError:
+                # Comment line; finds clients that vanished without a FIN
+                frame = b": ping\n\n"
+            frames = [frame]
+            while not self.queue.empty():
+                frames.append(self.queue.get_nowait())
+            writer.write(b"".join(frames))
+            await writer.drain()
+        writer.close()
+
+
+class Broadcaster:
+    """Registry of SSE subscribers."""
+
+    def __init__(self, queue_size: int = SUBSCRIBER_QUEUE):
+        self.queue_size = queue_size
+        self.subscribers: set[Subscriber] = set()
+        self.disconnected = 0
+
+    def subscribe(self, writer: asyncio.StreamWriter, filters: dict[str, str]) -> Subscriber:
+        subscriber = Subscriber(writer, filters, self.queue_size)
+        self.subscribers.add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber) -> None:
+        self.subscribers.discard(subscriber)
+
+    def publish(self, events: list[Event]) -> None:
+        """Offer events to every matching subscriber; never blocks."""
+        if not self.subscribers:
+            return
+
+        # Encode once per event, not once per subscriber
+        frames = [(event, sse_frame(event)) for event in events]
+        for subscriber in list(self.subscribers):
+            filters = subscriber.filters
+            for event, frame in frames:
+                if filters and not event.matches(filters):
+                    continue
+                if not subscriber.offer(frame):
+                    self.disconnected += 1
+                    self.unsubscribe(subscriber)
+                    subscriber.disconnect()
+                    break
+
+    def close(self) -> None:
+        """Disconnect every subscriber (server shutdown)."""
+        for subscriber in list(self.subscribers):
+            subscriber.close()
+        self.subscribers.clear()
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Reference decoder for the hooks' session context delta encoding.
+
+The hooks (hooks/lib/context.py) send the session context block once,
+with its id, and afterwards only the id:
+
+    full:   {"context_id": "1a2b3c4d", "context": {"project": ..., ...}, ...}
+    delta:  {"context_id": "1a2b3c4d", ...}
+
+decode() learns blocks from full events and rehydrates every event to
+exactly what enrich_event() produced: context_id and context are removed
+and each context field is added unless the event has its own value.
+Events whose id is unknown (e.g. sent before a server restart) are kept
+as they are, context_id included, until the hooks resend the block.
+"""
+
+from __future__ import annotations
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any
+
+MAX_CONTEXTS = 4096
+
+
+class ContextDecoder:
+    """Known context blocks per (session, context id), least recently used first."""
+
+    def __init__(self, max_contexts: int = MAX_CONTEXTS):
+        self.max_contexts = max_contexts
+        self.unresolved = 0
+        self._contexts: dict[tuple[Any, str], dict[str, Any]] = {}
+
+    def decode(self, data: dict[str, Any]) -> dict[str, Any]:
+        """
+        Rehydrate one event's data.
+
+        Returns:
+            The decoded data (a new dict), or data itself if it carries no
+            context id or the id is unknown
+        """
+        context_id = data.get("context_id")
+        if not isinstance(context_id, str):
+            return data
+
+        key = (data.get("session_id"), context_id)
+        context = data.get("context")
+        if isinstance(context, dict):
+            self._contexts.pop(key, None)
+            self._contexts[key] = context
+            while len(self._contexts) > self.max_contexts:
+                del self._contexts[next(iter(self._contexts))]
+        else:
+            context = self._contexts.pop(key, None)
+            if context is None:
+                self.unresolved += 1
+                return data
+            self._contexts[key] = context
+
+        decoded = {key: value for key, value in data.items() if key not in ("context_id", "context")}
+        for field, value in context.items():
+            decoded.setdefault(field, value)
+        return decoded
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Minimal HTTP/1.1 request reader and response writer for asyncio streams.
+
+Just enough of the protocol for the monitor API: keep-alive, Content-Length
+bodies (the hook transport never sends chunked requests) and a few fixed
+response shapes. Headers are capped so a broken client can't make the
+server buffer without bound.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from urllib.parse import parse_qsl, urlsplit
+
+MAX_HEAD_BYTES = 64 * 1024
+MAX_BODY_BYTES = 16 * 1024 * 1024
+
+REASONS = {
+    200: "OK",
+    202: "Accepted",
+    204: "No Content",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    411: "Length Required",
+    413: "Payload Too Large",
+    415: "Unsupported Media Type",
+    431: "Request Header Fields Too Large",
+    500: "Internal Server Error",
+}
+
+
+class HTTPError(Exception):
+    """Request the server answers with an error status."""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+class Request:
+    """One parsed request."""
+
+    __slots__ = ("method", "path", "query", "headers", "body", "keep_alive")
+
+    def __init__(self, method: str, target: str, version: str, headers: dict[str, str]):
+        url = urlsplit(target)
+        self.method = method
+        self.path = url.path.rstrip("/") or "/"
+        self.query = dict(parse_qsl(url.query))
+        self.headers = headers
+        self.body = b""
+        connection = headers.get("connection", "").lower()
+        self.keep_alive = connection != "close" and (version == "HTTP/1.1" or connection == "keep-alive")
+
+
+async def read_request(reader: asyncio.StreamReader) -> Request | None:
+    """
+    Read one request (head and body) from the stream.
+
+    Returns:
+        The request, or None if the client closed the connection cleanly
+
+    Raises:
+        HTTPError: Malformed or oversized request
+    """
+    try:
+        head = await reader.readuntil(b"\r\n\r\n")
+    except asyncio.IncompleteReadError as e:
+        if not e.partial.strip():
+            return None
+        raise HTTPError(400, "incomplete request head") from None
+    except asyncio.LimitOverrunError:
+        raise HTTPError(431, "request head too large") from None
+
+    request_line, *field_lines = head[:-4].decode("latin-1").split("\r\n")
+    try:
+        method, target, version = request_line.split(" ")
+    except ValueError:
+        raise HTTPError(400, "malformed request line") from None
+
+    headers = {}
+    for line in field_lines:
+        name, sep, value = line.partition(":")
+        if not sep:
+            raise HTTPError(400, "malformed header line")
+        headers[name.strip().lower()] = value.strip()
+
+    request = Request(method, target, version, headers)
+
+    if "chunked" in headers.get("transfer-encoding", "").lower():
+        raise HTTPError(411, "chunked request bodies are not supported")
+    try:
+        length = int(headers.get("content-length", "0"))
+    except ValueError:
+        raise HTTPError(400, "invalid Content-Length") from None
+    if length < 0:
+        raise HTTPError(400, "invalid Content-Length")
+    if length > MAX_BODY_BYTES:
+        raise HTTPError(413, f"body larger than {MAX_BODY_BYTES} bytes")
+    if length:
+        try:
+            request.body = await reader.readexactly(length)
+        except asyncio.IncompleteReadError:
+            raise HTTPError(400, "incomplete request body") from None
+    return request
+
+
+def response(
+    status: int,
+    body: bytes = b"",
+    content_type: str = "application/json",
+    keep_alive: bool = True,
+) -> bytes:
+    """Encode a complete response with a Content-Length body."""
+    head = [
+        f"HTTP/1.1 {status} {REASONS.get(status, 'Unknown')}",
+        f"Content-Length: {len(body)}",
+        "Access-Control-Allow-Origin: *",
+        "Connection: keep-alive" if keep_alive else "Connection: close",
+    ]
+    if body:
+        head.append(f"Content-Type: {content_type}")
+    return ("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + body
+
+
+def stream_head() -> bytes:
+    """Response head of an open-ended Server-Sent Events stream."""
+    return (
+        "HTTP/1.1 200 OK\r\n"
+        "Content-Type: text/event-stream\r\n"
+        "Cache-Control: no-cache\r\n"
+        "Access-Control-Allow-Origin: *\r\n"
+        "Connection: close\r\n"
+        "\r\n"
+    ).encode("latin-1")
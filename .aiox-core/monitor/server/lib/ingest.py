@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Decode POST /events bodies into monitor event records.
+
+Accepts every wire format lib/send_event.py in the hooks produces:
+    application/json       - one event envelope (or a JSON array of them)
+    application/x-ndjson   - one envelope per line, usually gzip-compressed
+                             (Content-Encoding: gzip)
+
+Each envelope is {"type", "timestamp", "data"} (see build_event in the
+hooks). It is given a sequence id and encoded to JSON exactly once; the
+ring buffer, SSE subscribers and the SQLite store all share that text.
+"""
+
+from __future__ import annotations
+
+import json
+import time
+import zlib
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any
+
+# Upper bound for a decompressed batch, so a small gzip bomb can't
+# exhaust memory
+MAX_DECODED_BYTES = 64 * 1024 * 1024
+MAX_TYPE_LENGTH = 128
+
+
+class Event:
+    """One accepted event: sequence id, index fields and its encoded JSON."""
+
+    __slots__ = ("id", "type", "timestamp", "session_id", "agent", "story", "json")
+
+    def __init__(self, event_id: int, envelope: dict[str, Any]):
+        data = envelope["data"]
+        self.id = event_id
+        self.type = envelope["type"]
+        self.timestamp = envelope["timestamp"]
+        self.session_id = _text(data.get("session_id"))
+        self.agent = _text(data.get("aiox_agent"))
+        self.story = _text(data.get("aiox_story_id"))
+        self.json = json.dumps(
+            {"id": event_id, "type": self.type, "timestamp": self.timestamp, "data": data},
+            separators=(",", ":"),
+        )
+
+    def matches(self, filters: dict[str, str]) -> bool:
+        """True if every filter (session_id, agent, story, type) is equal."""
+        for field, value in filters.items():
+            if getattr(self, field) != value:
+                return False
+        return True
+
+
+def decode_body(
+    body: bytes, content_type: str = "", content_encoding: str = ""
+) -> tuple[list[dict[str, Any]], int]:
+    """
+    Parse a request body into validated event envelopes.
+
+    Args:
+        body: Raw request body
+        content_type: Content-Type header (lower case)
+        content_encoding: Content-Encoding header (lower case)
+
+    Returns:
+        (envelopes, number of rejected items)
+
+    Raises:
+        ValueError: The body is not valid gzip / JSON at all
+    """
+    if content_encoding == "gzip":
+        body = _gunzip(body)
+    elif content_encoding not in ("", "identity"):
+        raise ValueError(f"unsupported Content-Encoding: {content_encoding}")
+
+    if content_type.split(";")[0].strip() == "application/x-ndjson":
+        items = []
+        rejected = 0
+        for line in body.splitlines():
+            if not line.strip():
+                continue
+            try:
+                items.append(json.loads(line))
+            except ValueError:
+                # One torn line must not cost the rest of the batch
+                rejected += 1
+    else:
+        parsed = json.loads(body)
+        items = parsed if isinstance(parsed, list) else [parsed]
+        rejected = 0
+
+    envelopes = []
+    now_ms = int(time.time() * 1000)
+    for item in items:
+        envelope = _validate(item, now_ms)
+        if envelope is None:
+            rejected += 1
+        else:
+            envelopes.append(envelope)
+    return envelopes, rejected
+
+
+def _validate(item: Any, now_ms: int) -> dict[str, Any] | None:
+    """Normalize one envelope, or None if it has no usable event type."""
+    if not isinstance(item, dict):
+        return None
+
+    event_type = item.get("type")
+    if (
+        not isinstance(event_type, str)
+        or not event_type
+        or len(event_type) > MAX_TYPE_LENGTH
+        or "\n" in event_type
+        or "\r" in event_type
+    ):
+        # The type becomes an SSE "event:" line
+        return None
+
+    timestamp = item.get("timestamp")
+    if not isinstance(timestamp, int) or isinstance(timestamp, bool):
+        timestamp = now_ms
+
+    data = item.get("data")
+    if not isinstance(data, dict):
+        data = {}
+
+    return {"type": event_type, "timestamp": timestamp, "data": data}
+
+
+def _gunzip(body: bytes) -> bytes:
+    decoder = zlib.decompressobj(wbits=16 + zlib.MAX_WBITS)
+    try:
+        out = decoder.decompress(body, MAX_DECODED_BYTES)
+    except zlib.error as e:
+        raise ValueError(f"invalid gzip body: {e}") from None
+    if decoder.unconsumed_tail:
+        raise ValueError("decompressed body too large")
+    return out
+
+
+def _text(value: Any) -> str | None:
+    return value if isinstance(value, str) and value else None
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Bounded in-memory window of the most recent events.
+
+Serves live views (GET /events/recent) and lets an SSE client that
+reconnects with Last-Event-ID replay what it missed without touching
+SQLite. Sequence ids are contiguous, so the position of an id in the
+window is a subtraction instead of a search.
+
+Environment:
+    AIOX_MONITOR_RING_SIZE=10000   - events kept in memory
+"""
+
+from __future__ import annotations
+
+import os
+from collections import deque
+from itertools import islice
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from .ingest import Event
+
+RING_SIZE = int(os.environ.get("AIOX_MONITOR_RING_SIZE", "10000"))
+
+
+class RingBuffer:
+    """Fixed-capacity window of events; the oldest fall off the end."""
+
+    def __init__(self, capacity: int = RING_SIZE):
+        self._events: deque[Event] = deque(maxlen=max(1, capacity))
+
+    def __len__(self) -> int:
+        return len(self._events)
+
+    def extend(self, events: list[Event]) -> None:
+        """Append events in id order."""
+        self._events.extend(events)
+
+    def first_id(self) -> int | None:
+        """Oldest id still in the window, or None if empty."""
+        return self._events[0].id if self._events else None
+
+    def since(self, last_id: int, limit: int | None = None) -> list[Event]:
+        """
+        Events with an id greater than last_id, oldest first.
+
+        Args:
+            last_id: Last id the caller has seen
+            limit: Maximum number of events to return
+
+        Returns:
+            The events still in the window; older ones are gone
+        """
+        if not self._events:
+            return []
+        start = max(0, last_id + 1 - self._events[0].id)
+        stop = None if limit is None else start + limit
+        return list(islice(self._events, start, stop))
+
+    def latest(self, limit: int) -> list[Event]:
+        """The newest `limit` events, oldest first."""
+        if limit <= 0:
+            return []
+        count = len(self._events)
+        return list(islice(self._events, max(0, count - limit), count))
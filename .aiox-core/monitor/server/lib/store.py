@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Write-behind SQLite persistence for monitor events.
+
+The event loop never waits for the disk: accepted events are queued and a
+writer thread inserts whatever has accumulated in one transaction, so
+batches grow with the load instead of paying a commit per event. The
+queue is bounded; past MAX_PENDING events new ones are dropped (and
+counted) rather than letting a slow disk grow the server without bound.
+
+Queries use a separate connection (WAL mode lets it read while the writer
+commits) and see events once their batch is committed.
+
+Environment:
+    AIOX_MONITOR_DB=PATH           - database file
+                                     (default ~/.cache/aiox/monitor/events.db)
+"""
+
+from __future__ import annotations
+
+import os
+import queue
+import sqlite3
+import sys
+import threading
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from .ingest import Event
+
+DB_PATH = os.environ.get("AIOX_MONITOR_DB") or os.path.join(
+    os.path.expanduser("~"), ".cache", "aiox", "monitor", "events.db"
+)
+BATCH_SIZE = 2000
+MAX_PENDING = 100000
+QUERY_LIMIT = 1000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    id INTEGER PRIMARY KEY,
+    ts INTEGER NOT NULL,
+    type TEXT NOT NULL,
+    session_id TEXT,
+    agent TEXT,
+    story TEXT,
+    event TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS events_session ON events (session_id, id);
+CREATE INDEX IF NOT EXISTS events_agent ON events (agent, id);
+CREATE INDEX IF NOT EXISTS events_story ON events (story, id);
+"""
+
+# Query parameter -> indexed column
+FILTER_COLUMNS = {"session_id": "session_id", "agent": "agent", "story": "story", "type": "type"}
+
+
+class EventStore:
+    """SQLite event table fed by a background writer thread."""
+
+    def __init__(self, path: str = DB_PATH, batch_size: int = BATCH_SIZE, max_pending: int = MAX_PENDING):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+        self.path = path
+        self.batch_size = batch_size
+        self.max_pending = max_pending
+        self.pending = 0
+        self.written = 0
+        self.dropped = 0
+        self.batches = 0
+
+        # Set up here, then used by the writer thread only
+        self._writer_db = self._connect(check_same_thread=False)
+        self._writer_db.executescript(SCHEMA)
+        # Highest id on disk, so sequence ids continue after a restart
+        row = self._writer_db.execute("SELECT MAX(id) FROM events").fetchone()
+        self.last_id = row[0] or 0
+
+        self._reader_db = self._connect(check_same_thread=False)
+        self._reader_lock = threading.Lock()
+        self._lock = threading.Lock()
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._thread = threading.Thread(target=self._write_loop, name="event-store", daemon=True)
+        self._thread.start()
+
+    def _connect(self, check_same_thread: bool) -> sqlite3.Connection:
+        db = sqlite3.connect(self.path, check_same_thread=check_same_thread, isolation_level=None)
+        db.execute("PRAGMA journal_mode=WAL")
+        # A crash may lose the last batches, never corrupt the file
+        db.execute("PRAGMA synchronous=NORMAL")
+        return db
+
+    def put(self, events: list[Event]) -> bool:
+        """
+        Queue events for writing without blocking.
+
+        Returns:
+            True if queued, False if the backlog is full and they were dropped
+        """
+        with self._lock:
+            if self.pending + len(events) > self.max_pending:
+                self.dropped += len(events)
+                return False
+            self.pending += len(events)
+        self._queue.put(events)
+        return True
+
+    def _write_loop(self) -> None:
+        while True:
+            first = self._queue.get()
+            if first is None:
+                return
+            events = list(first)
+            stop = False
+            # Take whatever else piled up while the last batch was written
+            while len(events) < self.batch_size:
+                try:
+                    more = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if more is None:
+                    stop = True
+                    break
+                events.extend(more)
+            self._write(events)
+            if stop:
+                return
+
+    def _write(self, events: list[Event]) -> None:
+        rows = [(e.id, e.timestamp, e.type, e.session_id, e.agent, e.story, e.json) for e in events]
+        try:
+            self._writer_db.execute("BEGIN")
+            self._writer_db.executemany(
+                "INSERT OR REPLACE INTO events (id, ts, type, session_id, agent, story, event) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            self._writer_db.execute("COMMIT")
+            self.written += len(rows)
+            self.batches += 1
+        except sqlite3.Error as e:
+            if self._writer_db.in_transaction:
+                self._writer_db.execute("ROLLBACK")
+            self.dropped += len(rows)
+            print(f"Monitor server: failed to write {len(rows)} events: {e}", file=sys.stderr)
+        finally:
+            with self._lock:
+                self.pending -= len(rows)
+
+    def query(
+        self, filters: dict[str, str], after: int | None = None, limit: int = QUERY_LIMIT
+    ) -> list[str]:
+        """
+        Encoded events matching every filter, oldest first.
+
+        Args:
+            filters: Column name (see FILTER_COLUMNS) -> required value
+            after: Return the events following this id (pagination);
+                without it the newest `limit` events are returned
+            limit: Maximum number of events
+
+        Returns:
+            Event JSON texts, as sent to SSE subscribers
+        """
+        where = [f"{FILTER_COLUMNS[name]} = ?" for name in filters]
+        params: list = list(filters.values())
+        if after is not None:
+            where.append("id > ?")
+            params.append(after)
+        clause = f"WHERE {' AND '.join(where)}" if where else ""
+        order = "ASC" if after is not None else "DESC"
+        sql = f"SELECT event FROM events {clause} ORDER BY id {order} LIMIT ?"
+        params.append(max(0, min(limit, QUERY_LIMIT)))
+
+        with self._reader_lock:
+            rows = [row[0] for row in self._reader_db.execute(sql, params)]
+        if after is None:
+            rows.reverse()
+        return rows
+
+    def close(self, timeout: float = 30.0) -> None:
+        """Write everything still queued, then close both connections."""
+        self._queue.put(None)
+        self._thread.join(timeout)
+        with self._reader_lock:
+            self._reader_db.close()
+        if not self._thread.is_alive():
+            self._writer_db.close()
@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+"""
+Reference AIOX Monitor server - the receiving side of the monitor hooks.
+
+A single asyncio process that accepts what lib/send_event.py in the hooks
+sends (single JSON events and gzip NDJSON batches), keeps the most recent
+events in a ring buffer, persists them to SQLite behind the event loop and
+streams them to dashboards over Server-Sent Events. Events using the hooks'
+session context delta encoding are rehydrated on ingest (lib/context.py).
+
+Endpoints:
+    POST /events            - ingest one event, a JSON array or an NDJSON batch
+    GET  /events            - query SQLite (?session_id= &agent= &story=
+                              &type= &after=ID &limit=N)
+    GET  /events/recent     - ring buffer (?after=ID &limit=N)
+    GET  /events/stream     - SSE (same filters as /events; resumes after
+                              Last-Event-ID or ?after=ID from the ring buffer)
+    GET  /health            - counters
+
+Usage:
+    python3 server.py                       # Listen on 127.0.0.1:4001
+    python3 server.py --port 0 --db PATH    # Any free port, custom database
+
+Environment:
+    AIOX_MONITOR_HOST=127.0.0.1    - listen address
+    AIOX_MONITOR_PORT=4001         - listen port
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import signal
+import sys
+import time
+
+# Add lib to path
+sys.path.insert(0, os.path.dirname(__file__))
+
+from lib.broadcast import Broadcaster, sse_frame
+from lib.context import ContextDecoder
+from lib.http_io import MAX_HEAD_BYTES, HTTPError, read_request, response, stream_head
+from lib.ingest import Event, decode_body
+from lib.ring_buffer import RingBuffer, RING_SIZE
+from lib.store import DB_PATH, FILTER_COLUMNS, EventStore
+
+HOST = os.environ.get("AIOX_MONITOR_HOST", "127.0.0.1")
+PORT = int(os.environ.get("AIOX_MONITOR_PORT", "4001"))
+RECENT_LIMIT = 100
+SHUTDOWN_GRACE_S = 5.0
+
+
+class MonitorServer:
+    """Ingest, live view, persistence and fan-out for monitor events."""
+
+    def __init__(self, store: EventStore, ring_size: int = RING_SIZE):
+        self.store = store
+        self.ring = RingBuffer(ring_size)
+        self.broadcaster = Broadcaster()
+        self.contexts = ContextDecoder()
+        self.last_id = store.last_id
+        self.started = time.time()
+        self.accepted = 0
+        self.rejected = 0
+        self.requests = 0
+        self.bytes_in = 0
+        self.routes = {
+            ("POST", "/events"): self.post_events,
+            ("GET", "/events"): self.get_events,
+            ("GET", "/events/recent"): self.get_recent,
+            ("GET", "/health"): self.get_health,
+        }
+        self._connections: set[asyncio.StreamWriter] = set()
+        self._streams: set[asyncio.Task] = set()
+
+    def ingest(self, envelopes: list[dict]) -> list[Event]:
+        """
+        Rehydrate, number, buffer, broadcast and queue events for writing.
+
+        Runs on the event loop without awaiting, so events are assigned
+        ids and reach subscribers in arrival order (which the session
+        context decoder relies on too).
+        """
+        for envelope in envelopes:
+            envelope["data"] = self.contexts.decode(envelope["data"])
+
+        first = self.last_id + 1
+        events = [Event(first + i, envelope) for i, envelope in enumerate(envelopes)]
+        self.last_id += len(events)
+        self.accepted += len(events)
+
+        self.ring.extend(events)
+        self.broadcaster.publish(events)
+        self.store.put(events)
+        return events
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self._connections.add(writer)
+        try:
+            while True:
+                try:
+                    request = await read_request(reader)
+                except HTTPError as e:
+                    writer.write(_error(e.status, e.message, keep_alive=False))
+                    await writer.drain()
+                    return
+                if request is None:
+                    return
+
+                self.requests += 1
+                if request.method == "GET" and request.path == "/events/stream":
+                    await self.stream(request, writer)
+                    return
+
+                try:
+                    writer.write(await self.dispatch(request))
+                except HTTPError as e:
+                    writer.write(_error(e.status, e.message, request.keep_alive))
+                except Exception as e:
+                    # A handler bug answers 500 instead of dropping the connection
+                    print(f"Monitor server: {request.method} {request.path} failed: {e!r}", file=sys.stderr)
+                    writer.write(_error(500, "internal server error", keep_alive=False))
+                    await writer.drain()
+                    return
+                await writer.drain()
+                if not request.keep_alive:
+                    return
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            self._connections.discard(writer)
+            writer.close()
+
+    async def dispatch(self, request) -> bytes:
+        """Route a plain (non-streaming) request to its handler."""
+        handler = self.routes.get((request.method, request.path))
+        if handler is None:
+            if any(path == request.path for _, path in self.routes):
+                raise HTTPError(405, f"{request.method} not allowed on {request.path}")
+            raise HTTPError(404, f"no route for {request.path}")
+
+        status, body = await handler(request)
+        return response(status, body, keep_alive=request.keep_alive)
+
+    async def post_events(self, request):
+        self.bytes_in += len(request.body)
+        try:
+            envelopes, rejected = decode_body(
+                request.body,
+                request.headers.get("content-type", "").lower(),
+                request.headers.get("content-encoding", "").lower(),
+            )
+        except ValueError as e:
+            raise HTTPError(400, str(e)) from None
+
+        self.rejected += rejected
+        if not envelopes and rejected:
+            raise HTTPError(400, f"no valid events ({rejected} rejected)")
+
+        events = self.ingest(envelopes)
+        body = {"accepted": len(events), "rejected": rejected}
+        if events:
+            body["last_id"] = events[-1].id
+        return 202, _json(body)
+
+    async def get_events(self, request):
+        filters = _filters(request.query)
+        after = _int_param(request.query, "after", None)
+        limit = _int_param(request.query, "limit", RECENT_LIMIT, minimum=0)
+        rows = await asyncio.to_thread(self.store.query, filters, after, limit)
+        return 200, ("[" + ",".join(rows) + "]").encode("utf-8")
+
+    async def get_recent(self, request):
+        limit = _int_param(request.query, "limit", RECENT_LIMIT, minimum=0)
+        after = _int_param(request.query, "after", None)
+        events = self.ring.latest(limit) if after is None else self.ring.since(after, limit)
+        return 200, ("[" + ",".join(event.json for event in events) + "]").encode("utf-8")
+
+    async def get_health(self, request):
+        return 200, _json({
+            "status": "ok",
+            "uptime_s": round(time.time() - self.started, 1),
+            "last_id": self.last_id,
+            "requests": self.requests,
+            "accepted": self.accepted,
+            "rejected": self.rejected,
+            "bytes_in": self.bytes_in,
+            "unresolved_contexts": self.contexts.unresolved,
+            "ring": {"size": len(self.ring), "first_id": self.ring.first_id()},
+            "subscribers": len(self.broadcaster.subscribers),
+            "lagging_disconnects": self.broadcaster.disconnected,
+            "store": {
+                "pending": self.store.pending,
+                "written": self.store.written,
+                "batches": self.store.batches,
+                "dropped": self.store.dropped,
+            },
+        })
+
+    async def stream(self, request, writer: asyncio.StreamWriter) -> None:
+        """Serve one SSE subscriber until it disconnects."""
+        try:
+            filters = _filters(request.query)
+            after = _int_param(request.query, "after", None)
+            last_event_id = request.headers.get("last-event-id", "")
+            if last_event_id.isdigit():
+                after = int(last_event_id)
+        except HTTPError as e:
+            writer.write(_error(e.status, e.message, keep_alive=False))
+            return
+
+        # Replay and subscribe in the same loop step, so no event is both
+        # replayed and queued, or neither
+        backlog = []
+        if after is not None:
+            backlog = [sse_frame(event) for event in self.ring.since(after)
+                       if not filters or event.matches(filters)]
+        subscriber = self.broadcaster.subscribe(writer, filters)
+
+        task = asyncio.current_task()
+        self._streams.add(task)
+        try:
+            writer.write(stream_head())
+            await subscriber.run(backlog)
+        finally:
+            self.broadcaster.unsubscribe(subscriber)
+            self._streams.discard(task)
+
+    async def shutdown(self) -> None:
+        """End SSE streams and idle connections, then let the store write its backlog."""
+        self.broadcaster.close()
+        if self._streams:
+            await asyncio.wait(self._streams, timeout=SHUTDOWN_GRACE_S)
+        # Idle keep-alive clients would otherwise hold wait_closed() open
+        for writer in list(self._connections):
+            writer.close()
+        await asyncio.to_thread(self.store.close)
+
+
+def _filters(query: dict[str, str]) -> dict[str, str]:
+    return {name: query[name] for name in FILTER_COLUMNS if query.get(name)}
+
+
+def _int_param(query: dict[str, str], name: str, default, minimum: int | None = None):
+    value = query.get(name)
+    if value is None:
+        return default
+    try:
+        number = int(value)
+    except ValueError:
+        raise HTTPError(400, f"{name} must be an integer") from None
+    if minimum is not None and number < minimum:
+        raise HTTPError(400, f"{name} must be at least {minimum}")
+    return number
+
+
+def _json(value) -> bytes:
+    return json.dumps(value, separators=(",", ":")).encode("utf-8")
+
+
+def _error(status: int, message: str, keep_alive: bool) -> bytes:
+    return response(status, _json({"error": message}), keep_alive=keep_alive)
+
+
+async def serve(host: str, port: int, db_path: str, ring_size: int) -> None:
+    monitor = MonitorServer(EventStore(db_path), ring_size)
+    server = await asyncio.start_server(monitor.handle_connection, host, port, limit=MAX_HEAD_BYTES)
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(signum, stop.set)
+
+    bound_host, bound_port = server.sockets[0].getsockname()[:2]
+    print(f"Monitor server listening on http://{bound_host}:{bound_port} (db: {db_path})",
+          file=sys.stderr, flush=True)
+
+    async with server:
+        await stop.wait()
+        server.close()
+        await monitor.shutdown()
+
+    print(f"Monitor server stopped: {monitor.accepted} events accepted, "
+          f"{monitor.store.written} written, {monitor.store.dropped} dropped", file=sys.stderr)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Reference AIOX monitor server")
+    parser.add_argument('--host', default=HOST, help=f'Listen address (default: {HOST})')
+    parser.add_argument('--port', type=int, default=PORT, help=f'Listen port, 0 for any (default: {PORT})')
+    parser.add_argument('--db', default=DB_PATH, help=f'SQLite database (default: {DB_PATH})')
+    parser.add_argument('--ring-size', type=int, default=RING_SIZE,
+                        help=f'Events kept in memory for live views (default: {RING_SIZE})')
+    args = parser.parse_args()
+
+    asyncio.run(serve(args.host, args.port, args.db, args.ring_size))
+
+
+if __name__ == "__main__":
+    main()
@@ -10,26 +10,101 @@ Usage:
     python scripts/check-markdown-links.py --json       # JSON output for CI
     python scripts/check-markdown-links.py --fix        # Auto-fix broken links (add coming soon)
     python scripts/check-markdown-links.py --summary    # Quick summary only
+    python scripts/check-markdown-links.py --format sarif  # Stream findings (also: jsonl)
+    python scripts/check-markdown-links.py --jobs 8     # Scan with 8 processes (default: CPU count)
+    python scripts/check-markdown-links.py --no-cache   # Re-parse every file (cache: .cache/markdown-links.json)
+    python scripts/check-markdown-links.py --changed-since origin/main  # Only links the diff can affect
+    python scripts/check-markdown-links.py --watch      # Re-check on every save (inotify, or --poll)
+    python scripts/check-markdown-links.py --external   # Also check http(s) URLs (cached 24h)
 
 Exit codes:
     0 - All links valid (or only coming soon)
-    1 - Broken links found (needs attention)
+    1 - Broken links found (needs attention), including links whose
+        target only matches with different letter case, '#anchor'
+        links that match no heading in their target and, with
+        --external, unreachable URLs
     2 - Incorrect markings found (exists but marked coming soon)
 """
 
 import argparse
+import bisect
+import hashlib
+import io
 import json
 import os
 import re
 import sys
-from collections import defaultdict
+import time
+import unicodedata
+from collections import Counter, defaultdict
 from pathlib import Path
 from typing import Optional
+from urllib.parse import quote, unquote, urljoin, urlsplit
 
 # Configuration
 DOCS_DIR = "docs"
-LINK_PATTERN = re.compile(r'\[([^\]]*)\]\(([^)]+)\)')
+# One pass over a line finds every link with its optional trailing marker.
+# Code spans are matched first so the links inside them are skipped.
+LINK_TOKEN = re.compile(r"""
+    (?P<code>`+)(?!`).*?(?<!`)(?P=code)(?!`)
+  | !?\[(?P<text>(?:[^\[\]\\\n]|\\.|\[(?:[^\[\]\\\n]|\\.)*\])*)\]
+    (?:
+        \(\s*
+        (?:<(?P<angle>[^<>\n]*)>|(?P<target>(?:[^\s()\\]|\\.|\((?:[^\s()\\]|\\.)*\))+))
+        (?:\s+(?:"[^"\n]*"|'[^'\n]*'|\([^()\n]*\)))?
+        \s*\)
+      | \[(?P<ref>(?:[^\[\]\\\n]|\\.)*)\]
+    )?
+    (?P<marker>[ \t]*\*\(coming\ soon\)\*)?
+""", re.VERBOSE | re.IGNORECASE)
+# Reference definition: [label]: target "optional title"
+LINK_DEFINITION = re.compile(
+    r"""^ {0,3}\[(?P<label>(?:[^\[\]\\]|\\.)+)\]:[ \t]*(?:<(?P<angle>[^<>\n]*)>|(?P<target>\S+))"""
+    r"""(?:[ \t]+(?:"[^"\n]*"|'[^'\n]*'|\([^()\n]*\)))?[ \t]*$"""
+)
+BACKSLASH_ESCAPE = re.compile(r'\\([!-/:-@\[-`{-~])')
 COMING_SOON_MARKER = " *(coming soon)*"
+DEFAULT_JOBS = os.cpu_count() or 1
+# Below this many files, starting worker processes costs more than it saves
+PARALLEL_MIN_FILES = 64
+CACHE_FILE = os.path.join(".cache", "markdown-links.json")
+# Not indexed up front; links into them are checked on disk
+INDEX_SKIP_DIRS = (".git", "node_modules")
+# Bump when extract_links()/extract_anchors() output changes, to drop stale caches
+CACHE_VERSION = 6
+# --external: per-URL result cache and request limits
+EXTERNAL_CACHE_FILE = os.path.join(".cache", "external-links.json")
+EXTERNAL_TTL_S = 24 * 3600
+EXTERNAL_PER_HOST = 4
+EXTERNAL_CONCURRENCY = 32
+EXTERNAL_TIMEOUT_S = 10.0
+EXTERNAL_MAX_REDIRECTS = 5
+EXTERNAL_USER_AGENT = "check-markdown-links (AIOX docs)"
+# --watch: polling fallback interval, and how long to gather the events of one save
+POLL_INTERVAL_S = 0.5
+WATCH_DEBOUNCE_S = 0.05
+
+# Anchor index: headings (ATX and setext), explicit HTML ids, code fences
+ATX_HEADING = re.compile(r'^ {0,3}(#{1,6})(?:[ \t]+(.*?))?(?:[ \t]+#+)?[ \t]*$')
+SETEXT_UNDERLINE = re.compile(r'^ {0,3}(=+|-+)[ \t]*$')
+FENCE = re.compile(r'^ {0,3}(`{3,}|~{3,})')
+HTML_ANCHOR = re.compile(r'<[A-Za-z][^>]*?\s(?:id|name)\s*=\s*["\']([^"\']+)["\']')
+ANCHOR_TARGET_SUFFIXES = ('.md', '.markdown')
+SARIF_SCHEMA = "https://json.schemastore.org/sarif-2.1.0.json"
+# Reported category -> (SARIF level, rule description)
+SARIF_RULES = {
+    'broken': ('error', "Link target does not exist"),
+    'case_mismatch': ('error', "Link target only exists with different letter case"),
+    'broken_anchor': ('error', "Link '#anchor' matches no heading or HTML anchor in its target"),
+    'incorrect_marking': ('warning', "Link marked 'coming soon' but its target exists"),
+    'broken_external': ('warning', "External URL is unreachable or returns an error"),
+}
+CATEGORIES = ('broken', 'broken_anchor', 'broken_external', 'case_mismatch', 'coming_soon',
+              'incorrect_marking', 'valid')
+INLINE_LINK = re.compile(r'!?\[([^\]]*)\](?:\([^)]*\)|\[[^\]]*\])')
+HTML_TAG = re.compile(r'<[^>]+>')
+EMPHASIS_UNDERSCORE = re.compile(r'(?<!\w)_+|_+(?!\w)')
+ASCII_SLUG_DROP = re.compile(r'[^a-z0-9_\- ]')
 
 
 def normalize_path(source_file: str, link: str) -> Optional[str]:
@@ -51,141 +126,1171 @@ def normalize_path(source_file: str, link: str) -> Optional[str]:
     return os.path.normpath(os.path.join(source_dir, link))
 
 
-def is_coming_soon(line: str, link: str) -> bool:
-    """Check if a link is marked as coming soon."""
-    link_escaped = re.escape(f"]({link})")
-    return bool(re.search(link_escaped + r'.*coming soon', line, re.IGNORECASE))
+def resolve_link(source_file: str, link: str) -> Optional[tuple]:
+    """
+    Resolve a link to (target path, anchor).
 
-
-def scan_file(filepath: str) -> dict:
-    """Scan a markdown file for link issues."""
+    Pure '#anchor' links target the source file itself. The anchor is
+    percent-decoded, or None when the link has no fragment.
+    """
+    if link.startswith('#'):
+        target = os.path.normpath(source_file)
+    else:
+        target = normalize_path(source_file, link)
+        if target is None:
+            return None
+
+    _, hash_sign, fragment = link.partition('#')
+    return target, unquote(fragment) if hash_sign and fragment else None
+
+
+def github_slug(heading: str) -> str:
+    """
+    Anchor GitHub generates for a heading (github-slugger rules).
+
+    Inline markup is reduced to its text first; then the text is
+    lowercased, every character that is not a letter, mark, number,
+    underscore, hyphen or space is dropped, and spaces become hyphens.
+    """
+    text = INLINE_LINK.sub(r'\1', heading)
+    text = HTML_TAG.sub('', text)
+    text = EMPHASIS_UNDERSCORE.sub('', text)
+
+    text = text.strip().lower()
+    if text.isascii():
+        return ASCII_SLUG_DROP.sub('', text).replace(' ', '-')
+
+    slug = []
+    for char in text:
+        if char == ' ':
+            slug.append('-')
+        elif char in '-_' or unicodedata.category(char)[0] in 'LMN':
+            slug.append(char)
+    return ''.join(slug)
+
+
+def content_lines(lines: list):
+    """
+    Yield (line number, line without newline) for rendered markdown.
+
+    YAML front matter and fenced code blocks are skipped.
+    """
+    start = 0
+    if lines and lines[0].strip() == '---':
+        # YAML front matter: skip to the closing delimiter
+        for i in range(1, len(lines)):
+            if lines[i].strip() in ('---', '...'):
+                start = i + 1
+                break
+
+    fence = None
+    for line_num in range(start + 1, len(lines) + 1):
+        line = lines[line_num - 1].rstrip('\n')
+        # Cheap first-character check: most lines cannot be a fence
+        first = line.lstrip(' ')[:1]
+        if first in ('`', '~'):
+            match = FENCE.match(line)
+            if match:
+                marker = match.group(1)
+                if fence is None:
+                    fence = marker
+                elif marker[0] == fence[0] and len(marker) >= len(fence):
+                    fence = None
+                continue
+        if fence is None:
+            yield line_num, line
+
+
+def walk_lines(lines: list, anchors: bool = False) -> tuple:
+    """
+    Collect what the link and anchor checks need in one content_lines() pass.
+
+    Returns:
+        (definitions, definition line numbers, link lines, anchors): the
+        reference definitions as in collect_definitions(), the
+        (line number, line) pairs that can contain a link, and the anchors
+        as in extract_anchors() (None unless anchors=True).
+    """
+    definitions = {}
+    definition_lines = set()
+    link_lines = []
+    found = [] if anchors else None
+    seen = defaultdict(int)
+    previous = ''
+    previous_num = 0
+
+    def add_heading(text: str):
+        slug = github_slug(text)
+        count = seen[slug]
+        seen[slug] += 1
+        found.append(f"{slug}-{count}" if count else slug)
+
+    for line_num, line in content_lines(lines):
+        if '[' in line:
+            match = LINK_DEFINITION.match(line) if ']:' in line else None
+            if match:
+                target = match.group('angle') if match.group('angle') is not None else match.group('target')
+                definitions.setdefault(normalize_label(match.group('label')), target)
+                definition_lines.add(line_num)
+            else:
+                link_lines.append((line_num, line))
+
+        if found is None:
+            continue
+
+        if line_num != previous_num + 1:
+            # A skipped fence separates this line from the previous one
+            previous = ''
+        previous_num = line_num
+        first = line.lstrip(' ')[:1]
+
+        if '<' in line:
+            found.extend(HTML_ANCHOR.findall(line))
+
+        if first == '#':
+            heading = ATX_HEADING.match(line)
+            if heading:
+                add_heading(heading.group(2) or '')
+                previous = ''
+                continue
+
+        if previous and first in ('=', '-') and SETEXT_UNDERLINE.match(line):
+            add_heading(previous)
+            previous = ''
+            continue
+
+        # Only a plain paragraph line can become a setext heading
+        text = line.strip()
+        previous = text if text and text[0] not in '-*+>|<' else ''
+
+    return definitions, definition_lines, link_lines, found
+
+
+def extract_anchors(lines: list) -> list:
+    """
+    List the anchors a markdown file defines.
+
+    Heading slugs follow GitHub: a repeated slug gets -1, -2, ... appended.
+    Explicit <a name="..."> / id="..." anchors are included as written.
+    Headings and anchors inside code fences are ignored.
+    """
+    return walk_lines(lines, anchors=True)[3]
+
+
+def normalize_label(label: str) -> str:
+    """Reference labels match case-insensitively, with whitespace collapsed."""
+    return ' '.join(label.split()).casefold()
+
+
+def collect_definitions(lines: list) -> tuple:
+    """
+    Collect the reference-style link definitions of a file.
+
+    Returns:
+        ({normalized label: target}, set of definition line numbers). The
+        first definition of a label wins.
+    """
+    definitions, definition_lines, _, _ = walk_lines(lines)
+    return definitions, definition_lines
+
+
+def token_target(token: re.Match, definitions: Optional[dict] = None) -> Optional[str]:
+    """
+    Target of a LINK_TOKEN match, or None if it is not a link.
+
+    Reference-style links ([text][label], [label][], [label]) resolve
+    through definitions; an undefined label is plain text.
+    """
+    if token.group('code'):
+        return None
+    target = token.group('angle')
+    if target is None:
+        target = token.group('target')
+    if target is None:
+        label = token.group('ref') or token.group('text')
+        return definitions.get(normalize_label(label)) if definitions and label else None
+    if '\\' in target:
+        target = BACKSLASH_ESCAPE.sub(r'\1', target)
+    return target
+
+
+def extract_links(filepath: str, lines: list, external: Optional[list] = None) -> list:
+    """
+    Parse the internal links of a file.
+
+    Inline, angle-bracket and reference-style links are recognized; links
+    in code spans, fenced code blocks and front matter are not. Only
+    depends on the file's content, so the result can be cached by content
+    hash. Target existence is checked later by classify_links().
+
+    Each link is a (line, text, link, resolved, anchor, coming_soon)
+    tuple: the cache keeps every link of every file, so records hold only
+    what classification needs. The source line of a finding is read back
+    when it is reported.
+
+    http(s) links are appended to external, if given, as (line, text,
+    link) tuples.
+    """
+    return parse_lines(filepath, lines, external)[0]
+
+
+def parse_lines(filepath: str, lines: list, external: Optional[list] = None,
+                anchors: bool = False) -> tuple:
+    """
+    (links, anchors) of a file from a single walk over its lines.
+
+    links and external are as in extract_links(); anchors as in
+    extract_anchors(), or None unless anchors=True.
+    """
+    definitions, _, link_lines, found = walk_lines(lines, anchors)
+    links = []
+    for line_num, line in link_lines:
+        for token in LINK_TOKEN.finditer(line):
+            link = token_target(token, definitions)
+            if link is None:
+                continue
+            target = resolve_link(filepath, link)
+            if target is None:
+                if external is not None and link.startswith(('http://', 'https://')):
+                    external.append((line_num, token.group('text'), link))
+                continue
+
+            links.append((line_num, token.group('text'), link, target[0], target[1],
+                          token.group('marker') is not None))
+
+    return links, found
+
+
+class FileIndex:
+    """
+    Every file and directory under root, collected with a single walk.
+
+    Link targets are looked up in memory instead of one os.path.exists()
+    call per link. Lookups are exact (case-sensitive) on every platform;
+    a target that only matches with different letter case is reported by
+    case_variant(), since such links break on case-sensitive filesystems.
+    Paths outside root or below skipped/symlinked directories fall back
+    to the filesystem.
+    """
+
+    def __init__(self, root: str = '.', skip_dirs: tuple = INDEX_SKIP_DIRS):
+        self.root = os.path.abspath(root)
+        self.paths = {'.'}
+        self.lower = {}
+        # Directories whose contents were not walked
+        self.opaque = set()
+        self._exists = {}
+        self._cwd_is_root = self.root == os.getcwd()
+
+        for dirpath, dirs, files in os.walk(self.root):
+            rel_dir = os.path.relpath(dirpath, self.root)
+            walked = []
+            for name in dirs:
+                rel = os.path.normpath(os.path.join(rel_dir, name))
+                self._add(rel)
+                if name in skip_dirs or os.path.islink(os.path.join(dirpath, name)):
+                    self.opaque.add(rel)
+                else:
+                    walked.append(name)
+            dirs[:] = walked
+            for name in files:
+                self._add(os.path.normpath(os.path.join(rel_dir, name)))
+
+    def _add(self, rel: str):
+        self.paths.add(rel)
+        self.lower.setdefault(rel.lower(), rel)
+
+    def _relative(self, path: str) -> Optional[str]:
+        """path relative to root, or None if it is not covered by the index."""
+        if self._cwd_is_root and not os.path.isabs(path):
+            # Link targets are already normalized relative to the cwd
+            rel = path
+        else:
+            rel = os.path.relpath(os.path.abspath(path), self.root)
+        if rel == '..' or rel.startswith('..' + os.sep):
+            return None
+        parent = os.path.dirname(rel)
+        while parent:
+            if parent in self.opaque:
+                return None
+            parent = os.path.dirname(parent)
+        return rel
+
+    def exists(self, path: str) -> bool:
+        found = self._exists.get(path)
+        if found is None:
+            rel = self._relative(path)
+            found = rel in self.paths if rel is not None else os.path.exists(path)
+            self._exists[path] = found
+        return found
+
+    def update(self, path: str, present: bool) -> list:
+        """
+        Record that path was created (present=True) or deleted, for --watch.
+
+        Returns the deleted paths (path itself and, for a directory,
+        everything indexed below it), relative to the cwd.
+        """
+        rel = self._relative(path)
+        self._exists.clear()
+        if rel is None:
+            return [] if present else [path]
+        if present:
+            while rel and rel not in self.paths:
+                self._add(rel)
+                rel = os.path.dirname(rel)
+            return []
+
+        prefix = os.path.join(rel, '')
+        removed = [p for p in self.paths if p == rel or p.startswith(prefix)]
+        for gone in removed:
+            self.paths.discard(gone)
+            if self.lower.get(gone.lower()) == gone:
+                del self.lower[gone.lower()]
+        if self._cwd_is_root:
+            return removed or [path]
+        return [os.path.relpath(os.path.join(self.root, p)) for p in removed] or [path]
+
+    def case_variant(self, path: str) -> Optional[str]:
+        """Existing path that differs from path only in letter case, if any."""
+        rel = self._relative(path)
+        if rel is None or rel in self.paths:
+            return None
+        actual = self.lower.get(rel.lower())
+        if actual is None:
+            return None
+        return os.path.relpath(os.path.join(self.root, actual))
+
+
+class AnchorIndex:
+    """
+    Anchors defined by each markdown file, parsed at most once per run.
+
+    Anchors are only extracted for files that a '#anchor' link points
+    to, on first use (through the LinkCache when one is given, so they
+    are cached across runs too). Most files are never a fragment target,
+    so scanning does not pay for their headings.
+    """
+
+    def __init__(self, cache: Optional['LinkCache'] = None):
+        self.cache = cache
+        self.anchors = {}
+
+    def add(self, filepath: str, anchors: Optional[list]):
+        """Record the anchors of a parsed file (None: not extracted)."""
+        if anchors is not None:
+            self.anchors[os.path.normpath(filepath)] = set(anchors)
+
+    def forget(self, filepath: str):
+        """Drop the anchors of a changed or deleted file (re-parsed on next use)."""
+        self.anchors.pop(os.path.normpath(filepath), None)
+
+    def get(self, filepath: str) -> set:
+        filepath = os.path.normpath(filepath)
+        anchors = self.anchors.get(filepath)
+        if anchors is None:
+            entry = self.cache.lookup(filepath) if self.cache else None
+            if self.cache is None:
+                found = read_anchors(filepath)
+            elif entry is None:
+                # Not scanned: parse it all, so the cache keeps it
+                found = self.cache.store(filepath, parse_file(filepath, anchors=True))['anchors']
+            elif entry['anchors'] is None:
+                found = entry['anchors'] = read_anchors(filepath)
+                self.cache.dirty = True
+            else:
+                found = entry['anchors']
+            anchors = self.anchors[filepath] = set(found or ())
+        return anchors
+
+    def has(self, filepath: str, anchor: str) -> bool:
+        anchors = self.get(filepath)
+        return anchor in anchors or anchor.lower() in anchors
+
+
+def classify_links(links: list, index: Optional[FileIndex] = None,
+                   anchors: Optional[AnchorIndex] = None, filepath: Optional[str] = None) -> dict:
+    """
+    Sort extracted links into broken / broken anchor / case mismatch / coming soon / incorrect / valid.
+
+    Findings (every category but valid) get their 'line_content', read
+    from filepath once if it has any.
+    """
     results = {
         'broken': [],
+        'broken_anchor': [],
+        'case_mismatch': [],
         'coming_soon': [],
         'incorrect_marking': [],
         'valid': []
     }
+    lines = None
 
-    try:
-        with open(filepath, 'r', encoding='utf-8') as f:
-            lines = f.readlines()
+    for line_num, text, link, resolved, anchor, coming_soon in links:
+        exists = index.exists(resolved) if index else os.path.exists(resolved)
+        info = {'line': line_num, 'text': text, 'link': link, 'resolved': resolved}
 
-        for line_num, line in enumerate(lines, 1):
-            for match in LINK_PATTERN.finditer(line):
-                text, link = match.group(1), match.group(2)
-                resolved = normalize_path(filepath, link)
+        anchor_missing = (
+            exists and anchors is not None and anchor
+            and resolved.lower().endswith(ANCHOR_TARGET_SUFFIXES)
+            and not anchors.has(resolved, anchor)
+        )
+        actual = None
+
+        if exists and coming_soon and not anchor_missing:
+            category = 'incorrect_marking'
+        elif coming_soon:
+            category = 'coming_soon'
+        elif anchor_missing:
+            category = 'broken_anchor'
+        elif not exists:
+            actual = index.case_variant(resolved) if index else None
+            category = 'case_mismatch' if actual else 'broken'
+        else:
+            results['valid'].append(info)
+            continue
+
+        if filepath is not None:
+            if lines is None:
+                lines = read_lines(filepath)
+            info['line_content'] = source_line(lines, line_num)
+        if anchor_missing:
+            info['anchor'] = anchor
+        elif actual:
+            info['actual'] = actual
+        results[category].append(info)
 
-                if resolved is None:
-                    continue
+    return results
 
-                exists = os.path.exists(resolved)
-                coming_soon = is_coming_soon(line, link)
-
-                info = {
-                    'line': line_num,
-                    'text': text,
-                    'link': link,
-                    'resolved': resolved,
-                    'line_content': line.rstrip()
-                }
-
-                if exists and coming_soon:
-                    results['incorrect_marking'].append(info)
-                elif not exists and coming_soon:
-                    results['coming_soon'].append(info)
-                elif not exists:
-                    results['broken'].append(info)
-                else:
-                    results['valid'].append(info)
 
+def read_lines(filepath: str) -> list:
+    """Lines of a file, split like parse_file() splits them ([] if unreadable)."""
+    try:
+        with open(filepath, 'rb') as f:
+            raw = f.read()
+        return io.StringIO(raw.decode('utf-8'), newline=None).readlines()
     except Exception as e:
         print(f"Error scanning {filepath}: {e}", file=sys.stderr)
+        return []
 
-    return results
 
+def source_line(lines: list, line_num: int) -> str:
+    """Line line_num (1-based) without its line ending, '' if out of range."""
+    return lines[line_num - 1].rstrip() if 0 < line_num <= len(lines) else ''
 
-def fix_broken_link(filepath: str, line_num: int, link: str) -> bool:
-    """Add 'coming soon' marker to a broken link."""
-    try:
-        with open(filepath, 'r', encoding='utf-8') as f:
-            lines = f.readlines()
 
-        line_idx = line_num - 1
-        line = lines[line_idx]
+def parse_file(filepath: str, known_hash: Optional[str] = None, anchors: bool = False) -> dict:
+    """
+    Read, hash and parse one markdown file (runs in worker processes).
 
-        # Find the link and add marker after it
-        pattern = re.escape(f"]({link})")
-        if re.search(pattern + r'\s*\*\(coming soon\)\*', line, re.IGNORECASE):
-            return False  # Already marked
+    Anchors are extracted only with anchors=True (see AnchorIndex).
 
-        new_line = re.sub(
-            pattern,
-            f"]({link}){COMING_SOON_MARKER}",
-            line
-        )
+    Returns:
+        Cache entry {'mtime_ns', 'size', 'hash', 'links', 'anchors',
+        'external'}. 'links', 'anchors' and 'external' are None when the
+        content hash equals known_hash, i.e. the cached ones still apply;
+        'anchors' is also None when not requested.
+    """
+    entry = {'mtime_ns': None, 'size': None, 'hash': None, 'links': [], 'anchors': [], 'external': []}
 
-        if new_line != line:
-            lines[line_idx] = new_line
-            with open(filepath, 'w', encoding='utf-8') as f:
-                f.writelines(lines)
-            return True
+    try:
+        with open(filepath, 'rb') as f:
+            stat = os.fstat(f.fileno())
+            raw = f.read()
+
+        entry['mtime_ns'] = stat.st_mtime_ns
+        entry['size'] = stat.st_size
+        entry['hash'] = hashlib.sha1(raw).hexdigest()
+
+        if entry['hash'] == known_hash:
+            entry['links'] = entry['anchors'] = entry['external'] = None
+        else:
+            # Same line splitting as open(..., 'r').readlines()
+            lines = io.StringIO(raw.decode('utf-8'), newline=None).readlines()
+            entry['links'], entry['anchors'] = parse_lines(filepath, lines, entry['external'], anchors)
 
     except Exception as e:
-        print(f"Error fixing {filepath}:{line_num}: {e}", file=sys.stderr)
+        print(f"Error scanning {filepath}: {e}", file=sys.stderr)
+        entry['hash'] = None
+
+    return entry
+
+
+def read_anchors(filepath: str) -> list:
+    """Anchors of a file whose links were already parsed ([] if unreadable)."""
+    return extract_anchors(read_lines(filepath))
 
-    return False
 
+def scan_file(filepath: str, index: Optional[FileIndex] = None,
+              anchors: Optional[AnchorIndex] = None) -> dict:
+    """Scan a markdown file for link issues."""
+    entry = parse_file(filepath)
+    if anchors is None:
+        anchors = AnchorIndex()
+    anchors.add(filepath, entry['anchors'])
+    return classify_links(entry['links'], index, anchors, filepath)
+
+
+class LinkCache:
+    """
+    Persistent per-file link cache, keyed by content hash.
+
+    A file whose size and mtime are unchanged is not even read; otherwise
+    it is re-parsed only if its content hash changed. Targets are always
+    re-checked, since they can appear or disappear independently.
+
+    The whole cache is loaded into memory, so it holds only compact link
+    tuples (see extract_links()); the reverse link graph is not saved
+    and is built only when --changed-since or --watch needs it.
+    """
+
+    def __init__(self, path: Optional[str] = CACHE_FILE):
+        self.path = path
+        self.files = {}
+        # Reverse link graph {resolved target: [sources]}, built on demand
+        self.graph = None
+        self.dirty = False
+
+        if path is None:
+            # In-memory only (--watch with --no-cache)
+            return
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') == CACHE_VERSION:
+                self.files = data['files']
+        except (OSError, ValueError, KeyError, AttributeError):
+            pass
+
+    def lookup(self, filepath: str) -> Optional[dict]:
+        """Cached entry for filepath if its size and mtime are unchanged."""
+        entry = self.files.get(filepath)
+        if entry is None:
+            return None
+        try:
+            stat = os.stat(filepath)
+        except OSError:
+            return None
+        if stat.st_mtime_ns == entry['mtime_ns'] and stat.st_size == entry['size']:
+            return entry
+        return None
 
-def fix_incorrect_marking(filepath: str, line_num: int, link: str) -> bool:
-    """Remove 'coming soon' marker from a link to existing file."""
+    def known_hash(self, filepath: str) -> Optional[str]:
+        entry = self.files.get(filepath)
+        return entry['hash'] if entry else None
+
+    def store(self, filepath: str, entry: dict) -> dict:
+        """Record a freshly parsed entry; returns it with its links filled in."""
+        old = self.files.get(filepath)
+        if entry['links'] is None:
+            entry['links'] = old['links']
+            entry['anchors'] = old['anchors']
+            entry['external'] = old['external']
+        if entry['hash'] is not None:
+            if old is None or old['links'] is not entry['links']:
+                if old is not None:
+                    self._unlink(filepath, old['links'])
+                self._link(filepath, entry['links'])
+            self.files[filepath] = entry
+            self.dirty = True
+        return entry
+
+    def forget(self, filepath: str):
+        """Drop the entry of a deleted file."""
+        entry = self.files.pop(filepath, None)
+        if entry is not None:
+            self._unlink(filepath, entry['links'])
+            self.dirty = True
+
+    def prune(self, docs_dir: str, filepaths: list):
+        """Forget files under docs_dir that no longer exist."""
+        prefix = os.path.join(os.path.normpath(docs_dir), '')
+        current = set(filepaths)
+        for filepath in list(self.files):
+            if filepath not in current and os.path.join(os.path.normpath(filepath), '').startswith(prefix):
+                self.forget(filepath)
+
+    def reverse_graph(self) -> dict:
+        """{resolved target: [source files]} for every cached file."""
+        if self.graph is None:
+            graph = defaultdict(set)
+            # link[3] is the resolved target (see extract_links())
+            for source, entry in self.files.items():
+                for link in entry['links']:
+                    graph[link[3]].add(source)
+            self.graph = {target: sorted(sources) for target, sources in graph.items()}
+        return self.graph
+
+    def _link(self, source: str, links: list):
+        # The graph is kept up to date once built
+        if self.graph is None:
+            return
+        for target in {link[3] for link in links}:
+            sources = self.graph.setdefault(target, [])
+            position = bisect.bisect_left(sources, source)
+            if position == len(sources) or sources[position] != source:
+                sources.insert(position, source)
+
+    def _unlink(self, source: str, links: list):
+        if self.graph is None:
+            return
+        for target in {link[3] for link in links}:
+            sources = self.graph.get(target)
+            if sources and source in sources:
+                sources.remove(source)
+                if not sources:
+                    del self.graph[target]
+
+    def save(self):
+        """Atomically write the cache file (if anything changed)."""
+        if not self.dirty or self.path is None:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            tmp = f"{self.path}.{os.getpid()}.tmp"
+            data = {'version': CACHE_VERSION, 'files': self.files}
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump(data, f, separators=(',', ':'))
+            os.replace(tmp, self.path)
+            self.dirty = False
+        except OSError as e:
+            print(f"Warning: could not write cache {self.path}: {e}", file=sys.stderr)
+
+
+class ExternalChecker:
+    """
+    Checks external http(s) URLs concurrently (asyncio, standard library only).
+
+    Each URL is requested once per run with HEAD, then GET if the server
+    answers HEAD with an error (many reject or mishandle HEAD); redirects
+    are followed. Connections are limited per host and in total. Results
+    are kept in a persistent cache for ttl seconds, so repeat runs do not
+    hit the same URLs again.
+    """
+
+    def __init__(self, path: Optional[str] = EXTERNAL_CACHE_FILE, ttl: float = EXTERNAL_TTL_S,
+                 per_host: int = EXTERNAL_PER_HOST, concurrency: int = EXTERNAL_CONCURRENCY,
+                 timeout: float = EXTERNAL_TIMEOUT_S):
+        self.path = path
+        self.ttl = ttl
+        self.per_host = per_host
+        self.concurrency = concurrency
+        self.timeout = timeout
+        # URL -> {'status', 'error', 'checked'}
+        self.results = {}
+        self.dirty = False
+        self._ssl = None
+
+        if path is None:
+            return
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                self.results = json.load(f)['urls']
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+
+    @staticmethod
+    def is_broken(result: dict) -> bool:
+        # 429: rate limited, says nothing about the URL
+        return result['error'] is not None or (result['status'] >= 400 and result['status'] != 429)
+
+    def check(self, urls: list) -> dict:
+        """{url: result} for urls, requesting only those without a fresh cached result."""
+        now = time.time()
+        checked = {}
+        stale = []
+        for url in urls:
+            result = self.results.get(url)
+            if result is not None and now - result['checked'] < self.ttl:
+                checked[url] = result
+            else:
+                stale.append(url)
+
+        if stale:
+            # Imported here: asyncio alone costs more than a --changed-since run
+            import asyncio
+
+            for url, result in asyncio.run(self._check_all(stale)).items():
+                checked[url] = result
+                if result['status'] != 429:
+                    self.results[url] = result
+                    self.dirty = True
+        return checked
+
+    def save(self):
+        """Atomically write the cache file, dropping expired results."""
+        if not self.dirty or self.path is None:
+            return
+        now = time.time()
+        urls = {url: r for url, r in self.results.items() if now - r['checked'] < self.ttl}
+        try:
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            tmp = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump({'urls': urls}, f, separators=(',', ':'))
+            os.replace(tmp, self.path)
+            self.dirty = False
+        except OSError as e:
+            print(f"Warning: could not write cache {self.path}: {e}", file=sys.stderr)
+
+    async def _check_all(self, urls: list) -> dict:
+        import asyncio
+
+        limit = asyncio.Semaphore(self.concurrency)
+        hosts = {}
+
+        async def check_one(url: str):
+            host = urlsplit(url).netloc.lower()
+            per_host = hosts.setdefault(host, asyncio.Semaphore(self.per_host))
+            # Host slot first, so waiting on a busy host holds no global slot
+            async with per_host:
+                async with limit:
+                    return url, await self._probe(url)
+
+        return dict(await asyncio.gather(*(check_one(url) for url in urls)))
+
+    async def _probe(self, url: str) -> dict:
+        import asyncio
+
+        result = {'status': None, 'error': None, 'checked': time.time()}
+        try:
+            status = await asyncio.wait_for(self._request(url, 'HEAD'), self.timeout)
+            if status >= 400:
+                status = await asyncio.wait_for(self._request(url, 'GET'), self.timeout)
+            result['status'] = status
+        except asyncio.TimeoutError:
+            result['error'] = f"timeout after {self.timeout:g}s"
+        except (OSError, ValueError, UnicodeError) as e:
+            result['error'] = str(e) or type(e).__name__
+        return result
+
+    async def _request(self, url: str, method: str) -> int:
+        """Final status code of url, following redirects."""
+        for _ in range(EXTERNAL_MAX_REDIRECTS + 1):
+            status, location = await self._send(url, method)
+            if status not in (301, 302, 303, 307, 308) or not location:
+                return status
+            url = urljoin(url, location)
+            if status == 303:
+                method = 'GET'
+        raise ValueError(f"more than {EXTERNAL_MAX_REDIRECTS} redirects")
+
+    async def _send(self, url: str, method: str) -> tuple:
+        """One HTTP/1.1 request; reads the status line and headers only."""
+        parts = urlsplit(url)
+        if parts.scheme not in ('http', 'https') or not parts.hostname:
+            raise ValueError(f"unsupported URL: {url}")
+
+        context = None
+        if parts.scheme == 'https':
+            if self._ssl is None:
+                import ssl
+                self._ssl = ssl.create_default_context()
+            context = self._ssl
+        port = parts.port or (443 if context else 80)
+        host = parts.hostname.encode('idna').decode('ascii')
+
+        import asyncio
+
+        reader, writer = await asyncio.open_connection(host, port, ssl=context)
+        try:
+            target = quote(parts.path or '/', safe="/%:@!$&'()*+,;=-._~")
+            if parts.query:
+                target += '?' + quote(parts.query, safe="/%:@!$&'()*+,;=-._~?")
+            host_header = host if parts.port is None else f"{host}:{parts.port}"
+            writer.write(
+                f"{method} {target} HTTP/1.1\r\nHost: {host_header}\r\n"
+                f"User-Agent: {EXTERNAL_USER_AGENT}\r\nAccept: */*\r\nConnection: close\r\n\r\n"
+                .encode('ascii')
+            )
+            await writer.drain()
+
+            status_line = await reader.readline()
+            fields = status_line.split()
+            if len(fields) < 2 or not fields[0].startswith(b'HTTP/') or not fields[1].isdigit():
+                raise ValueError(f"bad HTTP response from {host}")
+
+            location = None
+            while True:
+                header = await reader.readline()
+                if header in (b'\r\n', b'\n', b''):
+                    break
+                name, _, value = header.partition(b':')
+                if name.strip().lower() == b'location':
+                    location = value.strip().decode('latin-1')
+            return int(fields[1]), location
+        finally:
+            writer.close()
+
+
+def rewrite_markers(line: str, link: str, marked: bool, definitions: Optional[dict] = None) -> str:
+    """Add (marked=True) or remove the 'coming soon' marker of every link to link on line."""
+    parts = []
+    pos = 0
+    for token in LINK_TOKEN.finditer(line):
+        if (token.group('marker') is not None) == marked or token_target(token, definitions) != link:
+            continue
+        if marked:
+            parts.append(line[pos:token.end()])
+            parts.append(COMING_SOON_MARKER)
+        else:
+            parts.append(line[pos:token.start('marker')])
+        pos = token.end()
+    if not parts:
+        return line
+    parts.append(line[pos:])
+    return ''.join(parts)
+
+
+def mark_coming_soon(line: str, link: str, definitions: Optional[dict] = None) -> str:
+    """Add the 'coming soon' marker after a broken link (no-op if already marked)."""
+    return rewrite_markers(line, link, True, definitions)
+
+
+def unmark_coming_soon(line: str, link: str, definitions: Optional[dict] = None) -> str:
+    """Remove the 'coming soon' marker after a link to an existing file."""
+    return rewrite_markers(line, link, False, definitions)
+
+
+# Result category -> line rewrite, and the category a fixed link moves to
+FIXES = {
+    'broken': (mark_coming_soon, 'coming_soon'),
+    'incorrect_marking': (unmark_coming_soon, 'valid'),
+}
+
+
+def write_atomic(filepath: str, content: str):
+    """Replace filepath with content via a temporary file and os.replace()."""
+    tmp = f"{filepath}.{os.getpid()}.tmp"
     try:
-        with open(filepath, 'r', encoding='utf-8') as f:
+        with open(tmp, 'w', encoding='utf-8', newline='') as f:
+            f.write(content)
+        os.chmod(tmp, os.stat(filepath).st_mode & 0o7777)
+        os.replace(tmp, filepath)
+    except OSError:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+
+def fix_file(filepath: str, edits: list) -> list:
+    """
+    Apply every fix for one file in a single read -> rewrite -> write pass.
+
+    edits is a list of (category, info) pairs from the scan results. Edits
+    of the same link on the same line are applied once: a rewrite covers
+    every occurrence of the link on its line.
+
+    Returns the edits that changed the file, with their line_content
+    updated; nothing is written if no edit applies.
+    """
+    try:
+        with open(filepath, 'r', encoding='utf-8', newline='') as f:
             lines = f.readlines()
+    except OSError as e:
+        print(f"Error fixing {filepath}: {e}", file=sys.stderr)
+        return []
+
+    # Lines keep their own endings for the rewrite; the scan parsed them
+    # with universal newlines, so match definitions without the '\r'
+    definitions, _ = collect_definitions([line.rstrip('\r\n') for line in lines])
+    groups = defaultdict(list)
+    for category, info in edits:
+        groups[(info['line'], category, info['link'])].append((category, info))
+
+    applied = []
+    for (line_num, category, link), group in groups.items():
+        if not 0 < line_num <= len(lines):
+            continue
+        line = lines[line_num - 1]
+        new_line = FIXES[category][0](line, link, definitions)
+        if new_line != line:
+            lines[line_num - 1] = new_line
+            applied.extend(group)
 
-        line_idx = line_num - 1
-        line = lines[line_idx]
+    if not applied:
+        return []
 
-        # Remove the coming soon marker after this specific link
-        pattern = re.escape(f"]({link})") + r'\s*\*\(coming soon\)\*'
-        new_line = re.sub(pattern, f"]({link})", line, flags=re.IGNORECASE)
+    try:
+        write_atomic(filepath, ''.join(lines))
+    except OSError as e:
+        print(f"Error fixing {filepath}: {e}", file=sys.stderr)
+        return []
+
+    for _, info in applied:
+        info['line_content'] = lines[info['line'] - 1].rstrip()
+    return applied
+
+
+def fix_results(results: dict) -> dict:
+    """
+    Fix broken links and incorrect markings, updating results in place.
+
+    Each file is read and written once, whatever its number of fixes.
+    Fixed links move to the category they now belong to ('coming_soon' or
+    'valid'), so no re-scan is needed. Returns the fix count per category.
+    """
+    by_file = defaultdict(list)
+    for category in FIXES:
+        for filepath, info in results[category]:
+            by_file[filepath].append((category, info))
+
+    fixed_ids = set()
+    for filepath, edits in by_file.items():
+        fixed_ids.update(id(info) for _, info in fix_file(filepath, edits))
+
+    counts = {}
+    for category, (_, new_category) in FIXES.items():
+        remaining = []
+        for filepath, info in results[category]:
+            if id(info) not in fixed_ids:
+                remaining.append((filepath, info))
+            elif new_category == 'valid':
+                results['valid'] += 1
+            else:
+                results[new_category].append((filepath, info))
+        counts[category] = len(results[category]) - len(remaining)
+        results[category] = remaining
+    return counts
+
+
+def find_markdown_files(docs_dir: str = DOCS_DIR) -> list:
+    """List markdown files under docs_dir in a stable (sorted) order."""
+    markdown_files = []
+    for root, dirs, files in os.walk(docs_dir):
+        dirs.sort()
+        for file in sorted(files):
+            if file.endswith('.md'):
+                markdown_files.append(os.path.join(root, file))
+    return markdown_files
 
-        if new_line != line:
-            lines[line_idx] = new_line
-            with open(filepath, 'w', encoding='utf-8') as f:
-                f.writelines(lines)
-            return True
 
-    except Exception as e:
-        print(f"Error fixing {filepath}:{line_num}: {e}", file=sys.stderr)
+def map_files(filepaths: list, known_hashes: list, jobs: int = 1):
+    """
+    Yield parse_file() entries for filepaths, in input order.
 
-    return False
+    With jobs > 1 files are parsed by a process pool in chunks; results
+    are still yielded in input order, so reports do not depend on timing.
+    """
+    if jobs <= 1 or len(filepaths) < PARALLEL_MIN_FILES:
+        yield from map(parse_file, filepaths, known_hashes)
+        return
 
+    from concurrent.futures import ProcessPoolExecutor
 
-def scan_docs(docs_dir: str = DOCS_DIR) -> dict:
-    """Scan all markdown files in docs directory."""
-    all_results = {
-        'broken': [],
-        'coming_soon': [],
-        'incorrect_marking': [],
-        'valid': [],
-        'files_scanned': 0
-    }
+    # A few chunks per worker balances uneven file sizes without paying
+    # inter-process overhead per file
+    chunksize = max(1, len(filepaths) // (jobs * 4))
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        yield from pool.map(parse_file, filepaths, known_hashes, chunksize=chunksize)
 
-    for root, _, files in os.walk(docs_dir):
-        for file in files:
-            if file.endswith('.md'):
-                filepath = os.path.join(root, file)
-                results = scan_file(filepath)
 
-                all_results['files_scanned'] += 1
-                all_results['broken'].extend([(filepath, i) for i in results['broken']])
-                all_results['coming_soon'].extend([(filepath, i) for i in results['coming_soon']])
-                all_results['incorrect_marking'].extend([(filepath, i) for i in results['incorrect_marking']])
-                all_results['valid'].extend([(filepath, i) for i in results['valid']])
+def load_entries(filepaths: list, jobs: int = 1, cache: Optional[LinkCache] = None):
+    """Yield (filepath, parse_file() entry) in input order, parsing only cache misses."""
+    cached = [cache.lookup(fp) if cache else None for fp in filepaths]
+    misses = [fp for fp, entry in zip(filepaths, cached) if entry is None]
+    known_hashes = [cache.known_hash(fp) if cache else None for fp in misses]
+    parsed = map_files(misses, known_hashes, jobs)
+
+    for filepath, entry in zip(filepaths, cached):
+        if entry is None:
+            entry = next(parsed)
+            if cache:
+                entry = cache.store(filepath, entry)
+        yield filepath, entry
+
+
+def git_changes(ref: str) -> Optional[list]:
+    """
+    Paths changed between ref and the working tree, per `git diff --name-status`,
+    plus untracked files (not ignored) as 'A'.
+
+    Returns:
+        [(status letter, path relative to the current directory)], with a
+        rename split into 'D' for the old path and 'A' for the new one, or
+        None if git fails (not a repository, unknown ref).
+    """
+    import subprocess
+
+    try:
+        top = subprocess.run(
+            ['git', 'rev-parse', '--show-toplevel'],
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+        diff = subprocess.run(
+            ['git', 'diff', '--name-status', '-z', '-M', ref, '--'],
+            capture_output=True, check=True
+        ).stdout.decode('utf-8', 'surrogateescape')
+        # git diff never lists new files that are not added yet
+        untracked = subprocess.run(
+            ['git', 'ls-files', '--others', '--exclude-standard', '-z'],
+            capture_output=True, check=True, cwd=top
+        ).stdout.decode('utf-8', 'surrogateescape')
+    except (OSError, subprocess.CalledProcessError) as e:
+        stderr = getattr(e, 'stderr', None)
+        detail = stderr.decode('utf-8', 'replace').strip() if isinstance(stderr, bytes) else (stderr or str(e)).strip()
+        print(f"Warning: git diff {ref} failed: {detail}", file=sys.stderr)
+        return None
+
+    # -z output: status NUL path NUL, or status NUL old NUL new NUL for renames/copies
+    fields = diff.split('\0')
+    changes = []
+    i = 0
+    while i < len(fields) and fields[i]:
+        status = fields[i][0]
+        if status in 'RC':
+            old, new = fields[i + 1], fields[i + 2]
+            if status == 'R':
+                changes.append(('D', old))
+            changes.append(('A', new))
+            i += 3
+        else:
+            changes.append((status, fields[i + 1]))
+            i += 2
+    changes.extend(('A', path) for path in untracked.split('\0') if path)
+
+    return [(status, os.path.relpath(os.path.join(top, path))) for status, path in changes]
+
+
+def changed_files(ref: str, docs_dir: str, cache: Optional[LinkCache], jobs: int = 1) -> Optional[list]:
+    """
+    Markdown files under docs_dir whose links changes since ref can affect.
+
+    The cache may predate commits made without running the checker, or
+    come from another checkout, so every file under docs_dir is checked
+    against it first (one stat each): stale or missing entries are
+    re-parsed and deleted files forgotten before the reverse link graph
+    is built.
+
+    Returns None (check everything) without a populated cache or when git
+    fails.
+    """
+    if cache is None or not cache.files:
+        print("Warning: no link cache yet, checking every file", file=sys.stderr)
+        return None
+    changes = git_changes(ref)
+    if changes is None:
+        return None
+
+    filepaths = find_markdown_files(docs_dir)
+    stale = [fp for fp in filepaths if cache.lookup(fp) is None]
+    for _ in load_entries(stale, jobs, cache):
+        pass
+    cache.prune(docs_dir, filepaths)
+    return affected_files(changes, docs_dir, cache.reverse_graph())
+
+
+def affected_files(changes: list, docs_dir: str, graph: dict) -> list:
+    """
+    The changed markdown files under docs_dir plus, through the reverse
+    link graph, every one linking to a changed, added or deleted path.
+    """
+    affected = set()
+    for status, path in changes:
+        if status != 'D':
+            affected.add(path)
+        affected.update(os.path.normpath(source) for source in graph.get(path, ()))
+
+    docs_dir = os.path.normpath(docs_dir)
+    prefix = '' if docs_dir == '.' else os.path.join(docs_dir, '')
+    return sorted(
+        path for path in affected
+        if path.endswith('.md') and path.startswith(prefix) and os.path.isfile(path)
+    )
+
+
+def scan_docs(docs_dir: str = DOCS_DIR, jobs: int = 1, cache: Optional[LinkCache] = None,
+              index: Optional[FileIndex] = None, reporter: Optional['Reporter'] = None,
+              filepaths: Optional[list] = None, anchors: Optional[AnchorIndex] = None,
+              save_cache: bool = True, external: Optional['ExternalChecker'] = None) -> dict:
+    """
+    Scan all markdown files in docs directory.
+
+    Files are classified as they are parsed and every finding is handed to
+    reporter.finding() right away; valid links are only counted, so memory
+    does not grow with the number of valid links.
+
+    filepaths restricts the scan to the given files (see
+    changed_files()); the cache is then not pruned. --watch passes its
+    long-lived index and anchors and saves the cache itself.
+
+    With an ExternalChecker, the unique http(s) URLs of the scanned files
+    are checked once all files are classified ('broken_external').
+
+    Returns:
+        {category: [(filepath, info), ...]} for every non-valid category,
+        plus 'valid' and 'files_scanned' counts.
+    """
+    all_results = {category: [] for category in CATEGORIES if category != 'valid'}
+    all_results['valid'] = 0
+    all_results['files_scanned'] = 0
+
+    if index is None:
+        index = FileIndex()
+    if anchors is None:
+        anchors = AnchorIndex(cache)
+    if reporter:
+        reporter.start()
+
+    def record(filepath: str, results: dict):
+        all_results['valid'] += len(results.pop('valid', ()))
+        for category, infos in results.items():
+            for info in infos:
+                all_results[category].append((filepath, info))
+                if reporter:
+                    reporter.finding(category, filepath, info)
+
+    partial = filepaths is not None
+    if not partial:
+        filepaths = find_markdown_files(docs_dir)
+    # URL without fragment -> [(filepath, (line, text, link))]
+    external_links = defaultdict(list)
+
+    for filepath, entry in load_entries(filepaths, jobs, cache):
+        anchors.add(filepath, entry['anchors'])
+        if external:
+            for link in entry['external']:
+                external_links[link[2].split('#')[0]].append((filepath, link))
+
+        all_results['files_scanned'] += 1
+        record(filepath, classify_links(entry['links'], index, anchors, filepath))
+
+    if external and external_links:
+        sources = {}
+        for url, result in external.check(list(external_links)).items():
+            broken = ExternalChecker.is_broken(result)
+            for filepath, (line_num, text, link) in external_links[url]:
+                if not broken:
+                    all_results['valid'] += 1
+                    continue
+                if filepath not in sources:
+                    sources[filepath] = read_lines(filepath)
+                info = {'line': line_num, 'text': text, 'link': link, 'resolved': url,
+                        'line_content': source_line(sources[filepath], line_num)}
+                info['status'] = result['status']
+                if result['error']:
+                    info['error'] = result['error']
+                record(filepath, {'broken_external': [info]})
+        external.save()
+
+    if cache:
+        if not partial:
+            cache.prune(docs_dir, filepaths)
+        if save_cache:
+            cache.save()
 
     return all_results
 
 
+def replay_findings(results: dict, reporter: 'Reporter'):
+    """Feed collected results to a reporter (after --fix changed them)."""
+    reporter.start()
+    for category in CATEGORIES:
+        if category != 'valid':
+            for filepath, info in results[category]:
+                reporter.finding(category, filepath, info)
+
+
 def print_report(results: dict, verbose: bool = True):
     """Print a human-readable report."""
     print("=" * 70)
@@ -220,14 +1325,43 @@ def print_report(results: dict, verbose: bool = True):
             print(f"  {link} ({len(sources)} refs)")
     print()
 
+    # Case mismatches (only resolve on case-insensitive filesystems)
+    print(f"## 4. CASE MISMATCH: Target exists with different letter case: {len(results['case_mismatch'])}")
+    print("-" * 60)
+    if verbose and results['case_mismatch']:
+        for fp, info in sorted(results['case_mismatch'], key=lambda x: x[0]):
+            print(f"  {fp}:{info['line']} -> {info['link']} (actual: {info['actual']})")
+    print()
+
+    # Broken anchors (file exists, #fragment does not)
+    print(f"## 5. BROKEN ANCHORS: File exists but '#anchor' not found: {len(results['broken_anchor'])}")
+    print("-" * 60)
+    if verbose and results['broken_anchor']:
+        for fp, info in sorted(results['broken_anchor'], key=lambda x: x[0]):
+            print(f"  {fp}:{info['line']} -> {info['link']}")
+    print()
+
+    # Broken external URLs (only checked with --external)
+    if results['broken_external']:
+        print(f"## 6. BROKEN EXTERNAL: URL unreachable or error status: {len(results['broken_external'])}")
+        print("-" * 60)
+        if verbose:
+            for fp, info in sorted(results['broken_external'], key=lambda x: x[0]):
+                print(f"  {fp}:{info['line']} -> {info['link']} ({info.get('error') or info['status']})")
+        print()
+
     # Summary
     print("=" * 70)
     print("SUMMARY")
     print("=" * 70)
     print(f"  Files scanned: {results['files_scanned']}")
-    print(f"  Valid links: {len(results['valid'])}")
+    print(f"  Valid links: {results['valid']}")
     print(f"  Broken links (ACTION: mark coming soon): {len(results['broken'])}")
     print(f"  Incorrect markings (ACTION: remove coming soon): {len(results['incorrect_marking'])}")
+    print(f"  Case mismatches (ACTION: fix letter case): {len(results['case_mismatch'])}")
+    print(f"  Broken anchors (ACTION: fix #anchor): {len(results['broken_anchor'])}")
+    if results['broken_external']:
+        print(f"  Broken external URLs (ACTION: update or remove): {len(results['broken_external'])}")
     print(f"  Planned content (coming soon): {len(results['coming_soon'])}")
 
     # Unique destinations to create
@@ -235,16 +1369,24 @@ def print_report(results: dict, verbose: bool = True):
     print(f"  Unique destinations to create: {len(unique_dests)}")
 
 
+def summary_counts(results: dict) -> dict:
+    """Per-category counts, as in the JSON summary."""
+    return {
+        'files_scanned': results['files_scanned'],
+        'valid_links': results['valid'],
+        'broken_links': len(results['broken']),
+        'incorrect_markings': len(results['incorrect_marking']),
+        'case_mismatches': len(results['case_mismatch']),
+        'broken_anchors': len(results['broken_anchor']),
+        'broken_external_links': len(results['broken_external']),
+        'coming_soon_links': len(results['coming_soon']),
+    }
+
+
 def print_json(results: dict):
     """Print results as JSON for CI integration."""
     output = {
-        'summary': {
-            'files_scanned': results['files_scanned'],
-            'valid_links': len(results['valid']),
-            'broken_links': len(results['broken']),
-            'incorrect_markings': len(results['incorrect_marking']),
-            'coming_soon_links': len(results['coming_soon']),
-        },
+        'summary': summary_counts(results),
         'broken': [
             {'file': fp, **info}
             for fp, info in results['broken']
@@ -253,6 +1395,18 @@ def print_json(results: dict):
             {'file': fp, **info}
             for fp, info in results['incorrect_marking']
         ],
+        'case_mismatch': [
+            {'file': fp, **info}
+            for fp, info in results['case_mismatch']
+        ],
+        'broken_anchor': [
+            {'file': fp, **info}
+            for fp, info in results['broken_anchor']
+        ],
+        'broken_external': [
+            {'file': fp, **info}
+            for fp, info in results['broken_external']
+        ],
         'coming_soon_destinations': list(set(
             info['link'] for _, info in results['coming_soon']
         ))
@@ -264,17 +1418,402 @@ def print_summary(results: dict):
     """Print a quick summary only."""
     broken = len(results['broken'])
     incorrect = len(results['incorrect_marking'])
+    case_mismatch = len(results['case_mismatch'])
+    broken_anchor = len(results['broken_anchor'])
+    broken_external = len(results['broken_external'])
     coming_soon = len(results['coming_soon'])
 
-    status = "PASS" if broken == 0 and incorrect == 0 else "FAIL"
+    failed = broken or incorrect or case_mismatch or broken_anchor or broken_external
+    status = "FAIL" if failed else "PASS"
 
     print(f"Link Check: {status}")
-    print(f"  Broken: {broken} | Incorrect: {incorrect} | Coming Soon: {coming_soon}")
+    print(f"  Broken: {broken} | Incorrect: {incorrect} | Case: {case_mismatch} | "
+          f"Anchors: {broken_anchor} | " + (f"External: {broken_external} | " if broken_external else "") +
+          f"Coming Soon: {coming_soon}")
 
     if broken > 0:
         print(f"  Run with --fix to auto-mark broken links as 'coming soon'")
     if incorrect > 0:
         print(f"  Run with --fix to remove incorrect 'coming soon' markers")
+    if case_mismatch > 0:
+        print(f"  Fix the letter case of links that only work on case-insensitive filesystems")
+    if broken_anchor > 0:
+        print(f"  Fix '#anchor' links that match no heading or HTML anchor in their target")
+    if broken_external > 0:
+        print(f"  Update or remove external URLs that are unreachable or return an error")
+
+
+class Reporter:
+    """
+    Report format. Receives findings while the scan is still running.
+
+    start() is called before the first finding, finding() once per
+    non-valid link and finish() with the final scan_docs() results.
+    """
+
+    def start(self):
+        pass
+
+    def finding(self, category: str, filepath: str, info: dict):
+        pass
+
+    def finish(self, results: dict):
+        pass
+
+
+class TextReporter(Reporter):
+    """Human-readable report, grouped by category (printed at the end)."""
+
+    def finish(self, results: dict):
+        print_report(results)
+
+
+class SummaryReporter(Reporter):
+    """Counts only."""
+
+    def finish(self, results: dict):
+        print_summary(results)
+
+
+class JsonReporter(Reporter):
+    """Single JSON document with a summary first (printed at the end)."""
+
+    def finish(self, results: dict):
+        print_json(results)
+
+
+class JsonLinesReporter(Reporter):
+    """One JSON object per finding as it is found, then a summary object."""
+
+    def finding(self, category: str, filepath: str, info: dict):
+        print(json.dumps({'type': category, 'file': filepath, **info}, ensure_ascii=False), flush=True)
+
+    def finish(self, results: dict):
+        print(json.dumps({'type': 'summary', **summary_counts(results)}), flush=True)
+
+
+class SarifReporter(Reporter):
+    """
+    SARIF 2.1.0 log for code scanning, streamed result by result.
+
+    Planned content ('coming soon') is not a problem and is left out.
+    """
+
+    def __init__(self):
+        self.count = 0
+
+    def start(self):
+        rules = [
+            {
+                'id': category,
+                'shortDescription': {'text': description},
+                'defaultConfiguration': {'level': level},
+            }
+            for category, (level, description) in SARIF_RULES.items()
+        ]
+        head = json.dumps({
+            '$schema': SARIF_SCHEMA,
+            'version': '2.1.0',
+            'runs': [{'tool': {'driver': {'name': 'check-markdown-links', 'rules': rules}}, 'results': []}],
+        })
+        # Leave the results array open; findings are written into it
+        print(head[:-len(']}]}')], end='', flush=True)
+
+    def finding(self, category: str, filepath: str, info: dict):
+        if category not in SARIF_RULES:
+            return
+        message = f"{SARIF_RULES[category][1]}: {info['link']}"
+        if 'actual' in info:
+            message += f" (actual: {info['actual']})"
+        result = {
+            'ruleId': category,
+            'level': SARIF_RULES[category][0],
+            'message': {'text': message},
+            'locations': [{
+                'physicalLocation': {
+                    'artifactLocation': {'uri': Path(os.path.normpath(filepath)).as_posix()},
+                    'region': {'startLine': info['line']},
+                },
+            }],
+        }
+        print(',' if self.count else '', json.dumps(result, ensure_ascii=False), sep='', flush=True)
+        self.count += 1
+
+    def finish(self, results: dict):
+        print(']}]}', flush=True)
+
+
+REPORTERS = {
+    'text': TextReporter,
+    'summary': SummaryReporter,
+    'json': JsonReporter,
+    'jsonl': JsonLinesReporter,
+    'sarif': SarifReporter,
+}
+
+
+class PollingWatcher:
+    """Portable change detection: compares (mtime, size) snapshots of root."""
+
+    name = 'polling'
+
+    def __init__(self, root: str, interval: float = POLL_INTERVAL_S):
+        self.root = root
+        self.interval = interval
+        self.snapshot = self._snapshot()
+
+    def _snapshot(self) -> dict:
+        snapshot = {}
+        for dirpath, dirs, files in os.walk(self.root):
+            dirs[:] = [name for name in dirs if name not in INDEX_SKIP_DIRS]
+            for name in dirs:
+                snapshot[os.path.normpath(os.path.join(dirpath, name))] = None
+            for name in files:
+                path = os.path.normpath(os.path.join(dirpath, name))
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                snapshot[path] = (stat.st_mtime_ns, stat.st_size)
+        return snapshot
+
+    def __iter__(self):
+        """Yield lists of (status, path) changes, status being 'A', 'M' or 'D'."""
+        while True:
+            time.sleep(self.interval)
+            snapshot = self._snapshot()
+            changes = [('D', path) for path in self.snapshot if path not in snapshot]
+            for path, state in snapshot.items():
+                if path not in self.snapshot:
+                    changes.append(('A', path))
+                elif state != self.snapshot[path]:
+                    changes.append(('M', path))
+            self.snapshot = snapshot
+            if changes:
+                yield changes
+
+
+class InotifyWatcher:
+    """
+    Linux inotify (through ctypes), one watch per directory under root.
+
+    Yields the same changes as PollingWatcher, as soon as a save is
+    complete, or None when the kernel queue overflowed (events were lost).
+    """
+
+    name = 'inotify'
+
+    IN_CLOSE_WRITE = 0x8
+    IN_MOVED_FROM = 0x40
+    IN_MOVED_TO = 0x80
+    IN_CREATE = 0x100
+    IN_DELETE = 0x200
+    IN_Q_OVERFLOW = 0x4000
+    IN_ISDIR = 0x40000000
+    IN_CLOEXEC = 0o2000000
+    MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+
+    def __init__(self, root: str):
+        import ctypes
+
+        self.libc = ctypes.CDLL(None, use_errno=True)
+        self.fd = self.libc.inotify_init1(self.IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.dirs = {}
+        try:
+            self._watch_tree(root)
+        except OSError:
+            os.close(self.fd)
+            raise
+
+    def _watch_tree(self, root: str) -> list:
+        """Watch root and every directory below it; returns the paths found."""
+        import ctypes
+
+        found = []
+        for dirpath, dirs, files in os.walk(root):
+            dirs[:] = [name for name in dirs if name not in INDEX_SKIP_DIRS]
+            wd = self.libc.inotify_add_watch(self.fd, os.fsencode(dirpath), self.MASK)
+            if wd < 0:
+                # ENOSPC: fs.inotify.max_user_watches reached
+                raise OSError(ctypes.get_errno(), f"cannot watch {dirpath}")
+            self.dirs[wd] = os.path.normpath(dirpath)
+            found.extend(os.path.normpath(os.path.join(dirpath, name)) for name in dirs + files)
+        return found
+
+    def __iter__(self):
+        import select
+        import struct
+
+        header = struct.Struct('iIII')
+        while True:
+            select.select([self.fd], [], [])
+            changes = []
+            overflow = False
+            # An editor save is several events: collect until the burst ends
+            while select.select([self.fd], [], [], WATCH_DEBOUNCE_S)[0]:
+                buffer = os.read(self.fd, 65536)
+                offset = 0
+                while offset < len(buffer):
+                    wd, mask, _, length = header.unpack_from(buffer, offset)
+                    name = buffer[offset + header.size:offset + header.size + length].rstrip(b'\0')
+                    offset += header.size + length
+
+                    if mask & self.IN_Q_OVERFLOW:
+                        overflow = True
+                        continue
+                    directory = self.dirs.get(wd)
+                    if directory is None or not name:
+                        continue
+                    path = os.path.join(directory, os.fsdecode(name))
+
+                    if mask & (self.IN_DELETE | self.IN_MOVED_FROM):
+                        changes.append(('D', path))
+                    elif mask & (self.IN_CREATE | self.IN_MOVED_TO):
+                        changes.append(('A', path))
+                        if mask & self.IN_ISDIR:
+                            changes.extend(('A', found) for found in self._watch_tree(path))
+                    elif mask & self.IN_CLOSE_WRITE:
+                        changes.append(('M', path))
+
+            if overflow:
+                yield None
+            elif changes:
+                yield changes
+
+
+def make_watcher(root: str, poll: bool = False):
+    """InotifyWatcher where available, PollingWatcher otherwise."""
+    if not poll and sys.platform.startswith('linux'):
+        try:
+            return InotifyWatcher(root)
+        except (OSError, AttributeError) as e:
+            print(f"Warning: inotify unavailable ({e}), polling every {POLL_INTERVAL_S}s", file=sys.stderr)
+    return PollingWatcher(root)
+
+
+def coalesce_changes(changes: list) -> list:
+    """One (status, path) per path: created then written is 'A', deleted then created is 'M'."""
+    final = {}
+    for status, path in changes:
+        previous = final.get(path)
+        if previous == 'A' and status == 'M':
+            continue
+        if previous == 'D' and status == 'A':
+            status = 'M'
+        final[path] = status
+    return [(status, path) for path, status in final.items()]
+
+
+def group_findings(results: dict) -> dict:
+    """scan_docs() findings as {filepath: [(category, info), ...]}."""
+    by_file = defaultdict(list)
+    for category in CATEGORIES:
+        if category != 'valid':
+            for filepath, info in results[category]:
+                by_file[os.path.normpath(filepath)].append((category, info))
+    return by_file
+
+
+def finding_deltas(filepath: str, before: list, after: list) -> list:
+    """
+    '+'/'-' report lines for the findings of a file that appeared or went
+    away. Findings are matched on (category, link), so lines shifting
+    after an edit are not reported.
+    """
+    remaining = Counter((category, info['link']) for category, info in before)
+    lines = []
+    for category, info in after:
+        key = (category, info['link'])
+        if remaining[key]:
+            remaining[key] -= 1
+        else:
+            lines.append(f"  + {category:<18} {filepath}:{info['line']} -> {info['link']}")
+    for category, info in before:
+        key = (category, info['link'])
+        if remaining[key]:
+            remaining[key] -= 1
+            lines.append(f"  - {category:<18} {filepath}:{info['line']} -> {info['link']}")
+    return lines
+
+
+def watch_docs(docs_dir: str, jobs: int = 1, cache: Optional[LinkCache] = None, poll: bool = False):
+    """
+    Scan once, then re-check what each filesystem change can affect.
+
+    The file index, anchors and reverse link graph stay in memory and are
+    updated per change; only the edited files and the files linking to
+    created, deleted or renamed paths are re-classified, and only the
+    findings that changed are printed. Runs until interrupted.
+    """
+    docs_dir = os.path.normpath(docs_dir)
+    if cache is None:
+        cache = LinkCache(None)
+
+    index = FileIndex()
+    anchors = AnchorIndex(cache)
+    results = scan_docs(docs_dir, jobs, cache, index, anchors=anchors, save_cache=False)
+    # Built once here, then kept up to date by LinkCache.store()/forget()
+    cache.reverse_graph()
+    findings = group_findings(results)
+    print_summary(results)
+
+    watcher = make_watcher(docs_dir, poll)
+    print(f"Watching {docs_dir}/ ({watcher.name}), Ctrl+C to stop", flush=True)
+
+    try:
+        for changes in watcher:
+            start = time.perf_counter()
+            if changes is None:
+                # Lost events: rebuild everything
+                index = FileIndex()
+                anchors = AnchorIndex(cache)
+                results = scan_docs(docs_dir, jobs, cache, index, anchors=anchors, save_cache=False)
+                checked = set(findings)
+                new_findings = group_findings(results)
+                checked.update(new_findings)
+            else:
+                deleted = []
+                written = []
+                for status, path in coalesce_changes(changes):
+                    if status == 'D':
+                        deleted.extend(index.update(path, False))
+                    else:
+                        index.update(path, True)
+                        written.append((status, path))
+                for path in deleted:
+                    cache.forget(path)
+                    anchors.forget(path)
+                for _, path in written:
+                    anchors.forget(path)
+
+                changes = [('D', path) for path in deleted] + written
+                affected = affected_files(changes, docs_dir, cache.reverse_graph())
+                partial = scan_docs(docs_dir, 1, cache, index, anchors=anchors,
+                                    filepaths=affected, save_cache=False)
+                checked = set(affected).union(path for path in deleted if path in findings)
+                new_findings = group_findings(partial)
+
+            lines = []
+            for filepath in sorted(checked):
+                before = findings.pop(filepath, [])
+                after = new_findings.get(filepath, [])
+                if after:
+                    findings[filepath] = after
+                lines.extend(finding_deltas(filepath, before, after))
+            elapsed_ms = (time.perf_counter() - start) * 1000
+
+            totals = Counter(category for file_findings in findings.values() for category, _ in file_findings)
+            print(f"[{time.strftime('%H:%M:%S')}] {len(checked)} files re-checked in {elapsed_ms:.1f} ms")
+            print('\n'.join(lines) if lines else "  (no change in findings)")
+            print(f"  Broken: {totals['broken']} | Incorrect: {totals['incorrect_marking']} | "
+                  f"Case: {totals['case_mismatch']} | Anchors: {totals['broken_anchor']} | "
+                  f"Coming Soon: {totals['coming_soon']}", flush=True)
+    except KeyboardInterrupt:
+        print()
+    finally:
+        cache.save()
 
 
 def main():
@@ -298,49 +1837,98 @@ def main():
         action='store_true',
         help='Show summary only'
     )
+    parser.add_argument(
+        '--format',
+        choices=sorted(REPORTERS),
+        help='Report format (default: text); jsonl and sarif stream findings as they are found'
+    )
     parser.add_argument(
         '--dir',
         default=DOCS_DIR,
         help=f'Directory to scan (default: {DOCS_DIR})'
     )
+    parser.add_argument(
+        '--changed-since',
+        metavar='REF',
+        help='Only check files whose links changes since git REF can affect'
+    )
+    parser.add_argument(
+        '--external',
+        action='store_true',
+        help=f'Also check http(s) links (results cached {EXTERNAL_TTL_S // 3600}h in {EXTERNAL_CACHE_FILE})'
+    )
+    parser.add_argument(
+        '--external-ttl',
+        type=float,
+        default=EXTERNAL_TTL_S,
+        metavar='SECONDS',
+        help='How long cached external results stay valid (0: re-check every URL)'
+    )
+    parser.add_argument(
+        '--watch',
+        action='store_true',
+        help='Keep running and re-check affected files on every change'
+    )
+    parser.add_argument(
+        '--poll',
+        action='store_true',
+        help=f'With --watch, poll every {POLL_INTERVAL_S}s instead of using inotify'
+    )
+    parser.add_argument(
+        '--cache',
+        default=CACHE_FILE,
+        help=f'Incremental link cache (default: {CACHE_FILE})'
+    )
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Parse every file, ignoring and not updating the cache'
+    )
+    parser.add_argument(
+        '--jobs', '-j',
+        type=int,
+        default=DEFAULT_JOBS,
+        help=f'Parallel scan processes (default: CPU count, {DEFAULT_JOBS})'
+    )
 
     args = parser.parse_args()
 
-    # Scan documentation
-    results = scan_docs(args.dir)
-
-    # Auto-fix if requested
-    if args.fix:
-        fixed_broken = 0
-        fixed_incorrect = 0
+    cache = None if args.no_cache else LinkCache(args.cache)
 
-        # Fix broken links (add coming soon)
-        for fp, info in results['broken']:
-            if fix_broken_link(fp, info['line'], info['link']):
-                fixed_broken += 1
+    if args.watch:
+        if args.fix:
+            parser.error('--watch cannot be combined with --fix')
+        watch_docs(args.dir, args.jobs, cache, args.poll)
+        sys.exit(0)
 
-        # Fix incorrect markings (remove coming soon)
-        for fp, info in results['incorrect_marking']:
-            if fix_incorrect_marking(fp, info['line'], info['link']):
-                fixed_incorrect += 1
+    report_format = args.format or ('json' if args.json else 'summary' if args.summary else 'text')
+    reporter = REPORTERS[report_format]()
+    filepaths = changed_files(args.changed_since, args.dir, cache, args.jobs) if args.changed_since else None
+    external = None
+    if args.external:
+        external = ExternalChecker(None if args.no_cache else EXTERNAL_CACHE_FILE, args.external_ttl)
 
-        print(f"Fixed {fixed_broken} broken links (added 'coming soon')")
-        print(f"Fixed {fixed_incorrect} incorrect markings (removed 'coming soon')")
-        print()
+    if args.fix:
+        # Findings are reported once fixed, so nothing is streamed during the scan
+        results = scan_docs(args.dir, args.jobs, cache, filepaths=filepaths, external=external)
+        fixed = fix_results(results)
 
-        # Re-scan after fixes
-        results = scan_docs(args.dir)
+        # Keep machine-readable streams clean
+        out = sys.stderr if report_format in ('jsonl', 'sarif') else sys.stdout
+        print(f"Fixed {fixed['broken']} broken links (added 'coming soon')", file=out)
+        print(f"Fixed {fixed['incorrect_marking']} incorrect markings (removed 'coming soon')", file=out)
+        print(file=out)
 
-    # Output results
-    if args.json:
-        print_json(results)
-    elif args.summary:
-        print_summary(results)
+        replay_findings(results, reporter)
     else:
-        print_report(results)
+        results = scan_docs(args.dir, args.jobs, cache, reporter=reporter, filepaths=filepaths,
+                            external=external)
+
+    reporter.finish(results)
 
     # Exit code
-    if len(results['broken']) > 0:
+    if (len(results['broken']) > 0 or len(results['case_mismatch']) > 0 or len(results['broken_anchor']) > 0
+            or len(results['broken_external']) > 0):
         sys.exit(1)
     elif len(results['incorrect_marking']) > 0:
         sys.exit(2)
@@ -48,9 +48,7 @@ echo ""
 
 # Copy library files
 echo "📚 Installing library files..."
-cp "$HOOKS_SOURCE/lib/__init__.py" "$HOOKS_TARGET/lib/"
-cp "$HOOKS_SOURCE/lib/send_event.py" "$HOOKS_TARGET/lib/"
-cp "$HOOKS_SOURCE/lib/enrich.py" "$HOOKS_TARGET/lib/"
+cp "$HOOKS_SOURCE"/lib/*.py "$HOOKS_TARGET/lib/"
 
 # Copy hook files
 echo "🪝 Installing hooks..."
@@ -62,6 +60,24 @@ for hook in pre_tool_use post_tool_use user_prompt_submit stop subagent_stop not
     fi
 done
 
+# Copy background services
+echo "⚙️  Installing services..."
+for service in flusher hook_host hook_client; do
+    if [ -f "$HOOKS_SOURCE/${service}.py" ]; then
+        cp "$HOOKS_SOURCE/${service}.py" "$HOOKS_TARGET/"
+        echo "   ✓ ${service}.py"
+    fi
+done
+
+# Copy command-line tools
+echo "🔧 Installing tools..."
+for tool in hook_metrics archive_query; do
+    if [ -f "$HOOKS_SOURCE/${tool}.py" ]; then
+        cp "$HOOKS_SOURCE/${tool}.py" "$HOOKS_TARGET/"
+        echo "   ✓ ${tool}.py"
+    fi
+done
+
 # Make all Python files executable
 chmod +x "$HOOKS_TARGET"/*.py 2>/dev/null || true
 
@@ -77,5 +93,9 @@ echo "║                                                                ║"
 echo "║  2. (Optional) Set custom server URL:                          ║"
 echo "║     export AIOX_MONITOR_URL=http://localhost:4001              ║"
 echo "║                                                                ║"
-echo "║  3. Start using Claude Code - events will be captured!         ║"
+echo "║  3. (Optional) Spool events locally and deliver in background: ║"
+echo "║     export AIOX_MONITOR_SPOOL=1                                ║"
+echo "║     python3 ~/.claude/hooks/flusher.py &                       ║"
+echo "║                                                                ║"
+echo "║  4. Start using Claude Code - events will be captured!         ║"
 echo "╚════════════════════════════════════════════════════════════════╝"
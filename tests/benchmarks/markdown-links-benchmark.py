@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Markdown Link Checker Benchmark
+
+Times scripts/check-markdown-links.py scan_docs() over a directory with an
+increasing number of worker processes and reports the speedup over a
+single process, then compares a full scan with a re-validation from a warm
+incremental cache (unchanged tree) and with a --changed-since style check
+of the files affected by a change to --changed files (their own links plus
+every file linking to them, via the cache's reverse link graph). The first
+(untimed) pass warms the page cache.
+
+Usage:
+    python3 tests/benchmarks/markdown-links-benchmark.py [--dir docs] [--jobs 1,2,4,8] [--repeat 3] [--changed 5]
+"""
+
+import argparse
+import importlib.util
+import os
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.abspath(os.path.join(BENCH_DIR, "..", ".."))
+SCRIPT = os.path.join(PROJECT_ROOT, "scripts", "check-markdown-links.py")
+
+
+def load_checker():
+    """Import check-markdown-links.py (not importable by name: it has dashes)."""
+    spec = importlib.util.spec_from_file_location("check_markdown_links", SCRIPT)
+    module = importlib.util.module_from_spec(spec)
+    # Registered so worker processes can unpickle scan_file
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def main():
+    cpus = os.cpu_count() or 1
+    default_jobs = sorted({1, 2, 4, cpus} | {n for n in (8, 16) if n <= cpus})
+
+    parser = argparse.ArgumentParser(description="Benchmark the markdown link checker")
+    parser.add_argument("--dir", default=os.path.join(PROJECT_ROOT, "docs"))
+    parser.add_argument("--jobs", default=",".join(map(str, default_jobs)),
+                        help="comma-separated worker counts")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--changed", type=int, default=5,
+                        help="modified files in the simulated diff")
+    args = parser.parse_args()
+
+    checker = load_checker()
+    files = checker.find_markdown_files(args.dir)
+    checker.scan_docs(args.dir, 1)
+
+    print(f"{len(files)} markdown files under {args.dir}, {cpus} CPUs")
+    print(f"{'jobs':>6} {'best s':>10} {'speedup':>9}")
+    print("-" * 27)
+
+    baseline = None
+    for jobs in (int(n) for n in args.jobs.split(",")):
+        best = best_of(lambda: checker.scan_docs(args.dir, jobs), args.repeat)
+        baseline = baseline or best
+        print(f"{jobs:>6} {best:>10.3f} {baseline / best:>8.2f}x")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache_file = os.path.join(tmp, "markdown-links.json")
+        checker.scan_docs(args.dir, 1, checker.LinkCache(cache_file))
+
+        def warm():
+            checker.scan_docs(args.dir, 1, checker.LinkCache(cache_file))
+
+        # Simulated PR: the most linked-to files were modified
+        graph = checker.LinkCache(cache_file).reverse_graph()
+        targets = sorted((t for t in graph if t.endswith(".md")), key=lambda t: -len(graph[t]))
+        changes = [("M", target) for target in targets[:args.changed]]
+
+        def changed():
+            cache = checker.LinkCache(cache_file)
+            affected = checker.affected_files(changes, args.dir, cache.reverse_graph())
+            checker.scan_docs(args.dir, 1, cache, filepaths=affected)
+            return affected
+
+        full = best_of(lambda: checker.scan_docs(args.dir, 1), args.repeat)
+        cached = best_of(warm, args.repeat)
+        affected = changed()
+        incremental = best_of(changed, args.repeat)
+
+    print()
+    print(f"{'mode':<24} {'best s':>10} {'speedup':>9}")
+    print("-" * 45)
+    print(f"{'full scan':<24} {full:>10.3f} {1:>8.2f}x")
+    print(f"{'warm cache, unchanged':<24} {cached:>10.3f} {full / cached:>8.2f}x")
+    label = f"changed ({len(affected)} files)"
+    print(f"{label:<24} {incremental:>10.3f} {full / incremental:>8.2f}x")
+
+
+def best_of(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+External Link Checker Benchmark
+
+Runs scripts/check-markdown-links.py's ExternalChecker against a local
+stand-in HTTP server (two host names for the same server, a fixed latency
+per request) and reports URLs/s for a sequential baseline, the concurrent
+checker and a warm-cache re-run. Also verifies the outcome per URL kind
+and that no host ever had more than the per-host limit of connections.
+
+Stand-in routes:
+    /ok/N         200
+    /missing/N    404
+    /nohead/N     405 for HEAD, 200 for GET (HEAD -> GET fallback)
+    /redirect/N   301 to /ok/N
+
+Usage:
+    python3 tests/benchmarks/markdown-links-external-benchmark.py [--urls 400] [--latency-ms 20]
+"""
+
+import argparse
+import importlib.util
+import os
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.abspath(os.path.join(BENCH_DIR, "..", ".."))
+SCRIPT = os.path.join(PROJECT_ROOT, "scripts", "check-markdown-links.py")
+
+EXPECTED_BROKEN = {"ok": False, "missing": True, "nohead": False, "redirect": False}
+
+
+def load_checker():
+    """Import check-markdown-links.py (not importable by name: it has dashes)."""
+    spec = importlib.util.spec_from_file_location("check_markdown_links", SCRIPT)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+class StandIn(BaseHTTPRequestHandler):
+    latency = 0.02
+    lock = threading.Lock()
+    active = {}
+    peak = {}
+    requests = 0
+
+    def log_message(self, *args):
+        pass
+
+    def handle_one_request(self):
+        # Count connections per Host header for the per-host limit check
+        try:
+            super().handle_one_request()
+        finally:
+            host = getattr(self, "host", None)
+            if host is not None:
+                with StandIn.lock:
+                    StandIn.active[host] -= 1
+
+    def respond(self, send_body: bool):
+        self.host = self.headers.get("Host")
+        with StandIn.lock:
+            StandIn.requests += 1
+            StandIn.active[self.host] = StandIn.active.get(self.host, 0) + 1
+            StandIn.peak[self.host] = max(StandIn.peak.get(self.host, 0), StandIn.active[self.host])
+        time.sleep(self.latency)
+
+        kind, _, number = self.path.strip("/").partition("/")
+        if kind == "ok" or (kind == "nohead" and send_body):
+            self.send_response(200)
+        elif kind == "nohead":
+            self.send_response(405)
+        elif kind == "redirect":
+            self.send_response(301)
+            self.send_header("Location", f"/ok/{number}")
+        else:
+            self.send_response(404)
+        self.send_header("Content-Length", "2" if send_body else "0")
+        self.end_headers()
+        if send_body:
+            self.wfile.write(b"ok")
+
+    def do_HEAD(self):
+        self.respond(send_body=False)
+
+    def do_GET(self):
+        self.respond(send_body=True)
+
+
+def make_urls(port: int, count: int) -> list:
+    hosts = (f"127.0.0.1:{port}", f"localhost:{port}")
+    kinds = list(EXPECTED_BROKEN)
+    return [f"http://{hosts[i % 2]}/{kinds[i % len(kinds)]}/{i}" for i in range(count)]
+
+
+def timed_check(checker, urls: list) -> tuple:
+    start = time.perf_counter()
+    results = checker.check(urls)
+    return results, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the external link checker")
+    parser.add_argument("--urls", type=int, default=400)
+    parser.add_argument("--latency-ms", type=float, default=20.0)
+    args = parser.parse_args()
+
+    module = load_checker()
+    StandIn.latency = args.latency_ms / 1000
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StandIn)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    urls = make_urls(server.server_address[1], args.urls)
+
+    print(f"{len(urls)} URLs on 2 hosts, {args.latency_ms:g} ms per request, "
+          f"per-host limit {module.EXTERNAL_PER_HOST}, total {module.EXTERNAL_CONCURRENCY}")
+    print(f"{'mode':<28} {'seconds':>9} {'URLs/s':>10} {'requests':>9}")
+    print("-" * 59)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache_file = os.path.join(tmp, "external-links.json")
+        rows = [
+            ("sequential (1 connection)", module.ExternalChecker(None, per_host=1, concurrency=1)),
+            ("concurrent, cold cache", module.ExternalChecker(cache_file)),
+        ]
+        for label, checker in rows:
+            before = StandIn.requests
+            StandIn.peak.clear()
+            results, elapsed = timed_check(checker, urls)
+            checker.save()
+            print(f"{label:<28} {elapsed:>9.3f} {len(urls) / elapsed:>10.0f} {StandIn.requests - before:>9}")
+
+        peak = dict(StandIn.peak)
+        before = StandIn.requests
+        results, elapsed = timed_check(module.ExternalChecker(cache_file), urls)
+        print(f"{'concurrent, warm cache':<28} {elapsed:>9.3f} {len(urls) / elapsed:>10.0f} {StandIn.requests - before:>9}")
+
+    server.shutdown()
+
+    wrong = [
+        url for url, result in results.items()
+        if module.ExternalChecker.is_broken(result) != EXPECTED_BROKEN[url.split("/")[3]]
+    ]
+    print()
+    print(f"Peak connections per host: {peak}")
+    print(f"Misclassified URLs: {len(wrong)}" + (f" (e.g. {wrong[0]}: {results[wrong[0]]})" if wrong else ""))
+    if wrong or max(peak.values()) > module.EXTERNAL_PER_HOST:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Markdown Link Checker Memory Benchmark
+
+Generates synthetic doc trees of growing size (FILES files with LINKS
+valid links each, plus one broken link per file) and runs
+scripts/check-markdown-links.py over each in a fresh interpreter with the
+streaming JSON lines reporter, reporting peak RSS (ru_maxrss) and time to
+first finding. Valid links are only counted, so with --no-cache peak RSS
+should stay nearly flat as the number of links grows.
+
+The default configuration keeps the link cache (every link of every
+file) in memory, so it is measured too: once with no cache file (cold)
+and once reading the cache the cold run wrote (warm). Its peak RSS grows
+with the number of links, by the size of the compact link tuples.
+
+Usage:
+    python3 tests/benchmarks/markdown-links-memory-benchmark.py [--files 250,1000,4000] [--links 100]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.abspath(os.path.join(BENCH_DIR, "..", ".."))
+SCRIPT = os.path.join(PROJECT_ROOT, "scripts", "check-markdown-links.py")
+
+MEASURE = """
+import resource, runpy, sys
+sys.argv = [{script!r}, '--dir', 'docs', '--format', 'jsonl', '--jobs', '1'] + {extra!r}
+try:
+    runpy.run_path({script!r}, run_name='__main__')
+except SystemExit:
+    pass
+print(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss, file=sys.stderr)
+"""
+# (label, extra arguments); cold writes the cache file that warm reads
+MODES = (
+    ("no cache", ["--no-cache"]),
+    ("cold cache", []),
+    ("warm cache", []),
+)
+
+
+def write_tree(root: str, files: int, links: int):
+    """docs/sNN/page-N.md, each linking to its neighbours and one missing page."""
+    for n in range(files):
+        section = os.path.join(root, "docs", f"s{n // 100:02d}")
+        os.makedirs(section, exist_ok=True)
+        with open(os.path.join(section, f"page-{n}.md"), "w", encoding="utf-8") as f:
+            f.write(f"# Page {n}\n\n## Details\n\n")
+            for i in range(links):
+                f.write(f"See [page {i}](page-{(n // 100) * 100 + i % 100}.md) for more context on item {i}.\n")
+            f.write(f"\nAlso [missing](missing-{n}.md).\n")
+
+
+def run(root: str, extra: list) -> tuple:
+    """Returns (peak RSS KB, seconds to first finding, total seconds, lines)."""
+    start = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, "-c", MEASURE.format(script=SCRIPT, extra=extra)],
+        cwd=root, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True,
+    )
+    first = None
+    lines = 0
+    for _ in proc.stdout:
+        first = first or time.perf_counter() - start
+        lines += 1
+    rss = int(proc.stderr.read().split()[-1])
+    proc.wait()
+    return rss, first, time.perf_counter() - start, lines
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark link checker memory use")
+    parser.add_argument("--files", default="250,1000,4000", help="comma-separated tree sizes")
+    parser.add_argument("--links", type=int, default=100, help="valid links per file")
+    args = parser.parse_args()
+
+    print(f"{'files':>7} {'links':>9} {'mode':<11} {'peak RSS MB':>12} {'first s':>9} {'total s':>9}")
+    print("-" * 62)
+
+    for files in (int(n) for n in args.files.split(",")):
+        with tempfile.TemporaryDirectory() as root:
+            write_tree(root, files, args.links)
+            for mode, extra in MODES:
+                rss, first, total, _ = run(root, extra)
+                print(f"{files:>7} {files * (args.links + 1):>9} {mode:<11} {rss / 1024:>12.1f} "
+                      f"{first:>9.2f} {total:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
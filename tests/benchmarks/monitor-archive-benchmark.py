@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Monitor Archive Benchmark
+
+Writes the same synthetic hook events (Pre/PostToolUse pairs spread over
+many sessions) once as NDJSON, one JSON envelope per line as the spool
+stores them, and once through lib/archive.py (MessagePack records in
+rotated segments with a sidecar index). Reports the append cost per
+event, bytes on disk, and the time (best of READS) to read back one
+session: a full decode of every NDJSON line against
+ArchiveReader.events(), which decodes only the indexed records of that
+session. Checks that every archived event reads back identical to what
+was written.
+
+Usage:
+    python3 tests/benchmarks/monitor-archive-benchmark.py [--events 20000] [--sessions 50]
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+HOOKS_DIR = os.path.abspath(os.path.join(BENCH_DIR, "..", "..", ".aiox-core", "monitor", "hooks"))
+READS = 3
+
+
+def synthetic_events(count: int, sessions: int) -> list:
+    """(type, data) of count events, sessions interleaved."""
+    events = []
+    for n in range(count):
+        session_id = f"session-{n % sessions:04d}"
+        tool_use_id = f"toolu_{n // 2:06d}"
+        common = {
+            "session_id": session_id, "cwd": "/repo", "project": "aios-core",
+            "aiox_agent": "dev", "aiox_story_id": "1.2", "tool_name": "Read", "tool_use_id": tool_use_id,
+        }
+        if n % 2 == 0:
+            events.append(("PreToolUse", dict(common, tool_input={"file_path": f"/repo/src/module_{n % 40}.py"})))
+        else:
+            events.append(("PostToolUse", dict(
+                common,
+                tool_response={"content": f"def f_{n}():\n    return {n}\n" * 8, "truncated": False},
+                duration_ms=n % 300,
+            )))
+    return events
+
+
+def best_of(runs: int, read):
+    """Fastest of runs calls of read, with its result."""
+    best = None
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = read()
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    return best, result
+
+
+def disk_bytes(path: str) -> int:
+    if os.path.isfile(path):
+        return os.path.getsize(path)
+    return sum(os.path.getsize(os.path.join(path, name)) for name in os.listdir(path))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the binary event archive against NDJSON")
+    parser.add_argument("--events", type=int, default=20000, help="events to write")
+    parser.add_argument("--sessions", type=int, default=50, help="sessions the events are spread over")
+    args = parser.parse_args()
+
+    sys.path.insert(0, HOOKS_DIR)
+    from lib.archive import ArchiveReader, archive_event
+
+    events = synthetic_events(args.events, args.sessions)
+    target = f"session-{args.sessions // 2:04d}"
+    expected = [(event_type, data) for event_type, data in events if data["session_id"] == target]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        ndjson_path = os.path.join(tmp, "events.ndjson")
+        archive_dir = os.path.join(tmp, "archive")
+
+        # Append one event at a time, each with its own open, like a hook process
+        start = time.perf_counter()
+        for event_type, data in events:
+            with open(ndjson_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps({"type": event_type, "timestamp": 0, "data": data}) + "\n")
+        ndjson_write = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for event_type, data in events:
+            if not archive_event(event_type, data, archive_dir):
+                sys.exit("archive_event failed")
+        archive_write = time.perf_counter() - start
+
+        def read_ndjson():
+            with open(ndjson_path, encoding="utf-8") as f:
+                return [event for event in map(json.loads, f) if event["data"]["session_id"] == target]
+
+        reader = ArchiveReader(archive_dir)
+        ndjson_read, ndjson_found = best_of(READS, read_ndjson)
+        archive_read, archive_found = best_of(READS, lambda: list(reader.events(session_id=target)))
+
+        start = time.perf_counter()
+        every = list(reader.events())
+        archive_full = time.perf_counter() - start
+
+        rows = [
+            ("NDJSON", disk_bytes(ndjson_path), ndjson_write, ndjson_read, len(ndjson_found)),
+            ("archive", disk_bytes(archive_dir), archive_write, archive_read, len(archive_found)),
+        ]
+        segments = len(reader.segments())
+
+    print(f"{args.events} events over {args.sessions} sessions; archive: {segments} segments")
+    print(f"{'format':<8} {'MB':>7} {'append us/event':>16} {'session read ms':>16} {'events':>7}")
+    print("-" * 58)
+    for label, size, write, read, found in rows:
+        print(f"{label:<8} {size / 1024 / 1024:>7.2f} {write / args.events * 1e6:>16.1f} "
+              f"{read * 1000:>16.2f} {found:>7}")
+    print(f"Archive full scan: {archive_full * 1000:.1f} ms for {len(every)} events")
+    print(f"Session read speedup: {ndjson_read / archive_read:.1f}x, "
+          f"size: {1 - rows[1][1] / rows[0][1]:.1%} smaller")
+
+    got = [(event["type"], event["data"]) for event in archive_found]
+    everything = [(event["type"], event["data"]) for event in every]
+    ok = got == expected and everything == events
+    print(f"Round trip: {'all events identical' if ok else 'MISMATCH'}")
+    if not ok:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
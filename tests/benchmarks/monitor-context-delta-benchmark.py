@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Monitor Context Delta Benchmark
+
+Replays the same synthetic session (UserPromptSubmit, then Pre/PostToolUse
+pairs, with AIOX_STORY_ID changing halfway) through the real hooks twice,
+in-process against the reference monitor server: once with
+AIOX_MONITOR_CONTEXT_DELTA=0 (every event carries the full context
+fields) and once with the session context delta encoding. Reports bytes
+received by the server per event for each run, and checks that every
+event the server decoded from the delta run equals its counterpart from
+the full run (lossless round trip).
+
+Usage:
+    python3 tests/benchmarks/monitor-context-delta-benchmark.py [--tools 200]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import urllib.request
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+MONITOR_DIR = os.path.abspath(os.path.join(BENCH_DIR, "..", "..", ".aiox-core", "monitor"))
+HOOKS_DIR = os.path.join(MONITOR_DIR, "hooks")
+SERVER = os.path.join(MONITOR_DIR, "server", "server.py")
+
+# Fields that legitimately differ between the two runs
+VOLATILE = ("session_id", "duration_ms", "pre_tool_use")
+
+
+def session_events(session_id: str, tools: int) -> list:
+    """(hook module, payload, story) of one session."""
+    events = [("user_prompt_submit", {"session_id": session_id, "user_prompt": "@dev implement the parser"}, "1.1")]
+    for n in range(tools):
+        story = "1.1" if n < tools // 2 else "1.2"
+        tool_input = {"file_path": f"/repo/src/module_{n % 20}.py"}
+        tool_use_id = f"toolu_{n:04d}"
+        events.append(("pre_tool_use", {
+            "session_id": session_id, "tool_name": "Read", "tool_input": tool_input, "tool_use_id": tool_use_id,
+        }, story))
+        events.append(("post_tool_use", {
+            "session_id": session_id, "tool_name": "Read", "tool_input": tool_input, "tool_use_id": tool_use_id,
+            "tool_response": {"content": f"line {n}\n" * 5},
+        }, story))
+    events.append(("stop", {"session_id": session_id}, "1.2"))
+    return events
+
+
+def get_json(url: str):
+    with urllib.request.urlopen(url, timeout=5) as resp:
+        return json.loads(resp.read())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark session context delta encoding")
+    parser.add_argument("--tools", type=int, default=200, help="tool calls in the session")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        proc = subprocess.Popen(
+            [sys.executable, SERVER, "--port", "0", "--db", os.path.join(tmp, "events.db")],
+            stderr=subprocess.PIPE, text=True,
+        )
+        url = proc.stderr.readline().split("listening on ", 1)[1].split()[0]
+
+        # Module-level settings of the hooks' lib are read at import time
+        os.environ["AIOX_MONITOR_URL"] = url
+        os.environ["AIOX_CACHE_DIR"] = os.path.join(tmp, "cache")
+        sys.path.insert(0, HOOKS_DIR)
+        import importlib
+        hooks = {name: importlib.import_module(name)
+                 for name in ("user_prompt_submit", "pre_tool_use", "post_tool_use", "stop")}
+
+        cwd = os.path.join(tmp, "repo")
+        os.makedirs(os.path.join(cwd, ".git"))
+
+        rows = []
+        for label, session_id, delta in (("full context", "full", "0"), ("delta encoded", "delta", "1")):
+            before = get_json(url + "/health")
+            for module, payload, story in session_events(session_id, args.tools):
+                env = {
+                    "AIOX_AGENT": "dev", "AIOX_STORY_ID": story, "AIOX_TASK_ID": "develop-story",
+                    "AIOX_MONITOR_SAMPLING": "0", "AIOX_MONITOR_CONTEXT_DELTA": delta,
+                }
+                hooks[module].handle(dict(payload, cwd=cwd), env)
+            after = get_json(url + "/health")
+            rows.append((label, after["accepted"] - before["accepted"], after["bytes_in"] - before["bytes_in"]))
+
+        recent = get_json(url + f"/events/recent?limit={4 * args.tools + 10}")
+        stats = get_json(url + "/health")
+        proc.terminate()
+        proc.wait(timeout=30)
+
+    print(f"{args.tools} tool calls per session, story changes halfway")
+    print(f"{'run':<16} {'events':>7} {'bytes':>9} {'bytes/event':>12}")
+    print("-" * 47)
+    for label, events, size in rows:
+        print(f"{label:<16} {events:>7} {size:>9} {size / events:>12.1f}")
+    print(f"Saved: {1 - rows[1][2] / rows[0][2]:.1%} of the bytes")
+
+    runs = {"full": [], "delta": []}
+    for event in recent:
+        runs[event["data"]["session_id"]].append(event)
+    mismatches = 0
+    for full, delta in zip(runs["full"], runs["delta"]):
+        strip = [{k: v for k, v in e["data"].items() if k not in VOLATILE} for e in (full, delta)]
+        if full["type"] != delta["type"] or strip[0] != strip[1]:
+            mismatches += 1
+            if mismatches == 1:
+                print(f"First mismatch:\n  full:  {strip[0]}\n  delta: {strip[1]}")
+    compared = min(len(runs["full"]), len(runs["delta"]))
+    print(f"Round trip: {compared - mismatches} of {compared} events identical after decoding "
+          f"(unresolved context ids: {stats['unresolved_contexts']})")
+    if mismatches or len(runs["full"]) != len(runs["delta"]) or stats["unresolved_contexts"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Monitor Hook Import Budget
+
+Imports every hook entry point under `python -X importtime` and fails when
+a hook's cumulative import time exceeds the budget, or when a module that
+must stay off the hook hot path (urllib.request, http.client, email, ssl,
+pathlib, typing) gets imported.
+
+Each hook is measured several times and the fastest run is kept, so the
+first run compiling .pyc files does not count against the budget.
+
+Runs in the jest suite through tests/performance/monitor-hook-import-budget.test.js.
+
+Usage:
+    python3 tests/benchmarks/monitor-hook-import-budget.py [--budget-ms 30] [--runs 5]
+    python3 tests/benchmarks/monitor-hook-import-budget.py --json   # One result object per hook
+
+Exit codes:
+    0 - All hooks within budget
+    1 - A hook exceeded the budget or imported a forbidden module
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+HOOKS_DIR = os.path.abspath(os.path.join(BENCH_DIR, "..", "..", ".aiox-core", "monitor", "hooks"))
+
+HOOK_MODULES = [
+    "pre_tool_use",
+    "post_tool_use",
+    "user_prompt_submit",
+    "stop",
+    "subagent_stop",
+    "notification",
+    "pre_compact",
+    "hook_client",
+]
+
+FORBIDDEN = ("urllib.request", "http.client", "email", "ssl", "pathlib", "typing")
+DEFAULT_BUDGET_MS = float(os.environ.get("AIOX_HOOK_IMPORT_BUDGET_MS", "30"))
+
+
+def measure(module: str) -> tuple[float, list[tuple[str, int]]]:
+    """
+    Import a hook module in a fresh interpreter.
+
+    Returns:
+        (cumulative import time in ms, [(imported module, cumulative us)])
+    """
+    code = f"import sys; sys.path.insert(0, {HOOKS_DIR!r}); import {module}"
+    # Installed hooks run with cached bytecode; without it every run would
+    # count compiling the lib modules from source
+    env = {key: value for key, value in os.environ.items() if key != "PYTHONDONTWRITEBYTECODE"}
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True, text=True, check=True, env=env,
+    )
+
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|", 2)
+        depth = (len(name) - len(name.lstrip())) // 2
+        rows.append((name.strip(), int(cumulative), depth))
+
+    # importtime prints children before their parent: the hook's imports are
+    # the rows between the previous top-level import and the hook itself.
+    end = max(i for i, (name, _, depth) in enumerate(rows) if name == module and depth == 0)
+    start = end
+    while start > 0 and rows[start - 1][2] > 0:
+        start -= 1
+
+    imported = [(name, cumulative) for name, cumulative, _ in rows[start:end + 1]]
+    return rows[end][1] / 1000, imported
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check hook import time against a budget")
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--json", action="store_true", help="Output as JSON")
+    args = parser.parse_args()
+
+    failed = False
+    results = []
+    if not args.json:
+        print(f"{'hook':<22} {'import ms':>10}  slowest imports")
+        print("-" * 78)
+
+    for module in HOOK_MODULES:
+        runs = [measure(module) for _ in range(args.runs)]
+        elapsed, imported = min(runs, key=lambda r: r[0])
+
+        forbidden = [
+            f for f in FORBIDDEN
+            if any(name == f or name.startswith(f + ".") for name, _ in imported)
+        ]
+        slowest = sorted((r for r in imported if r[0] != module), key=lambda r: -r[1])[:3]
+        over = elapsed > args.budget_ms
+        failed = failed or over or bool(forbidden)
+        results.append({
+            "hook": module, "import_ms": round(elapsed, 2), "budget_ms": args.budget_ms,
+            "over_budget": over, "forbidden": forbidden,
+        })
+        if args.json:
+            continue
+
+        detail = ", ".join(f"{name} {us / 1000:.1f}" for name, us in slowest)
+        status = ""
+        if over:
+            status = f"  OVER BUDGET ({args.budget_ms:.0f} ms)"
+        if forbidden:
+            status += f"  FORBIDDEN: {', '.join(forbidden)}"
+        print(f"{module:<22} {elapsed:>10.1f}  {detail}{status}")
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Monitor Hook Startup Benchmark
+
+Measures the wall time Claude waits per hook invocation: the regular hook
+scripts (fresh interpreter + imports + send) against hook_client.py
+forwarding to a resident hook_host.py. Both deliver to the stand-in
+monitor server.
+
+Usage:
+    python3 tests/benchmarks/monitor-hook-startup-benchmark.py [--iterations 30] [--hooks pre_tool_use,stop]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+HOOKS_DIR = os.path.abspath(os.path.join(BENCH_DIR, "..", "..", ".aiox-core", "monitor", "hooks"))
+
+sys.path.insert(0, BENCH_DIR)
+sys.path.insert(0, HOOKS_DIR)
+
+from monitor_stub import StubMonitorServer
+from lib.hook_protocol import HOOK_MODULES
+
+PAYLOAD = json.dumps({
+    "session_id": "3f2b9c1e-5d4a-4f8e-9b7c-2a1d0e6f8c3b",
+    "cwd": HOOKS_DIR,
+    "tool_name": "Read",
+    "tool_input": {"file_path": os.path.join(HOOKS_DIR, "stop.py")},
+    "user_prompt": "@dev implement the story",
+}).encode("utf-8")
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def time_command(argv: list[str], env: dict, iterations: int) -> list[float]:
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        subprocess.run(argv, input=PAYLOAD, env=env, check=True)
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark hook startup latency")
+    parser.add_argument("--iterations", type=int, default=30)
+    parser.add_argument("--hooks", default=",".join(HOOK_MODULES.values()))
+    args = parser.parse_args()
+
+    selected = {t: m for t, m in HOOK_MODULES.items() if m in args.hooks.split(",")}
+
+    with StubMonitorServer() as server, tempfile.TemporaryDirectory() as tmp:
+        socket_path = os.path.join(tmp, "hook-host.sock")
+        env = dict(os.environ, AIOX_MONITOR_URL=server.url, AIOX_HOOK_HOST_SOCKET=socket_path)
+
+        rows = []
+        for event_type, module in selected.items():
+            script = os.path.join(HOOKS_DIR, f"{module}.py")
+            rows.append((f"{module}.py", time_command([sys.executable, script], env, args.iterations)))
+
+        host = subprocess.Popen([sys.executable, os.path.join(HOOKS_DIR, "hook_host.py")],
+                                env=env, stderr=subprocess.DEVNULL)
+        try:
+            while not os.path.exists(socket_path):
+                time.sleep(0.01)
+            client = os.path.join(HOOKS_DIR, "hook_client.py")
+            for event_type, module in selected.items():
+                rows.append((f"hook_client.py {event_type}",
+                             time_command([sys.executable, client, event_type], env, args.iterations)))
+        finally:
+            host.terminate()
+            host.wait()
+
+    print(f"{'invocation':<36} {'mean ms':>9} {'p50 ms':>9} {'p95 ms':>9}")
+    print("-" * 66)
+    for label, samples in rows:
+        print(f"{label:<36} {statistics.mean(samples):>9.1f} "
+              f"{percentile(samples, 50):>9.1f} {percentile(samples, 95):>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
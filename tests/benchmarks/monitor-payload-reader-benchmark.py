@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Monitor Payload Reader Benchmark
+
+Feeds PostToolUse payloads with 1, 10 and 100 MB tool results to a fresh
+interpreter and compares json.load(sys.stdin), the way the hooks used to
+read their input, with the streaming lib/json_stream.load_truncated().
+Reports parse time and peak RSS (ru_maxrss) per reader.
+
+Usage:
+    python3 tests/benchmarks/monitor-payload-reader-benchmark.py [--sizes 1,10,100] [--runs 3]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+HOOKS_DIR = os.path.abspath(os.path.join(BENCH_DIR, "..", "..", ".aiox-core", "monitor", "hooks"))
+
+# Realistic tool output: source lines with quotes, tabs and non-ASCII text
+LINE = '\tprint(f"processing {item!r} -> café")  # step \\ done\n'
+
+READERS = {
+    "json.load": "import json; data = json.load(sys.stdin)",
+    "load_truncated": (
+        f"sys.path.insert(0, {HOOKS_DIR!r}); "
+        "from lib.json_stream import load_truncated; data = load_truncated(sys.stdin.buffer)"
+    ),
+}
+
+MEASURE = """
+import resource, sys, time
+start = time.perf_counter_ns()
+{reader}
+elapsed = (time.perf_counter_ns() - start) / 1e6
+print(elapsed, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+"""
+
+
+def write_payload(path: str, size_mb: int) -> int:
+    """
+    Write a PostToolUse payload with a size_mb tool result.
+
+    The result is streamed to disk line by line: ru_maxrss survives exec,
+    so a large string in this process would inflate the readers' numbers.
+    """
+    head = json.dumps({
+        "session_id": "bench",
+        "cwd": BENCH_DIR,
+        "tool_name": "Bash",
+        "tool_input": {"command": "cat build.log"},
+    })
+    encoded_line = json.dumps(LINE)[1:-1]
+
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(head[:-1] + ', "tool_result": "')
+        for _ in range(size_mb * 1024 * 1024 // len(LINE)):
+            f.write(encoded_line)
+        f.write('"}')
+    return os.path.getsize(path)
+
+
+def run(reader: str, path: str) -> tuple[float, int]:
+    """Parse the payload file in a fresh interpreter. Returns (ms, peak RSS KB)."""
+    with open(path, "rb") as stdin:
+        result = subprocess.run(
+            [sys.executable, "-c", MEASURE.format(reader=reader)],
+            stdin=stdin, capture_output=True, text=True, check=True,
+        )
+    elapsed, rss = result.stdout.split()
+    return float(elapsed), int(rss)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark hook payload parsing")
+    parser.add_argument("--sizes", default="1,10,100", help="tool_result sizes in MB (default: 1,10,100)")
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    sizes = [int(size) for size in args.sizes.split(",")]
+    _, baseline_rss = run("pass", os.devnull)
+
+    print(f"Interpreter baseline RSS: {baseline_rss / 1024:.1f} MB")
+    print(f"{'payload':>10} {'reader':<16} {'parse ms':>10} {'peak RSS MB':>12}")
+    print("-" * 51)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for size_mb in sizes:
+            path = os.path.join(tmp, f"payload-{size_mb}mb.json")
+            file_size = write_payload(path, size_mb)
+
+            for label, reader in READERS.items():
+                runs = [run(reader, path) for _ in range(args.runs)]
+                elapsed = min(r[0] for r in runs)
+                rss = min(r[1] for r in runs)
+                print(f"{file_size / 1e6:>8.1f}MB {label:<16} {elapsed:>10.1f} {rss / 1024:>12.1f}")
+
+            os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Monitor Send Benchmark
+
+Compares delivery modes of lib/send_event.py against the stand-in monitor
+server: a new connection per event (the old urllib behaviour), keep-alive
+TCP and unix socket connections, and batched gzip NDJSON requests.
+Reports throughput (events/s) and bytes on the wire per event.
+
+Usage:
+    python3 tests/benchmarks/monitor-send-benchmark.py [--events 2000] [--batch 100]
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+HOOKS_DIR = os.path.join(BENCH_DIR, "..", "..", ".aiox-core", "monitor", "hooks")
+
+sys.path.insert(0, BENCH_DIR)
+sys.path.insert(0, HOOKS_DIR)
+
+from monitor_stub import StubMonitorServer, UnixStubMonitorServer
+from lib.send_event import Transport, send_ndjson
+from lib import send_event
+
+
+def make_events(count: int) -> list[dict]:
+    """Realistic PreToolUse/PostToolUse pairs."""
+    events = []
+    for i in range(count):
+        event_type = "PreToolUse" if i % 2 == 0 else "PostToolUse"
+        data = {
+            "session_id": "3f2b9c1e-5d4a-4f8e-9b7c-2a1d0e6f8c3b",
+            "hook_event_name": event_type,
+            "cwd": "/home/dev/projects/aiox-core",
+            "tool_name": "Read",
+            "tool_input": {"file_path": f"/home/dev/projects/aiox-core/docs/guide-{i % 40}.md"},
+            "project": "aiox-core",
+            "aiox_agent": "dev",
+        }
+        if event_type == "PostToolUse":
+            data["tool_result"] = ("# Guide\n\nSome markdown content for the guide. " * 20)[:1000]
+        events.append({"type": event_type, "timestamp": 1_760_000_000_000 + i, "data": data})
+    return events
+
+
+def run(label: str, server, events: list[dict], send) -> dict:
+    server.reset()
+    start = time.perf_counter()
+    send(events)
+    elapsed = time.perf_counter() - start
+    stats = server.stats()
+    assert stats["events"] == len(events), f"{label}: server received {stats['events']}/{len(events)}"
+    return {
+        "label": label,
+        "events_per_s": len(events) / elapsed,
+        "requests": stats["requests"],
+        "bytes_per_event": stats["wire_bytes"] / len(events),
+    }
+
+
+def post_each(transport: Transport, reconnect: bool = False):
+    def send(events):
+        for event in events:
+            body = json.dumps(event).encode("utf-8")
+            transport.post(body, {"Content-Type": "application/json"}, 5000)
+            if reconnect:
+                transport.close()
+    return send
+
+
+def post_batches(batch_size: int):
+    def send(events):
+        for i in range(0, len(events), batch_size):
+            lines = [json.dumps(e, separators=(",", ":")).encode("utf-8") for e in events[i:i + batch_size]]
+            send_ndjson(lines, timeout_ms=5000)
+    return send
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark monitor event delivery")
+    parser.add_argument("--events", type=int, default=2000)
+    parser.add_argument("--batch", type=int, default=100)
+    args = parser.parse_args()
+
+    events = make_events(args.events)
+    results = []
+
+    with StubMonitorServer() as server:
+        transport = Transport(server.url)
+        send_event._transport = transport
+        results.append(run("new connection per event", server, events, post_each(transport, reconnect=True)))
+        results.append(run("keep-alive TCP per event", server, events, post_each(transport)))
+        results.append(run(f"gzip NDJSON batch={args.batch}", server, events, post_batches(args.batch)))
+        transport.close()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        with UnixStubMonitorServer(os.path.join(tmp, "monitor.sock")) as server:
+            transport = Transport(server.url)
+            results.append(run("keep-alive unix per event", server, events, post_each(transport)))
+            transport.close()
+
+    print(f"{'mode':<28} {'events/s':>12} {'requests':>10} {'bytes/event':>12}")
+    print("-" * 65)
+    for r in results:
+        print(f"{r['label']:<28} {r['events_per_s']:>12.0f} {r['requests']:>10} {r['bytes_per_event']:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
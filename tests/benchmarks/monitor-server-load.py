@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+Monitor Server Load Generator
+
+Starts .aiox-core/monitor/server/server.py on a free port with a fresh
+database and drives it with CLIENTS threads, each holding one keep-alive
+connection through the hooks' own transport (lib/send_event.Transport),
+while SUBSCRIBERS SSE clients read /events/stream. One phase posts single
+JSON events (what a hook sends), one posts gzip NDJSON batches (what the
+flusher sends). Reports sustained events/s and p50/p99 ingest latency
+(request sent to 2xx received) per phase.
+
+Afterwards checks that every SSE subscriber received every event and,
+after a clean shutdown, that SQLite holds every accepted event.
+
+Usage:
+    python3 tests/benchmarks/monitor-server-load.py [--clients 8] [--duration 5] [--batch 100] [--subscribers 4]
+"""
+
+import argparse
+import gzip
+import json
+import os
+import socket
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+MONITOR_DIR = os.path.abspath(os.path.join(BENCH_DIR, "..", "..", ".aiox-core", "monitor"))
+SERVER = os.path.join(MONITOR_DIR, "server", "server.py")
+sys.path.insert(0, os.path.join(MONITOR_DIR, "hooks"))
+
+from lib.send_event import GZIP_LEVEL, Transport, build_event  # noqa: E402
+
+TIMEOUT_MS = 10000
+
+
+def make_event(client: int, n: int) -> dict:
+    """A PreToolUse event shaped like the hooks' enriched output."""
+    return build_event("PreToolUse", {
+        "session_id": f"session-{client}",
+        "tool_name": "Read",
+        "tool_input": {"file_path": f"/repo/src/module_{n % 50}.py"},
+        "cwd": "/repo",
+        "project": "repo",
+        "aiox_agent": ("dev", "qa", "architect")[client % 3],
+        "aiox_story_id": f"story-{client % 4}",
+    })
+
+
+def start_server(db_path: str) -> tuple:
+    proc = subprocess.Popen(
+        [sys.executable, SERVER, "--port", "0", "--db", db_path],
+        stderr=subprocess.PIPE, text=True,
+    )
+    line = proc.stderr.readline()
+    if "listening on" not in line:
+        proc.kill()
+        sys.exit(f"Server failed to start: {line}{proc.stderr.read()}")
+    # "Monitor server listening on http://HOST:PORT (db: ...)"
+    url = line.split("listening on ", 1)[1].split()[0]
+    return proc, url
+
+
+def client(url: str, index: int, batch: int, deadline: float, latencies: list, counts: list):
+    transport = Transport(url)
+    sent = 0
+    n = 0
+    while time.perf_counter() < deadline:
+        events = [make_event(index, n + i) for i in range(batch)]
+        n += batch
+        if batch == 1:
+            body = json.dumps(events[0]).encode("utf-8")
+            headers = {"Content-Type": "application/json"}
+        else:
+            lines = b"\n".join(json.dumps(e, separators=(",", ":")).encode("utf-8") for e in events)
+            body = gzip.compress(lines + b"\n", compresslevel=GZIP_LEVEL)
+            headers = {"Content-Type": "application/x-ndjson", "Content-Encoding": "gzip"}
+
+        start = time.perf_counter_ns()
+        ok = transport.post(body, headers, TIMEOUT_MS)
+        latencies.append(time.perf_counter_ns() - start)
+        if ok:
+            sent += batch
+    transport.close()
+    counts[index] = sent
+
+
+class SSEReader(threading.Thread):
+    """
+    Counts the events received on /events/stream. Like a browser
+    EventSource, reconnects with Last-Event-ID when the server drops it
+    for lagging, and the server replays the gap from its ring buffer.
+    """
+
+    def __init__(self, url: str):
+        super().__init__(daemon=True)
+        host, port = url.split("://", 1)[1].rsplit(":", 1)
+        self.address = (host, int(port))
+        self.received = 0
+        self.last_id = 0
+        self.reconnects = 0
+        self.stopping = False
+        self.ready = threading.Event()
+
+    def run(self):
+        while not self.stopping:
+            try:
+                sock = socket.create_connection(self.address)
+            except OSError:
+                return
+            request = "GET /events/stream HTTP/1.1\r\nHost: monitor\r\nAccept: text/event-stream\r\n"
+            if self.last_id:
+                request += f"Last-Event-ID: {self.last_id}\r\n"
+            sock.sendall((request + "\r\n").encode("ascii"))
+            self.ready.set()
+            try:
+                for line in sock.makefile("rb"):
+                    if line.startswith(b"id: "):
+                        event_id = int(line[4:])
+                        if event_id > self.last_id:
+                            self.received += 1
+                            self.last_id = event_id
+            except OSError:
+                pass
+            sock.close()
+            self.reconnects += 1
+
+
+def percentile(values: list, pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))] / 1e6
+
+
+def health(url: str) -> dict:
+    import urllib.request
+
+    with urllib.request.urlopen(url + "/health", timeout=5) as resp:
+        return json.loads(resp.read())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the reference monitor server")
+    parser.add_argument("--clients", type=int, default=8, help="concurrent keep-alive connections")
+    parser.add_argument("--duration", type=float, default=5.0, help="seconds per phase")
+    parser.add_argument("--batch", type=int, default=100, help="events per request in the batch phase")
+    parser.add_argument("--subscribers", type=int, default=4, help="SSE clients reading the stream")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "events.db")
+        proc, url = start_server(db_path)
+        readers = [SSEReader(url) for _ in range(args.subscribers)]
+        for reader in readers:
+            reader.start()
+            reader.ready.wait()
+        time.sleep(0.1)
+
+        print(f"{args.clients} clients, {args.subscribers} SSE subscribers, {args.duration:g} s per phase")
+        print(f"{'phase':<20} {'events':>9} {'events/s':>10} {'req p50 ms':>11} {'req p99 ms':>11}")
+        print("-" * 65)
+
+        total = 0
+        for label, batch in (("single events", 1), (f"batches of {args.batch}", args.batch)):
+            latencies: list = []
+            counts = [0] * args.clients
+            start = time.perf_counter()
+            deadline = start + args.duration
+            threads = [
+                threading.Thread(target=client, args=(url, i, batch, deadline, latencies, counts))
+                for i in range(args.clients)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            elapsed = time.perf_counter() - start
+            sent = sum(counts)
+            total += sent
+            print(f"{label:<20} {sent:>9} {sent / elapsed:>10.0f} "
+                  f"{percentile(latencies, 50):>11.2f} {percentile(latencies, 99):>11.2f}")
+
+        # Let the subscribers catch up before shutting down
+        wait_until = time.perf_counter() + 10
+        while time.perf_counter() < wait_until and any(r.received < total for r in readers):
+            time.sleep(0.05)
+        stats = health(url)
+
+        for reader in readers:
+            reader.stopping = True
+        proc.terminate()
+        proc.wait(timeout=60)
+        with sqlite3.connect(db_path) as db:
+            stored = db.execute("SELECT COUNT(*) FROM events").fetchone()[0]
+
+    print()
+    print(f"SSE received per subscriber: {[r.received for r in readers]} "
+          f"(lagging disconnects: {stats['lagging_disconnects']}, "
+          f"resumed with Last-Event-ID: {sum(r.reconnects for r in readers) - len(readers)})")
+    print(f"SQLite rows: {stored} of {total} in {stats['store']['batches']} batches "
+          f"(dropped: {stats['store']['dropped']})")
+    if stored != total or any(r.received != total for r in readers):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Stand-in AIOX Monitor server for hook benchmarks.
+
+Accepts POST /events in both wire formats used by lib/send_event.py
+(single JSON event, gzip NDJSON batch) and counts requests, events and
+bytes on the wire. Responds with HTTP/1.1 keep-alive.
+
+Usage:
+    python3 tests/benchmarks/monitor_stub.py [--port 4001]
+    python3 tests/benchmarks/monitor_stub.py --unix /tmp/aiox-monitor.sock
+
+    from monitor_stub import StubMonitorServer
+    with StubMonitorServer() as server:
+        ...  # point AIOX_MONITOR_URL at server.url
+        print(server.stats())
+"""
+
+import argparse
+import gzip
+import http.server
+import json
+import os
+import socket
+import socketserver
+import threading
+
+
+class _Handler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        # Headers and body go out in separate writes; without this, Nagle
+        # plus delayed ACK stalls every keep-alive response by ~40 ms.
+        if self.connection.family != socket.AF_UNIX:
+            self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        body = self.rfile.read(length)
+        wire_bytes = len(self.requestline) + 2 + len(bytes(self.headers)) + length
+
+        if self.headers.get("Content-Encoding") == "gzip":
+            body = gzip.decompress(body)
+
+        if self.headers.get("Content-Type", "").startswith("application/x-ndjson"):
+            events = [json.loads(line) for line in body.splitlines() if line.strip()]
+        else:
+            events = [json.loads(body)]
+
+        self.server.record(events, wire_bytes)
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"{}")
+
+    def log_message(self, *args):
+        pass
+
+
+class _RecordingMixin:
+    """Counters shared by the TCP and unix socket stand-ins."""
+
+    daemon_threads = True
+
+    def _init_recording(self, keep_events: bool) -> None:
+        self.keep_events = keep_events
+        self._lock = threading.Lock()
+        self._thread = None
+        self.reset()
+
+    def record(self, events: list, wire_bytes: int) -> None:
+        with self._lock:
+            self.requests += 1
+            self.event_count += len(events)
+            self.wire_bytes += wire_bytes
+            if self.keep_events:
+                self.events.extend(events)
+
+    def reset(self) -> None:
+        with self._lock:
+            self.requests = 0
+            self.event_count = 0
+            self.wire_bytes = 0
+            self.events = []
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "events": self.event_count,
+                "wire_bytes": self.wire_bytes,
+            }
+
+    def __enter__(self):
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.shutdown()
+        self.server_close()
+
+
+class StubMonitorServer(_RecordingMixin, http.server.ThreadingHTTPServer):
+    """Threaded stand-in monitor server on TCP."""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, keep_events: bool = False):
+        super().__init__((host, port), _Handler)
+        self._init_recording(keep_events)
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+
+class UnixStubMonitorServer(_RecordingMixin, socketserver.ThreadingUnixStreamServer):
+    """Threaded stand-in monitor server on a unix domain socket."""
+
+    def __init__(self, socket_path: str, keep_events: bool = False):
+        if os.path.exists(socket_path):
+            os.remove(socket_path)
+        super().__init__(socket_path, _Handler)
+        self._init_recording(keep_events)
+
+    @property
+    def url(self) -> str:
+        return f"unix://{self.server_address}"
+
+    def server_close(self):
+        super().server_close()
+        if os.path.exists(self.server_address):
+            os.remove(self.server_address)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stand-in AIOX Monitor server")
+    parser.add_argument("--port", type=int, default=4001)
+    parser.add_argument("--unix", metavar="PATH", help="Listen on a unix domain socket instead")
+    args = parser.parse_args()
+
+    if args.unix:
+        server = UnixStubMonitorServer(args.unix)
+    else:
+        server = StubMonitorServer(port=args.port)
+    print(f"Stub monitor listening on {server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        print(json.dumps(server.stats()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,593 @@
+/**
+ * Markdown Link Checker
+ *
+ * Drives scripts/check-markdown-links.py over small fixture trees in a
+ * temp directory and checks its JSON report and exit code. Skipped when
+ * python3 is not installed.
+ *
+ * @see scripts/check-markdown-links.py
+ */
+
+const fs = require('fs');
+const os = require('os');
+const path = require('path');
+const { spawn, spawnSync } = require('child_process');
+
+const SCRIPT = path.join(__dirname, '..', '..', 'scripts', 'check-markdown-links.py');
+const PYTHON = process.env.PYTHON || 'python3';
+
+const hasPython = spawnSync(PYTHON, ['--version']).status === 0;
+const describeWithPython = hasPython ? describe : describe.skip;
+
+function writeFiles(root, files) {
+  for (const [rel, content] of Object.entries(files)) {
+    const file = path.join(root, rel);
+    fs.mkdirSync(path.dirname(file), { recursive: true });
+    fs.writeFileSync(file, content);
+  }
+}
+
+function runChecker(cwd, args) {
+  const run = spawnSync(PYTHON, [SCRIPT, '--jobs', '1', ...args], {
+    cwd,
+    encoding: 'utf8',
+    timeout: 30000,
+  });
+  if (run.error) {
+    throw run.error;
+  }
+  return run;
+}
+
+function git(cwd, args) {
+  const run = spawnSync('git', args, { cwd, encoding: 'utf8' });
+  if (run.error || run.status !== 0) {
+    throw run.error || new Error(`git ${args.join(' ')} failed: ${run.stderr}`);
+  }
+  return run.stdout;
+}
+
+function commit(cwd, message) {
+  const author = ['-c', 'user.name=test', '-c', 'user.email=test@example.com'];
+  git(cwd, [...author, 'commit', '-qam', message]);
+}
+
+function checkJson(cwd, args = []) {
+  const run = runChecker(cwd, ['--json', ...args]);
+  return { status: run.status, report: JSON.parse(run.stdout) };
+}
+
+/**
+ * Start --watch --poll in cwd. waitFor(pattern) resolves with the output
+ * up to the next match of pattern, consuming it.
+ */
+function startWatch(cwd) {
+  const child = spawn(PYTHON, [SCRIPT, '--watch', '--poll', '--jobs', '1'], {
+    cwd,
+    env: { ...process.env, PYTHONUNBUFFERED: '1' },
+  });
+  let output = '';
+  let consumed = 0;
+  child.stdout.on('data', (chunk) => {
+    output += chunk;
+  });
+  child.stderr.on('data', (chunk) => {
+    output += chunk;
+  });
+
+  function waitFor(pattern, timeoutMs = 10000) {
+    const deadline = Date.now() + timeoutMs;
+    return new Promise((resolve, reject) => {
+      const timer = setInterval(() => {
+        const match = pattern.exec(output.slice(consumed));
+        if (match) {
+          clearInterval(timer);
+          const end = consumed + match.index + match[0].length;
+          resolve(output.slice(consumed, end));
+          consumed = end;
+        } else if (Date.now() > deadline || child.exitCode !== null) {
+          clearInterval(timer);
+          reject(new Error(`timed out waiting for ${pattern}; output:\n${output}`));
+        }
+      }, 20);
+    });
+  }
+
+  function stop() {
+    return new Promise((resolve) => {
+      if (child.exitCode !== null) {
+        resolve(child.exitCode);
+        return;
+      }
+      child.on('exit', (code) => resolve(code));
+      child.kill('SIGINT');
+    });
+  }
+
+  return { waitFor, stop };
+}
+
+describeWithPython('check-markdown-links.py', () => {
+  let root;
+
+  beforeEach(() => {
+    root = fs.mkdtempSync(path.join(os.tmpdir(), 'aiox-md-links-'));
+  });
+
+  afterEach(() => {
+    fs.rmSync(root, { recursive: true, force: true });
+  });
+
+  describe('--jobs', () => {
+    test('reports the same as a sequential scan above the parallel threshold', () => {
+      const files = {};
+      for (let i = 0; i < 100; i++) {
+        const next = (i + 1) % 100;
+        const links = [`[next](../section-${next % 5}/page-${next}.md)`, `[self](#page-${i})`];
+        if (i % 7 === 0) {
+          links.push(`[gone](missing-${i}.md)`, `[anchor](../section-0/page-0.md#nope-${i})`);
+        }
+        files[`docs/section-${i % 5}/page-${i}.md`] = `# Page ${i}\n\n${links.join(' ')}\n`;
+      }
+      writeFiles(root, files);
+
+      const sequential = checkJson(root, ['--no-cache']);
+      const parallel = checkJson(root, ['--no-cache', '--jobs', '4']);
+
+      expect(sequential.report.summary).toMatchObject({
+        files_scanned: 100,
+        valid_links: 200,
+        broken_links: 15,
+        broken_anchors: 15,
+      });
+      expect(parallel).toEqual(sequential);
+
+      // A cache written by a parallel run serves a sequential one
+      checkJson(root, ['--jobs', '4']);
+      expect(checkJson(root, [])).toEqual(sequential);
+    });
+  });
+
+  describe('link cache', () => {
+    const cacheFile = () => path.join(root, '.cache', 'markdown-links.json');
+
+    test('re-parses edited files and re-checks targets of cached ones', () => {
+      writeFiles(root, {
+        'docs/a.md': '# A\n\n[b](b.md) [c](c.md)\n',
+        'docs/b.md': '# B\n\n[gone](gone.md)\n',
+      });
+
+      let { report } = checkJson(root);
+      expect(report.broken.map((b) => b.link)).toEqual(['c.md', 'gone.md']);
+      const cached = JSON.parse(fs.readFileSync(cacheFile(), 'utf8'));
+      expect(Object.keys(cached.files).sort()).toEqual(['docs/a.md', 'docs/b.md']);
+
+      // a.md is unchanged and served from the cache, but its target now exists
+      writeFiles(root, { 'docs/c.md': '# C\n', 'docs/b.md': '# B\n\n[a](a.md) [x](x.md)\n' });
+      ({ report } = checkJson(root));
+      expect(report.broken.map((b) => b.link)).toEqual(['x.md']);
+      expect(report.summary.files_scanned).toBe(3);
+
+      // Deleted files leave the cache
+      fs.rmSync(path.join(root, 'docs/b.md'));
+      ({ report } = checkJson(root));
+      expect(report.broken.map((b) => b.link)).toEqual(['b.md']);
+      const pruned = JSON.parse(fs.readFileSync(cacheFile(), 'utf8'));
+      expect(Object.keys(pruned.files).sort()).toEqual(['docs/a.md', 'docs/c.md']);
+    });
+
+    test.each([
+      ['corrupt', 'not json{'],
+      ['stale', JSON.stringify({ version: 1, files: { 'docs/a.md': {} } })],
+    ])('ignores a %s cache file and replaces it', (_, content) => {
+      writeFiles(root, {
+        'docs/a.md': '# A\n\n[gone](gone.md)\n',
+        '.cache/markdown-links.json': content,
+      });
+
+      const { status, report } = checkJson(root);
+
+      expect(status).toBe(1);
+      expect(report.summary.broken_links).toBe(1);
+      const cached = JSON.parse(fs.readFileSync(cacheFile(), 'utf8'));
+      expect(Object.keys(cached.files)).toEqual(['docs/a.md']);
+    });
+
+    test('--no-cache neither reads nor writes the cache', () => {
+      writeFiles(root, { 'docs/a.md': '# A\n\n[gone](gone.md)\n' });
+
+      checkJson(root, ['--no-cache']);
+
+      expect(fs.existsSync(path.join(root, '.cache'))).toBe(false);
+    });
+  });
+
+  describe('case mismatches', () => {
+    test('reports links that only match a file or directory in different case', () => {
+      writeFiles(root, {
+        'README.md': '# Readme\n',
+        'docs/Guide/Setup.md': '# Setup\n',
+        'docs/index.md': [
+          '# Index',
+          '',
+          '[exact](Guide/Setup.md) [dir](Guide/) [dots](./Guide/../Guide/Setup.md)',
+          '[up](../README.md) [anchor](Guide/Setup.md#setup)',
+          '[file](guide/setup.md) [ext](Guide/Setup.MD) [dir](guide/)',
+          '[up](../readme.md) [anchor](guide/Setup.md#setup)',
+          '',
+        ].join('\n'),
+      });
+
+      const { status, report } = checkJson(root, ['--no-cache']);
+
+      expect(status).toBe(1);
+      expect(report.summary).toMatchObject({ valid_links: 5, broken_links: 0, case_mismatches: 5 });
+      expect(report.case_mismatch.map(({ line, link, actual }) => [line, link, actual])).toEqual([
+        [5, 'guide/setup.md', 'docs/Guide/Setup.md'],
+        [5, 'Guide/Setup.MD', 'docs/Guide/Setup.md'],
+        [5, 'guide/', 'docs/Guide'],
+        [6, '../readme.md', 'README.md'],
+        [6, 'guide/Setup.md#setup', 'docs/Guide/Setup.md'],
+      ]);
+    });
+
+    test('reports a link with no match in any case as broken', () => {
+      writeFiles(root, {
+        'docs/index.md': '# Index\n\n[x](Setup.md)\n',
+        'docs/setup-guide.md': '# S\n',
+      });
+
+      const { report } = checkJson(root, ['--no-cache']);
+
+      expect(report.case_mismatch).toEqual([]);
+      expect(report.broken.map((b) => b.link)).toEqual(['Setup.md']);
+    });
+  });
+
+  describe('anchors', () => {
+    const target = [
+      '# Target',
+      '## Getting Started',
+      '## Usage',
+      '## Usage',
+      '## `code` & *emph* Ünïcode!',
+      '## Über uns',
+      '<a name="custom-spot"></a>',
+      '<div id="html-id"></div>',
+      '```',
+      '## Not A Heading',
+      '```',
+      '',
+    ].join('\n\n');
+
+    test.each([
+      ['a heading', 'target.md#getting-started'],
+      ['a heading, ignoring case', 'target.md#Getting-Started'],
+      ['the first of repeated headings', 'target.md#usage'],
+      ['a repeated heading', 'target.md#usage-1'],
+      ['a heading with markup and punctuation', 'target.md#code--emph-ünïcode'],
+      ['a percent-encoded heading', 'target.md#%C3%BCber-uns'],
+      ['an <a name> anchor', 'target.md#custom-spot'],
+      ['an id attribute', 'target.md#html-id'],
+      ['a heading in the same file', '#index'],
+      ['an empty fragment', 'target.md#'],
+    ])('accepts a link to %s', (_, link) => {
+      writeFiles(root, { 'docs/target.md': target, 'docs/index.md': `# Index\n\n[x](${link})\n` });
+
+      const { status, report } = checkJson(root, ['--no-cache']);
+
+      expect(report.broken_anchor).toEqual([]);
+      expect(status).toBe(0);
+    });
+
+    test.each([
+      ['a heading in a code fence', 'target.md#not-a-heading', 'not-a-heading'],
+      ['a repeated heading that is not there', 'target.md#usage-2', 'usage-2'],
+      ['a missing heading in the same file', '#nowhere', 'nowhere'],
+    ])('reports a link to %s', (_, link, anchor) => {
+      writeFiles(root, { 'docs/target.md': target, 'docs/index.md': `# Index\n\n[x](${link})\n` });
+
+      const { status, report } = checkJson(root, ['--no-cache']);
+
+      expect(status).toBe(1);
+      expect(report.broken_anchor).toMatchObject([{ file: 'docs/index.md', link, anchor }]);
+    });
+
+    test('checks the first #anchor link into a file served from the cache', () => {
+      writeFiles(root, {
+        'docs/target.md': target,
+        'docs/index.md': '# Index\n\n[x](target.md)\n',
+      });
+      expect(checkJson(root).status).toBe(0);
+
+      // target.md is unchanged, so only the cache knows its headings
+      writeFiles(root, {
+        'docs/index.md': '# Index\n\n[x](target.md#usage-1) [y](target.md#nope)\n',
+      });
+      const { report } = checkJson(root);
+
+      expect(report.summary.valid_links).toBe(1);
+      expect(report.broken_anchor.map((b) => b.anchor)).toEqual(['nope']);
+    });
+  });
+
+  describe('link syntax', () => {
+    test('finds inline, angle, reference and image links outside code and front matter', () => {
+      writeFiles(root, {
+        'docs/index.md': [
+          '---',
+          'title: [front](front.md)',
+          '---',
+          '# Index',
+          '',
+          '[a](a1.md) [b](b1.md "Title") [c](<c 1.md>) [d](d\\(1\\).md) [e](e(1).md)',
+          "[f [g]](f1.md) ![img](img1.png) [h]( h1.md ) [i](i1.md 'single') [j](j1.md (paren))",
+          '[r][ref] [Ref][] [REF] [x][undefined]',
+          '`[s](s1.md)` and ``[t](`t1.md`)`` but [u](u1.md) after code',
+          '[w](w1.md) *(coming soon)* [web](https://example.com) [mail](mailto:a@b.c)',
+          '',
+          '```',
+          '[fence](fence1.md)',
+          '```',
+          '',
+          '~~~md',
+          '[tilde](tilde1.md)',
+          '~~~',
+          '',
+          '[ref]: r1.md "Ref title"',
+          '[unused]: <unused 1.md>',
+          '',
+        ].join('\n'),
+      });
+
+      const { report } = checkJson(root, ['--no-cache']);
+
+      expect(report.broken.map(({ line, text, link }) => [line, text, link])).toEqual([
+        [6, 'a', 'a1.md'],
+        [6, 'b', 'b1.md'],
+        [6, 'c', 'c 1.md'],
+        [6, 'd', 'd(1).md'],
+        [6, 'e', 'e(1).md'],
+        [7, 'f [g]', 'f1.md'],
+        [7, 'img', 'img1.png'],
+        [7, 'h', 'h1.md'],
+        [7, 'i', 'i1.md'],
+        [7, 'j', 'j1.md'],
+        [8, 'r', 'r1.md'],
+        [8, 'Ref', 'r1.md'],
+        [8, 'REF', 'r1.md'],
+        [9, 'u', 'u1.md'],
+      ]);
+      expect(report.summary.coming_soon_links).toBe(1);
+      expect(report.coming_soon_destinations).toEqual(['w1.md']);
+    });
+
+    test('resolves percent-encoded targets', () => {
+      writeFiles(root, {
+        'docs/my guide.md': '# Guide\n',
+        'docs/sub/page.md': '# Page\n\n[a](../my%20guide.md) [b](<../my guide.md>)\n',
+      });
+
+      const { report } = checkJson(root, ['--no-cache']);
+
+      expect(report.summary.valid_links).toBe(2);
+      expect(report.broken).toEqual([]);
+    });
+  });
+
+  describe('report formats', () => {
+    beforeEach(() => {
+      writeFiles(root, {
+        'docs/a.md': '# A\n\n[gone](gone.md) [b](b.md) *(coming soon)* [anc](b.md#x)\n',
+        'docs/b.md': '# B\n\n[soon](later.md) *(coming soon)*\n',
+      });
+    });
+
+    test('jsonl streams one finding per line and ends with the summary', () => {
+      const run = runChecker(root, ['--format', 'jsonl', '--no-cache']);
+      const records = run.stdout.trim().split('\n').map((line) => JSON.parse(line));
+
+      expect(run.status).toBe(1);
+      expect(records.map((record) => [record.type, record.file, record.link])).toEqual([
+        ['broken', 'docs/a.md', 'gone.md'],
+        ['broken_anchor', 'docs/a.md', 'b.md#x'],
+        ['incorrect_marking', 'docs/a.md', 'b.md'],
+        ['coming_soon', 'docs/b.md', 'later.md'],
+        ['summary', undefined, undefined],
+      ]);
+      const { type: _, ...summary } = records[records.length - 1];
+      expect(summary).toEqual(checkJson(root, ['--no-cache']).report.summary);
+    });
+
+    test('sarif reports every finding against a declared rule', () => {
+      const run = runChecker(root, ['--format', 'sarif', '--no-cache']);
+      const sarif = JSON.parse(run.stdout);
+
+      expect(run.status).toBe(1);
+      expect(sarif.version).toBe('2.1.0');
+      const [{ tool, results }] = sarif.runs;
+      const rules = new Map(tool.driver.rules.map((rule) => [rule.id, rule]));
+      expect(results.map((result) => [result.ruleId, result.level])).toEqual([
+        ['broken', 'error'],
+        ['broken_anchor', 'error'],
+        ['incorrect_marking', 'warning'],
+      ]);
+      for (const result of results) {
+        expect(rules.get(result.ruleId).defaultConfiguration.level).toBe(result.level);
+        expect(result.locations[0].physicalLocation).toEqual({
+          artifactLocation: { uri: 'docs/a.md' },
+          region: { startLine: 3 },
+        });
+      }
+    });
+
+    test('--fix keeps its messages off a jsonl stream', () => {
+      const run = runChecker(root, ['--fix', '--format', 'jsonl', '--no-cache']);
+      const records = run.stdout.trim().split('\n').map((line) => JSON.parse(line));
+
+      expect(run.stderr).toContain('Fixed 1 broken links');
+      expect(run.stderr).toContain('Fixed 1 incorrect markings');
+      // The fixed broken link is now planned content; the fixed marking is valid
+      const links = (type) => records.filter((r) => r.type === type).map((r) => r.link);
+      expect(links('broken_anchor')).toEqual(['b.md#x']);
+      expect(links('coming_soon').sort()).toEqual(['gone.md', 'later.md']);
+      expect(records).toHaveLength(4);
+      expect(records[3].type).toBe('summary');
+      expect(records[3]).toMatchObject({ valid_links: 1, broken_links: 0, incorrect_markings: 0 });
+      expect(run.status).toBe(1);
+    });
+
+    test.each([
+      ['only coming-soon links', '# A\n\n[soon](later.md) *(coming soon)*\n', 0, 'PASS'],
+      ['an incorrect marking', '# A\n\n[b](b.md) *(coming soon)*\n', 2, 'FAIL'],
+      ['a broken link', '# A\n\n[gone](gone.md)\n', 1, 'FAIL'],
+    ])('exits as documented with %s', (_, content, status, verdict) => {
+      writeFiles(root, { 'docs/a.md': content, 'docs/b.md': '# B\n' });
+
+      const run = runChecker(root, ['--summary', '--no-cache']);
+
+      expect(run.status).toBe(status);
+      expect(run.stdout).toContain(`Link Check: ${verdict}`);
+    });
+  });
+
+  describe('--changed-since', () => {
+    const links = (report, category) => report[category].map((f) => `${f.file} -> ${f.link}`);
+
+    beforeEach(() => {
+      writeFiles(root, {
+        '.gitignore': '.cache/\nignored/\n',
+        'docs/a.md': '# A\n\n[b](b.md)\n',
+        'docs/b.md': '# B\n\n## Part\n',
+        'docs/c.md': '# C\n',
+        'docs/old.md': '# Old\n\n[nope](nope.md)\n',
+      });
+      git(root, ['init', '-q']);
+      git(root, ['add', '.']);
+      commit(root, 'docs');
+      // Populate the cache the reverse link graph is built from
+      checkJson(root);
+    });
+
+    test('checks every file without a cache yet', () => {
+      fs.rmSync(path.join(root, '.cache'), { recursive: true });
+
+      const run = runChecker(root, ['--json', '--changed-since', 'HEAD']);
+
+      expect(run.stderr).toContain('no link cache yet');
+      expect(links(JSON.parse(run.stdout), 'broken')).toEqual(['docs/old.md -> nope.md']);
+    });
+
+    test('rechecks files linking to a deleted file, including links the cache has not seen', () => {
+      // c.md starts linking to b.md in a commit made without running the checker
+      writeFiles(root, { 'docs/c.md': '# C\n\n[b](b.md#part)\n' });
+      commit(root, 'link');
+      fs.rmSync(path.join(root, 'docs/b.md'));
+
+      const { report } = checkJson(root, ['--changed-since', 'HEAD']);
+
+      expect(links(report, 'broken')).toEqual(['docs/a.md -> b.md', 'docs/c.md -> b.md#part']);
+      expect(report.summary.files_scanned).toBe(2);
+    });
+
+    test('rechecks files linking to either side of a rename', () => {
+      git(root, ['mv', 'docs/b.md', 'docs/renamed.md']);
+      writeFiles(root, { 'docs/old.md': '# Old\n\n[r](renamed.md#part)\n' });
+
+      const { report } = checkJson(root, ['--changed-since', 'HEAD']);
+
+      expect(links(report, 'broken')).toEqual(['docs/a.md -> b.md']);
+      expect(report.summary).toMatchObject({ files_scanned: 3, valid_links: 1 });
+    });
+
+    test('includes untracked files, but not ignored ones', () => {
+      writeFiles(root, {
+        'docs/new.md': '# New\n\n[gone](gone.md) [a](a.md)\n',
+        'docs/ignored/skip.md': '# Skip\n\n[gone](gone.md)\n',
+        'docs/nope.md': '# Nope\n',
+      });
+
+      const { report } = checkJson(root, ['--changed-since', 'HEAD']);
+
+      // nope.md is new, so old.md's link to it is rechecked and now valid
+      expect(links(report, 'broken')).toEqual(['docs/new.md -> gone.md']);
+      expect(report.summary).toMatchObject({ files_scanned: 3, valid_links: 2 });
+    });
+
+    test('falls back to checking every file when git fails', () => {
+      const run = runChecker(root, ['--json', '--changed-since', 'no-such-ref']);
+
+      expect(run.stderr).toContain('Warning: git diff no-such-ref failed');
+      expect(links(JSON.parse(run.stdout), 'broken')).toEqual(['docs/old.md -> nope.md']);
+    });
+  });
+
+  describe('--watch', () => {
+    let watcher;
+
+    afterEach(async () => {
+      if (watcher) {
+        await watcher.stop();
+        watcher = null;
+      }
+    });
+
+    test('prints only the findings each change adds or removes', async () => {
+      writeFiles(root, { 'docs/a.md': '# A\n\n[b](b.md)\n' });
+      watcher = startWatch(root);
+      await watcher.waitFor(/Watching docs\/ \(polling\)/);
+
+      writeFiles(root, { 'docs/b.md': '# B\n' });
+      let update = await watcher.waitFor(/ Broken: .*\n/);
+      expect(update).toMatch(/- broken +docs\/a\.md:3 -> b\.md/);
+      expect(update).toContain('Broken: 0 |');
+
+      writeFiles(root, { 'docs/c.md': '# C\n\n[x](x.md)\n' });
+      update = await watcher.waitFor(/ Broken: .*\n/);
+      expect(update).toMatch(/\+ broken +docs\/c\.md:3 -> x\.md/);
+      expect(update).not.toContain('docs/a.md');
+      expect(update).toContain('Broken: 1 |');
+
+      fs.rmSync(path.join(root, 'docs/b.md'));
+      update = await watcher.waitFor(/ Broken: .*\n/);
+      expect(update).toMatch(/\+ broken +docs\/a\.md:3 -> b\.md/);
+      expect(update).toContain('Broken: 2 |');
+
+      expect(await watcher.stop()).toBe(0);
+      watcher = null;
+      // The cache is saved on exit
+      expect(fs.existsSync(path.join(root, '.cache', 'markdown-links.json'))).toBe(true);
+    }, 30000);
+
+    test('refuses --fix', () => {
+      writeFiles(root, { 'docs/a.md': '# A\n' });
+
+      const run = runChecker(root, ['--watch', '--fix']);
+
+      expect(run.status).toBe(2);
+      expect(run.stderr).toContain('--watch cannot be combined with --fix');
+    });
+  });
+
+  describe('--fix', () => {
+    test('marks broken inline and reference links in a CRLF file, keeping CRLF', () => {
+      writeFiles(root, {
+        'docs/a.md': '# A\r\n\r\nSee [x][r1] and [y](gone.md).\r\n\r\n[r1]: nope.md\r\n',
+      });
+
+      const fix = runChecker(root, ['--fix', '--no-cache', '--summary']);
+      expect(fix.stdout).toContain('Fixed 2 broken links');
+
+      const content = fs.readFileSync(path.join(root, 'docs/a.md'), 'utf8');
+      expect(content).toBe(
+        '# A\r\n\r\nSee [x][r1] *(coming soon)* and [y](gone.md) *(coming soon)*.\r\n\r\n' +
+          '[r1]: nope.md\r\n'
+      );
+
+      const { status, report } = checkJson(root, ['--no-cache']);
+      expect(status).toBe(0);
+      expect(report.summary.broken_links).toBe(0);
+      expect(report.summary.coming_soon_links).toBe(2);
+    });
+  });
+});
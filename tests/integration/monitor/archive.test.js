@@ -0,0 +1,186 @@
+/**
+ * Monitor Hooks - Event Archive
+ *
+ * With AIOX_MONITOR_ARCHIVE=1 the hooks append every event in full to a
+ * local binary archive that archive_query.py reads back. Checks that the
+ * archive keeps what shaping cut from the sent event, the query filters,
+ * rotation and retention, and that records survive a lost index and a
+ * corrupt record is skipped. Skipped when python3 is not installed.
+ *
+ * @see .aiox-core/monitor/hooks/lib/archive.py
+ * @see .aiox-core/monitor/hooks/archive_query.py
+ */
+
+const fs = require('fs');
+const path = require('path');
+const { spawnSync } = require('child_process');
+const {
+  HOOKS_DIR,
+  PYTHON,
+  describeWithPython,
+  createRoot,
+  monitorEnv,
+  runHook,
+  spooledEvents,
+  pythonJson,
+} = require('./monitor-test-helpers');
+
+// Archive the [type, data] pairs from stdin into argv[1], with
+// SEGMENT_BYTES and MAX_ARCHIVE_BYTES set from argv[2] and argv[3]
+const WRITE = `
+import json, os, sys, time
+from lib import archive
+
+archive.SEGMENT_BYTES = int(sys.argv[2])
+archive.MAX_ARCHIVE_BYTES = int(sys.argv[3])
+written = 0
+for event_type, data in json.load(sys.stdin):
+    written += archive.archive_event(event_type, data, sys.argv[1])
+    # Distinct millisecond timestamps for the --since/--until checks
+    time.sleep(0.002)
+print(json.dumps({"written": written, "files": sorted(os.listdir(sys.argv[1]))}))
+`;
+
+function query(archiveDir, args = []) {
+  const script = path.join(HOOKS_DIR, 'archive_query.py');
+  const run = spawnSync(PYTHON, [script, '--dir', archiveDir, ...args], {
+    encoding: 'utf8',
+    timeout: 30000,
+  });
+  if (run.error) {
+    throw run.error;
+  }
+  expect(run.status).toBe(0);
+  return run.stdout;
+}
+
+function queryEvents(archiveDir, args) {
+  return query(archiveDir, args)
+    .split('\n')
+    .filter(Boolean)
+    .map((line) => JSON.parse(line));
+}
+
+function toolEvent(session, index) {
+  return [
+    index % 2 ? 'PostToolUse' : 'PreToolUse',
+    { session_id: session, tool_name: 'Bash', tool_input: { command: `step ${index}` } },
+  ];
+}
+
+describeWithPython('Monitor event archive', () => {
+  let root;
+  let archiveDir;
+
+  function write(events, { segmentBytes = 16 * 1024 * 1024, maxBytes = 512 * 1024 * 1024 } = {}) {
+    return pythonJson(WRITE, {
+      args: [archiveDir, String(segmentBytes), String(maxBytes)],
+      input: JSON.stringify(events),
+    });
+  }
+
+  beforeEach(() => {
+    root = createRoot();
+    archiveDir = path.join(root, 'archive');
+  });
+
+  afterEach(() => {
+    fs.rmSync(root, { recursive: true, force: true });
+  });
+
+  test('keeps the full event a hook shaped before sending it', () => {
+    const env = monitorEnv(root, {
+      AIOX_MONITOR_ARCHIVE: '1',
+      AIOX_MONITOR_ARCHIVE_DIR: archiveDir,
+      AIOX_MONITOR_BUDGETS: '*=1024',
+    });
+    const payload = {
+      session_id: 's1',
+      tool_name: 'Bash',
+      tool_input: { command: 'cat log' },
+      tool_response: { stdout: 'z'.repeat(3000), stderr: '' },
+      cwd: root,
+    };
+
+    runHook('post_tool_use', payload, env);
+
+    const [sent] = spooledEvents(root);
+    expect(sent.data.aiox_elided).toEqual({ 'tool_response.stdout': 3002 });
+    const [archived] = queryEvents(archiveDir, ['--session', 's1']);
+    expect(archived.type).toBe('PostToolUse');
+    expect(archived.data.tool_response.stdout).toBe('z'.repeat(3000));
+    expect(archived.data.aiox_elided).toBeUndefined();
+  });
+
+  test('filters by session, type and time range', () => {
+    const events = [];
+    for (let i = 0; i < 6; i++) {
+      events.push(toolEvent(i < 4 ? 'a' : 'b', i));
+    }
+    expect(write(events).written).toBe(6);
+
+    const all = queryEvents(archiveDir);
+    expect(all.map((event) => event.data)).toEqual(events.map(([, data]) => data));
+
+    const session = queryEvents(archiveDir, ['--session', 'a']);
+    expect(session.map((event) => event.data.tool_input.command)).toEqual([
+      'step 0',
+      'step 1',
+      'step 2',
+      'step 3',
+    ]);
+
+    const posts = queryEvents(archiveDir, ['--session', 'a', '--type', 'PostToolUse']);
+    expect(posts.map((event) => event.data.tool_input.command)).toEqual(['step 1', 'step 3']);
+
+    const since = String(all[2].timestamp);
+    const until = String(all[4].timestamp);
+    const range = queryEvents(archiveDir, ['--since', since, '--until', until]);
+    expect(range).toEqual(all.slice(2, 4));
+
+    expect(queryEvents(archiveDir, ['--session', 'nope'])).toEqual([]);
+    expect(query(archiveDir, ['--stats'])).toMatch(/1 segments, .* 6 events, 2 sessions/);
+  });
+
+  test('rotates full segments and reads them back in order', () => {
+    const events = Array.from({ length: 20 }, (_, i) => toolEvent('s1', i));
+
+    const { files } = write(events, { segmentBytes: 512 });
+
+    const segments = files.filter((name) => name.startsWith('segment-') && name.endsWith('.axr'));
+    expect(segments.length).toBeGreaterThan(2);
+    expect(files).toContain('active.axr');
+    const read = queryEvents(archiveDir).map((event) => event.data);
+    expect(read).toEqual(events.map(([, data]) => data));
+  });
+
+  test('removes the oldest segments past the retention limit', () => {
+    const events = Array.from({ length: 40 }, (_, i) => toolEvent('s1', i));
+
+    write(events, { segmentBytes: 512, maxBytes: 2048 });
+
+    const kept = queryEvents(archiveDir).map((event) => event.data);
+    expect(kept.length).toBeGreaterThan(0);
+    expect(kept.length).toBeLessThan(40);
+    // Whole segments go, oldest first: what is left is the newest events
+    expect(kept).toEqual(events.slice(40 - kept.length).map(([, data]) => data));
+  });
+
+  test('finds records without an index and skips a corrupt one', () => {
+    const events = Array.from({ length: 3 }, (_, i) => toolEvent('s1', i));
+    write(events);
+
+    // A crash between the record and the index write loses index entries
+    fs.rmSync(path.join(archiveDir, 'active.axi'));
+    expect(queryEvents(archiveDir, ['--session', 's1'])).toHaveLength(3);
+
+    // Flip the last byte of the last record's payload
+    const segment = path.join(archiveDir, 'active.axr');
+    const bytes = fs.readFileSync(segment);
+    bytes[bytes.length - 1] ^= 0xff;
+    fs.writeFileSync(segment, bytes);
+
+    const survivors = queryEvents(archiveDir).map((event) => event.data);
+    expect(survivors).toEqual(events.slice(0, 2).map(([, data]) => data));
+  });
+});
@@ -0,0 +1,124 @@
+/**
+ * Monitor Hooks - Session Context Delta Encoding
+ *
+ * The hooks send a session's context block (project and the AIOX_* fields)
+ * once and afterwards only its id; the monitor server's ContextDecoder
+ * rehydrates the events. Checks that hooks run with delta encoding,
+ * decoded by the reference decoder, give exactly the events sent with
+ * AIOX_MONITOR_CONTEXT_DELTA=0, including a context change mid-session
+ * and an agent detected from a prompt, and that a decoder that never saw
+ * the block keeps the id. Skipped when python3 is not installed.
+ *
+ * @see .aiox-core/monitor/hooks/lib/context.py
+ * @see .aiox-core/monitor/server/lib/context.py
+ */
+
+const fs = require('fs');
+const path = require('path');
+const {
+  SERVER_DIR,
+  describeWithPython,
+  createRoot,
+  monitorEnv,
+  runHook,
+  spooledEvents,
+  pythonJson,
+} = require('./monitor-test-helpers');
+
+// Decode NDJSON events from stdin with the server's ContextDecoder
+const DECODE = `
+import json, sys
+
+sys.path.insert(0, sys.argv[1])
+from lib.context import ContextDecoder
+
+decoder = ContextDecoder()
+events = [decoder.decode(json.loads(line)["data"]) for line in sys.stdin if line.strip()]
+print(json.dumps({"events": events, "unresolved": decoder.unresolved}))
+`;
+
+function decode(events) {
+  const input = events.map((event) => JSON.stringify(event)).join('\n');
+  return pythonJson(DECODE, { args: [SERVER_DIR], input });
+}
+
+describeWithPython('Monitor context delta encoding', () => {
+  let root;
+  let project;
+
+  // One session: a context change (AIOX_STORY_ID) after the prompt
+  const steps = [
+    ['pre_tool_use', { tool_name: 'Bash', tool_input: { command: 'ls' } }, {}],
+    ['user_prompt_submit', { user_prompt: 'hand this to @qa and @po' }, {}],
+    [
+      'pre_tool_use',
+      { tool_name: 'Bash', tool_input: { command: 'make' } },
+      { AIOX_STORY_ID: '7.1' },
+    ],
+    ['stop', {}, { AIOX_STORY_ID: '7.1' }],
+  ];
+
+  function runSession(name, extra) {
+    const run = path.join(root, name);
+    for (const [hook, fields, stepEnv] of steps) {
+      const env = monitorEnv(run, { HOME: root, AIOX_AGENT: 'dev', ...extra, ...stepEnv });
+      runHook(hook, { session_id: 's1', cwd: project, ...fields }, env);
+    }
+    return spooledEvents(run);
+  }
+
+  beforeEach(() => {
+    root = createRoot();
+    project = path.join(root, 'project');
+    fs.mkdirSync(project);
+  });
+
+  afterEach(() => {
+    fs.rmSync(root, { recursive: true, force: true });
+  });
+
+  test('sends each context block once per session, then only its id', () => {
+    const events = runSession('delta', {});
+
+    expect(events.map((event) => event.type)).toEqual([
+      'PreToolUse',
+      'UserPromptSubmit',
+      'PreToolUse',
+      'Stop',
+    ]);
+    const [first, second, third, fourth] = events.map((event) => event.data);
+    expect(first.context).toEqual({ project: 'project', aiox_agent: 'dev' });
+    expect(second.context).toBeUndefined();
+    expect(second.context_id).toBe(first.context_id);
+    expect(third.context).toEqual({ project: 'project', aiox_agent: 'dev', aiox_story_id: '7.1' });
+    expect(third.context_id).not.toBe(first.context_id);
+    expect(fourth.context).toBeUndefined();
+    expect(fourth.context_id).toBe(third.context_id);
+    for (const data of [first, second, third, fourth]) {
+      expect(data.project).toBeUndefined();
+    }
+  });
+
+  test('decodes to exactly the events sent without delta encoding', () => {
+    const delta = runSession('delta', {});
+    const full = runSession('full', { AIOX_MONITOR_CONTEXT_DELTA: '0' });
+
+    const decoded = decode(delta);
+
+    expect(decoded.unresolved).toBe(0);
+    expect(decoded.events).toEqual(full.map((event) => event.data));
+    expect(decoded.events[1]).toMatchObject({ aiox_agent: 'dev', aiox_agents: ['qa', 'po'] });
+  });
+
+  test('keeps an event whose block the decoder never saw as it is', () => {
+    // A decoder started after the first event, e.g. a restarted server
+    const delta = runSession('delta', {}).slice(1);
+
+    const decoded = decode(delta);
+
+    expect(decoded.unresolved).toBe(1);
+    expect(decoded.events[0]).toEqual(delta[0].data);
+    expect(decoded.events[1].aiox_story_id).toBe('7.1');
+    expect(decoded.events[2].context_id).toBeUndefined();
+  });
+});
@@ -0,0 +1,152 @@
+/**
+ * Monitor Hooks - Streaming JSON Reader
+ *
+ * lib/json_stream.py parses hook payloads through a bounded buffer and
+ * cuts long strings while reading. Checks that it agrees with json.loads()
+ * on everything it keeps, that cuts never split an escape, a UTF-8
+ * character or a surrogate pair (also across chunk boundaries), that
+ * nesting past MAX_DEPTH is truncated instead of overflowing the stack,
+ * and that a hook reading a huge payload spools the truncated event.
+ * Skipped when python3 is not installed.
+ *
+ * @see .aiox-core/monitor/hooks/lib/json_stream.py
+ */
+
+const fs = require('fs');
+const {
+  describeWithPython,
+  createRoot,
+  monitorEnv,
+  runHook,
+  spooledEvents,
+  pythonJson,
+} = require('./monitor-test-helpers');
+
+const MARKER = '...[truncated]';
+
+// Parse stdin with load_truncated(max_string=argv[1]), reading argv[2]
+// bytes per chunk; prints {"value": ...} or {"error": ...}
+const LOAD = `
+import json, sys
+from lib import json_stream
+
+json_stream.CHUNK_SIZE = int(sys.argv[2])
+try:
+    value = json_stream.load_truncated(sys.stdin.buffer, int(sys.argv[1]))
+except ValueError as e:
+    print(json.dumps({"error": str(e)}))
+else:
+    print(json.dumps({"value": value}))
+`;
+
+function load(input, { maxString = 4096, chunkSize = 65536 } = {}) {
+  return pythonJson(LOAD, { args: [String(maxString), String(chunkSize)], input });
+}
+
+describeWithPython('Monitor streaming JSON reader', () => {
+  const document = {
+    text: 'line\nbreak "quoted" back\\slash tab\t',
+    unicode: 'café – 日本語 😀',
+    numbers: [0, -1, 2.5, 1e21, -0.001],
+    literals: [true, false, null],
+    nested: { empty: {}, list: [], deeper: { a: [{ b: 'c' }] } },
+  };
+
+  test.each([[65536], [7], [1]])(
+    'agrees with JSON.parse when nothing is cut (%d-byte chunks)',
+    (chunkSize) => {
+      expect(load(JSON.stringify(document), { chunkSize })).toEqual({ value: document });
+    }
+  );
+
+  test('agrees with JSON.parse on \\u escapes split across chunks', () => {
+    const escaped = JSON.stringify(document).replace(/[^\x20-\x7e]/g, (c) =>
+      `\\u${c.charCodeAt(0).toString(16).padStart(4, '0')}`
+    );
+    expect(load(escaped, { chunkSize: 3 })).toEqual({ value: document });
+  });
+
+  test('keeps the head of a long string and marks the cut', () => {
+    const input = JSON.stringify({ out: 'x'.repeat(100000), short: 'kept' });
+    expect(load(input, { maxString: 10 })).toEqual({
+      value: { out: `xxxxxxxxxx${MARKER}`, short: 'kept' },
+    });
+  });
+
+  test.each([
+    ['UTF-8 characters', 'é'.repeat(50000), 'é'.repeat(5)],
+    ['escaped characters', '\\u00e9'.repeat(50000), 'é'.repeat(5)],
+    ['escaped surrogate pairs', '\\ud83d\\ude00'.repeat(50000), '😀'.repeat(5)],
+    ['escaped quotes', '\\"'.repeat(50000), '"'.repeat(5)],
+    ['escaped backslashes', '\\\\'.repeat(50000), '\\'.repeat(5)],
+  ])('cuts a long string of %s on a character boundary', (_, body, head) => {
+    for (const chunkSize of [65536, 5]) {
+      expect(load(`["${body}"]`, { maxString: 5, chunkSize })).toEqual({ value: [head + MARKER] });
+    }
+  });
+
+  test('truncates containers nested deeper than MAX_DEPTH', () => {
+    const depth = 100000;
+    const result = load(`{"a":${'['.repeat(depth)}1${']'.repeat(depth)},"b":2}`);
+
+    let value = result.value.a;
+    let levels = 1;
+    while (Array.isArray(value)) {
+      value = value[0];
+      levels += 1;
+    }
+    expect(levels).toBe(64);
+    expect(value).toBe(MARKER);
+    expect(result.value.b).toBe(2);
+  });
+
+  test.each([
+    ['an unterminated document', '{"a": [1, 2'],
+    ['mismatched brackets past MAX_DEPTH', `${'['.repeat(100)}}${']'.repeat(99)}`],
+    ['unbalanced nesting past MAX_DEPTH', '['.repeat(100000)],
+    ['a bad literal', '{"a": tru}'],
+    ['a missing colon', '{"a" 1}'],
+  ])('rejects %s with ValueError', (_, input) => {
+    expect(load(input).error).toMatch(/^Invalid JSON payload: /);
+  });
+
+  describe('in a hook', () => {
+    let root;
+
+    beforeEach(() => {
+      root = createRoot();
+    });
+
+    afterEach(() => {
+      fs.rmSync(root, { recursive: true, force: true });
+    });
+
+    test('spools a multi-megabyte tool result cut to AIOX_MONITOR_MAX_STRING', () => {
+      const env = monitorEnv(root, { AIOX_MONITOR_MAX_STRING: '100' });
+      const payload = {
+        session_id: 's1',
+        tool_name: 'Read',
+        tool_input: { file_path: '/tmp/big.log' },
+        tool_response: { content: 'y'.repeat(8 * 1024 * 1024) },
+        cwd: root,
+      };
+
+      runHook('post_tool_use', payload, env);
+
+      const [event] = spooledEvents(root);
+      expect(event.data.tool_response.content).toBe('y'.repeat(100) + MARKER);
+    });
+
+    test('survives a payload nested 100000 levels deep', () => {
+      const depth = 100000;
+      const nested = '['.repeat(depth) + ']'.repeat(depth);
+      const payload = `{"session_id":"s1","tool_name":"Bash","tool_input":${nested},"cwd":"${root}"}`;
+
+      const run = runHook('pre_tool_use', payload, monitorEnv(root));
+
+      expect(run.stderr).not.toMatch(/RecursionError/);
+      const [event] = spooledEvents(root);
+      expect(event.data.tool_name).toBe('Bash');
+    });
+  });
+});
@@ -0,0 +1,148 @@
+/**
+ * Monitor Hooks - Shared Test Helpers
+ *
+ * The monitor hooks are standard-library Python. These helpers run them
+ * (or short Python snippets against their lib/ modules) through spawnSync
+ * in an isolated temp directory: HOME, the cache and the spool all live
+ * under the test root, and AIOX_MONITOR_SPOOL=1 makes every hook append
+ * what it would send to spool/events.ndjson instead of the network.
+ */
+
+const fs = require('fs');
+const os = require('os');
+const path = require('path');
+const { spawnSync } = require('child_process');
+
+const MONITOR_DIR = path.join(__dirname, '..', '..', '..', '.aiox-core', 'monitor');
+const HOOKS_DIR = path.join(MONITOR_DIR, 'hooks');
+const SERVER_DIR = path.join(MONITOR_DIR, 'server');
+const BENCHMARKS_DIR = path.join(__dirname, '..', '..', 'benchmarks');
+const PYTHON = process.env.PYTHON || 'python3';
+
+const hasPython = spawnSync(PYTHON, ['--version']).status === 0;
+const describeWithPython = hasPython ? describe : describe.skip;
+
+/**
+ * Create a unique test root.
+ * @returns {string} - Absolute path to the new directory
+ */
+function createRoot() {
+  return fs.mkdtempSync(path.join(os.tmpdir(), 'aiox-monitor-'));
+}
+
+/**
+ * Environment for a hook process confined to root.
+ * AIOX_* variables of the test runner are dropped so they cannot leak
+ * into the enrichment context.
+ * @param {string} root - Test root
+ * @param {Object} extra - Variables to add or override
+ * @returns {Object} - Environment
+ */
+function monitorEnv(root, extra = {}) {
+  const env = {};
+  for (const [key, value] of Object.entries(process.env)) {
+    if (!key.startsWith('AIOX_')) {
+      env[key] = value;
+    }
+  }
+  return {
+    ...env,
+    HOME: root,
+    PYTHONDONTWRITEBYTECODE: '1',
+    AIOX_CACHE_DIR: path.join(root, 'cache'),
+    AIOX_MONITOR_SPOOL: '1',
+    AIOX_MONITOR_SPOOL_DIR: path.join(root, 'spool'),
+    // Nothing listens here: a hook that bypasses the spool fails fast
+    AIOX_MONITOR_URL: 'http://127.0.0.1:9',
+    ...extra,
+  };
+}
+
+function check(run) {
+  if (run.error) {
+    throw run.error;
+  }
+  if (run.status !== 0) {
+    throw new Error(`${PYTHON} exited with ${run.status}:\n${run.stderr}`);
+  }
+  return run;
+}
+
+/**
+ * Run one hook with a payload on stdin.
+ * @param {string} hook - Hook module name (e.g. 'pre_tool_use')
+ * @param {Object|string|Buffer} payload - Event data, serialized unless already raw
+ * @param {Object} env - Hook environment (see monitorEnv)
+ * @returns {Object} - spawnSync result
+ */
+function runHook(hook, payload, env) {
+  const raw = typeof payload === 'string' || Buffer.isBuffer(payload);
+  const input = raw ? payload : JSON.stringify(payload);
+  return check(
+    spawnSync(PYTHON, [path.join(HOOKS_DIR, `${hook}.py`)], {
+      input,
+      env,
+      encoding: 'utf8',
+      timeout: 30000,
+      maxBuffer: 64 * 1024 * 1024,
+    })
+  );
+}
+
+/**
+ * Events the hooks appended to the active spool file of root.
+ * @param {string} root - Test root
+ * @returns {Object[]} - Monitor envelopes ({type, timestamp, data})
+ */
+function spooledEvents(root) {
+  const file = path.join(root, 'spool', 'events.ndjson');
+  if (!fs.existsSync(file)) {
+    return [];
+  }
+  return fs
+    .readFileSync(file, 'utf8')
+    .split('\n')
+    .filter(Boolean)
+    .map((line) => JSON.parse(line));
+}
+
+/**
+ * Run a Python snippet with the hooks directory as working directory,
+ * so `from lib.x import y` resolves.
+ * @param {string} code - Python source
+ * @param {Object} options - {args, env, input}
+ * @returns {string} - stdout
+ */
+function runPython(code, { args = [], env = process.env, input } = {}) {
+  return check(
+    spawnSync(PYTHON, ['-c', code, ...args], {
+      cwd: HOOKS_DIR,
+      env: { ...env, PYTHONDONTWRITEBYTECODE: '1' },
+      input,
+      encoding: 'utf8',
+      timeout: 30000,
+      maxBuffer: 64 * 1024 * 1024,
+    })
+  ).stdout;
+}
+
+/**
+ * runPython() for snippets that print one JSON document.
+ */
+function pythonJson(code, options) {
+  return JSON.parse(runPython(code, options));
+}
+
+module.exports = {
+  HOOKS_DIR,
+  SERVER_DIR,
+  BENCHMARKS_DIR,
+  PYTHON,
+  describeWithPython,
+  createRoot,
+  monitorEnv,
+  runHook,
+  spooledEvents,
+  runPython,
+  pythonJson,
+};
@@ -0,0 +1,162 @@
+/**
+ * Monitor Hooks - Payload Shaping
+ *
+ * lib/shape.py shrinks each event to the byte budget of its event type and
+ * tool, keeping small fields whole and recording every cut under
+ * aiox_elided. Checks the budget lookup order of AIOX_MONITOR_BUDGETS,
+ * string, dict and list shaping, the cap on recorded paths, and a hook
+ * spooling a shaped PostToolUse event. Skipped when python3 is not
+ * installed.
+ *
+ * @see .aiox-core/monitor/hooks/lib/shape.py
+ */
+
+const fs = require('fs');
+const {
+  describeWithPython,
+  createRoot,
+  monitorEnv,
+  runHook,
+  spooledEvents,
+  pythonJson,
+} = require('./monitor-test-helpers');
+
+// shape_event(argv[1], <stdin>, {"AIOX_MONITOR_BUDGETS": argv[2]})
+const SHAPE = `
+import json, sys
+from lib.shape import shape_event
+
+data = json.load(sys.stdin)
+print(json.dumps(shape_event(sys.argv[1], data, {"AIOX_MONITOR_BUDGETS": sys.argv[2]})))
+`;
+
+// event_budget(argv[1], argv[2] or None, {"AIOX_MONITOR_BUDGETS": argv[3]})
+const BUDGET = `
+import json, sys
+from lib.shape import event_budget
+
+env = {"AIOX_MONITOR_BUDGETS": sys.argv[3]}
+print(json.dumps(event_budget(sys.argv[1], sys.argv[2] or None, env)))
+`;
+
+function shape(eventType, data, budgets) {
+  return pythonJson(SHAPE, { args: [eventType, budgets], input: JSON.stringify(data) });
+}
+
+// Compact encoded size, without the aiox_elided record (which is not budgeted)
+function encodedSize(data) {
+  const { aiox_elided: _, ...rest } = data;
+  return Buffer.byteLength(JSON.stringify(rest));
+}
+
+describeWithPython('Monitor payload shaping', () => {
+  test.each([
+    ['PostToolUse', 'Bash', '', 16384],
+    ['PreToolUse', 'Bash', '', 8192],
+    ['PreToolUse', 'Bash', '*=100', 100],
+    ['PreToolUse', 'Bash', '*=100,PreToolUse=200', 200],
+    ['PreToolUse', 'Bash', '*=100,PreToolUse=200,Bash=300', 300],
+    ['PreToolUse', 'Bash', '*=100,PreToolUse=200,Bash=300,PreToolUse:Bash=400', 400],
+    ['PreToolUse', 'Read', '*=100,PreToolUse=200,Bash=300,PreToolUse:Bash=400', 200],
+    ['Stop', '', 'Bash=300,Stop:Bash=400', 8192],
+    ['PreToolUse', 'Bash', 'PreToolUse=nope, Bash = 300 ,garbage', 300],
+  ])('budget of %s/%s with "%s" is %d', (eventType, toolName, budgets, expected) => {
+    expect(pythonJson(BUDGET, { args: [eventType, toolName, budgets] })).toBe(expected);
+  });
+
+  test('returns an event that fits unchanged, without aiox_elided', () => {
+    const data = { session_id: 's1', tool_name: 'Bash', tool_input: { command: 'ls' } };
+    expect(shape('PreToolUse', data, '*=1000')).toEqual(data);
+  });
+
+  test('cuts only the large fields, sharing the budget evenly between them', () => {
+    const data = {
+      session_id: 's1',
+      tool_name: 'Bash',
+      tool_input: { command: 'make', description: 'build' },
+      tool_response: { stdout: 'o'.repeat(3000), stderr: 'e'.repeat(5000), interrupted: false },
+    };
+
+    const shaped = shape('PostToolUse', data, 'PostToolUse:Bash=1024');
+
+    expect(shaped.session_id).toBe('s1');
+    expect(shaped.tool_input).toEqual(data.tool_input);
+    expect(shaped.tool_response.interrupted).toBe(false);
+    expect(shaped.tool_response.stdout).toMatch(/^o+\.\.\.\[truncated\]$/);
+    expect(shaped.tool_response.stderr).toMatch(/^e+\.\.\.\[truncated\]$/);
+    const { stdout, stderr } = shaped.tool_response;
+    expect(Math.abs(stdout.length - stderr.length)).toBeLessThanOrEqual(1);
+    expect(shaped.aiox_elided).toEqual({
+      'tool_response.stdout': 3002,
+      'tool_response.stderr': 5002,
+    });
+    expect(encodedSize(shaped)).toBeLessThanOrEqual(1024);
+    expect(encodedSize(shaped)).toBeGreaterThan(900);
+  });
+
+  test('keeps a prefix of a long list and counts the dropped tail', () => {
+    const todos = Array.from({ length: 200 }, (_, i) => ({
+      content: `task ${i}`,
+      status: 'pending',
+    }));
+    const data = { session_id: 's1', tool_name: 'TodoWrite', tool_input: { todos } };
+
+    const shaped = shape('PreToolUse', data, '*=1024');
+
+    const kept = shaped.tool_input.todos;
+    const tail = kept[kept.length - 1];
+    const count = kept.length - 1;
+    expect(kept.slice(0, -1)).toEqual(todos.slice(0, count));
+    expect(tail).toBe(`...[${200 - count} items elided]`);
+    expect(Object.keys(shaped.aiox_elided)).toEqual([`tool_input.todos[${count}:]`]);
+    expect(encodedSize(shaped)).toBeLessThanOrEqual(1024);
+  });
+
+  test('elides fields too large for a useful share and caps the recorded paths', () => {
+    const tool_input = {};
+    for (let i = 0; i < 40; i++) {
+      tool_input[`field${i}`] = 'x'.repeat(1000);
+    }
+    const data = { session_id: 's1', tool_name: 'Custom', tool_input };
+
+    const shaped = shape('PreToolUse', data, '*=1024');
+
+    expect(Object.values(shaped.tool_input)).toEqual(Array(40).fill('...[elided]'));
+    const recorded = Object.keys(shaped.aiox_elided).filter((key) => key !== '...');
+    expect(recorded).toHaveLength(32);
+    expect(shaped.aiox_elided['...']).toBe(8);
+    expect(shaped.aiox_elided['tool_input.field0']).toBe(1002);
+  });
+
+  describe('in a hook', () => {
+    let root;
+
+    beforeEach(() => {
+      root = createRoot();
+    });
+
+    afterEach(() => {
+      fs.rmSync(root, { recursive: true, force: true });
+    });
+
+    test('spools a PostToolUse event shaped to its AIOX_MONITOR_BUDGETS entry', () => {
+      const env = monitorEnv(root, { AIOX_MONITOR_BUDGETS: '*=100000,PostToolUse:Bash=1024' });
+      const payload = {
+        session_id: 's1',
+        tool_name: 'Bash',
+        tool_input: { command: 'make' },
+        tool_response: { stdout: 'o'.repeat(3000), stderr: '' },
+        cwd: root,
+      };
+
+      runHook('post_tool_use', payload, env);
+
+      const [event] = spooledEvents(root);
+      expect(event.data.tool_response.stderr).toBe('');
+      expect(event.data.aiox_elided).toEqual({ 'tool_response.stdout': 3002 });
+      // The session context is attached after shaping
+      const { context: _, context_id: __, ...shaped } = event.data;
+      expect(encodedSize(shaped)).toBeLessThanOrEqual(1024);
+    });
+  });
+});
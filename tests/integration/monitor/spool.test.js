@@ -0,0 +1,155 @@
+/**
+ * Monitor Spool and Flusher
+ *
+ * Hooks running with AIOX_MONITOR_SPOOL=1 append to a local spool that
+ * flusher.py drains to the monitor server. Checks the round trip from hook
+ * to server, resuming from the committed offset after a crash, and that a
+ * batch the server refuses for good is moved aside instead of retried.
+ * Skipped when python3 is not installed.
+ *
+ * @see .aiox-core/monitor/hooks/lib/spool.py
+ * @see .aiox-core/monitor/hooks/flusher.py
+ */
+
+const fs = require('fs');
+const path = require('path');
+const {
+  BENCHMARKS_DIR,
+  describeWithPython,
+  createRoot,
+  monitorEnv,
+  runHook,
+  spooledEvents,
+  pythonJson,
+} = require('./monitor-test-helpers');
+
+// Drain the spool in argv[1] until the flusher is idle. With a status in
+// argv[2] the server is faked to answer it; otherwise the events go to a
+// stub monitor server (tests/benchmarks/monitor_stub.py).
+const FLUSH = `
+import json, os, sys
+
+spool_dir, status = sys.argv[1], sys.argv[2]
+sys.path.insert(0, sys.argv[3])
+from monitor_stub import StubMonitorServer
+
+with StubMonitorServer(keep_events=True) as server:
+    os.environ["AIOX_MONITOR_URL"] = server.url
+    import flusher
+    from lib import spool
+
+    spool.SEGMENT_GRACE_S = 0
+    if status:
+        flusher.post_ndjson = lambda lines, timeout_ms: int(status)
+
+    reader = spool.SpoolReader(spool_dir)
+    worker = flusher.Flusher(reader)
+    while worker.step():
+        pass
+
+    print(json.dumps({
+        "events": server.events,
+        "delivered": worker.delivered,
+        "rejected": worker.rejected,
+        "failures": worker.failures,
+        "offsets": spool.SpoolReader(spool_dir)._offsets,
+        "files": sorted(name for name in os.listdir(spool_dir) if name != "offset.json"),
+    }))
+`;
+
+function event(index) {
+  return { type: 'PreToolUse', timestamp: 1000 + index, data: { session_id: 's1', index } };
+}
+
+function line(index) {
+  return `${JSON.stringify(event(index))}\n`;
+}
+
+describeWithPython('Monitor spool', () => {
+  let root;
+  let spoolDir;
+
+  function flush(status = '') {
+    return pythonJson(FLUSH, { args: [spoolDir, status, BENCHMARKS_DIR] });
+  }
+
+  beforeEach(() => {
+    root = createRoot();
+    spoolDir = path.join(root, 'spool');
+  });
+
+  afterEach(() => {
+    fs.rmSync(root, { recursive: true, force: true });
+  });
+
+  test('delivers spooled hook events in order and removes drained segments', () => {
+    const env = monitorEnv(root);
+    for (const command of ['ls', 'pwd', 'date']) {
+      const payload = { session_id: 's1', tool_name: 'Bash', tool_input: { command }, cwd: root };
+      runHook('pre_tool_use', payload, env);
+    }
+    const spooled = spooledEvents(root);
+    expect(spooled).toHaveLength(3);
+
+    const result = flush();
+
+    expect(result.events).toEqual(spooled);
+    expect(result.events.map((e) => e.data.tool_input.command)).toEqual(['ls', 'pwd', 'date']);
+    expect(result.delivered).toBe(3);
+    expect(result.files).toEqual([]);
+    expect(result.offsets).toEqual({});
+  });
+
+  test('resumes from the committed offset after a crash and drops a torn tail', () => {
+    // Crash after the first line was delivered and committed, while a
+    // hook was half-way through writing the last one
+    fs.mkdirSync(spoolDir);
+    fs.writeFileSync(
+      path.join(spoolDir, 'segment-1000.ndjson'),
+      line(1) + line(2) + line(3) + '{"type":"PreTool'
+    );
+    fs.writeFileSync(
+      path.join(spoolDir, 'offset.json'),
+      JSON.stringify({ 'segment-1000.ndjson': Buffer.byteLength(line(1)) })
+    );
+
+    const result = flush();
+
+    expect(result.events).toEqual([event(2), event(3)]);
+    expect(result.files).toEqual([]);
+  });
+
+  test('re-sends a batch whose offset was never committed', () => {
+    fs.mkdirSync(spoolDir);
+    fs.writeFileSync(path.join(spoolDir, 'segment-1000.ndjson'), line(1) + line(2));
+
+    expect(flush().events).toEqual([event(1), event(2)]);
+  });
+
+  test('moves a batch the server refuses for good aside and moves on', () => {
+    fs.mkdirSync(spoolDir);
+    fs.writeFileSync(path.join(spoolDir, 'segment-1000.ndjson'), line(1) + 'not json\n' + line(2));
+
+    const result = flush('400');
+
+    expect(result.rejected).toBe(2);
+    expect(result.failures).toBe(0);
+    expect(result.files).toEqual(['segment-1000.ndjson.rejected']);
+    const rejected = fs.readFileSync(path.join(spoolDir, 'segment-1000.ndjson.rejected'), 'utf8');
+    expect(rejected).toBe(line(1) + line(2));
+  });
+
+  test.each([[408], [429], [503]])('keeps a batch answered with %d for a retry', (status) => {
+    fs.mkdirSync(spoolDir);
+    fs.writeFileSync(path.join(spoolDir, 'segment-1000.ndjson'), line(1));
+
+    const result = flush(String(status));
+
+    expect(result.failures).toBe(1);
+    expect(result.rejected).toBe(0);
+    expect(result.files).toEqual(['segment-1000.ndjson']);
+    expect(result.offsets).toEqual({});
+
+    expect(flush().events).toEqual([event(1)]);
+  });
+});
@@ -0,0 +1,53 @@
+/**
+ * Import Budget for the Monitor Hooks
+ *
+ * Every hook is a fresh Python interpreter per Claude event, so import cost
+ * is paid on each tool call. Runs tests/benchmarks/monitor-hook-import-budget.py
+ * (python -X importtime, fastest of several runs) and fails when a hook
+ * exceeds the budget or imports a module that must stay off the hot path.
+ *
+ * Wall-clock timings depend on the runner, so the budget assertion only runs
+ * with AIOX_HOOK_IMPORT_TIMING=1. The budget defaults to 30 ms;
+ * AIOX_HOOK_IMPORT_BUDGET_MS overrides it on slow runners. Skipped when
+ * python3 is not installed.
+ *
+ * @see .aiox-core/monitor/hooks/lib/send_event.py
+ */
+
+const path = require('path');
+const { spawnSync } = require('child_process');
+
+const SCRIPT = path.join(__dirname, '..', 'benchmarks', 'monitor-hook-import-budget.py');
+const PYTHON = process.env.PYTHON || 'python3';
+
+const hasPython = spawnSync(PYTHON, ['--version']).status === 0;
+const describeWithPython = hasPython ? describe : describe.skip;
+const runTiming = process.env.AIOX_HOOK_IMPORT_TIMING === '1';
+
+describeWithPython('Monitor hook import budget', () => {
+  let results;
+
+  beforeAll(() => {
+    const run = spawnSync(PYTHON, [SCRIPT, '--json'], { encoding: 'utf8', timeout: 120000 });
+    if (run.error) {
+      throw run.error;
+    }
+    results = JSON.parse(run.stdout);
+  }, 130000);
+
+  test('measures every hook entry point', () => {
+    expect(results.map((result) => result.hook)).toEqual(
+      expect.arrayContaining(['pre_tool_use', 'post_tool_use', 'stop', 'hook_client']),
+    );
+  });
+
+  test('no hook imports a module that must stay off the hot path', () => {
+    const offenders = results.filter((result) => result.forbidden.length > 0);
+    expect(offenders).toEqual([]);
+  });
+
+  (runTiming ? test : test.skip)('every hook imports within the budget', () => {
+    const over = results.filter((result) => result.over_budget);
+    expect(over).toEqual([]);
+  });
+});